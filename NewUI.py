@@ -1,3 +1,4 @@
+import multiprocessing
 import sys
 
 from loguru import logger
@@ -6,6 +7,9 @@ from controllers.app_controller import AppController
 from utilities.app_info import AppInfo
 
 if __name__ == "__main__":
+    # Required for the mod scan process pool in frozen builds.
+    multiprocessing.freeze_support()
+
     # One-time-initialize AppInfo object. This has to be done inside __main__ so we can use __file__.
     AppInfo(__file__)
 
@@ -0,0 +1,102 @@
+"""
+Compare the per-file cost of extracting About.xml with AboutXmlExtractor against
+the tree-building parse that ModsFromFoldersRunner used before it.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_about_xml_extractor [file count]
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from lxml import etree
+
+from utilities.about_xml_extractor import AboutXmlExtractor
+
+ABOUT_XML = """<?xml version="1.0" encoding="utf-8"?>
+<ModMetaData>
+  <name>Benchmark Mod {index}</name>
+  <packageId>benchmark.mod{index}</packageId>
+  <author>Someone</author>
+  <url>https://example.com/{index}</url>
+  <supportedVersions><li>1.3</li><li>1.4</li><li>1.5</li></supportedVersions>
+  <modDependencies>
+    <li>
+      <packageId>brrainz.harmony</packageId>
+      <displayName>Harmony</displayName>
+      <steamWorkshopUrl>steam://url/CommunityFilePage/2009463077</steamWorkshopUrl>
+    </li>
+  </modDependencies>
+  <loadAfter><li>brrainz.harmony</li><li>ludeon.rimworld</li></loadAfter>
+  <description>{description}</description>
+</ModMetaData>
+"""
+
+
+def make_about_xml_files(folder: Path, count: int) -> List[Path]:
+    description = "A fairly long mod description. " * 40
+    paths = []
+    for index in range(count):
+        about_folder = folder / str(index) / "About"
+        about_folder.mkdir(parents=True)
+        about_xml_path = about_folder / "About.xml"
+        about_xml_path.write_text(
+            ABOUT_XML.format(index=index, description=description)
+        )
+        paths.append(about_xml_path)
+    return paths
+
+
+def parse_with_tree(about_xml_path: Path) -> Dict[str, Any]:
+    # The previous implementation, which only read four fields.
+    data: Dict[str, Any] = {}
+    try:
+        root = etree.parse(str(about_xml_path)).getroot()
+        node = root.find("./name")
+        if node is not None:
+            data["name"] = str(node.text)
+        node = root.find("./packageId")
+        if node is not None:
+            data["package_id"] = str(node.text)
+        data["supported_versions"] = root.xpath("./supportedVersions/li/text()")
+        node = root.find("./description")
+        if node is not None:
+            data["description"] = str(node.text)
+    except etree.XMLSyntaxError:
+        pass
+    return data
+
+
+def time_per_file(parse: Callable[[Path], Any], paths: List[Path]) -> float:
+    best = float("inf")
+    for _ in range(5):
+        started_at = time.perf_counter()
+        for path in paths:
+            parse(path)
+        best = min(best, time.perf_counter() - started_at)
+    return best / len(paths)
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    with tempfile.TemporaryDirectory() as temp_dir:
+        paths = make_about_xml_files(Path(temp_dir), count)
+        extractor = AboutXmlExtractor()
+
+        tree_time = time_per_file(parse_with_tree, paths)
+        # As called by the scan, where the folder walk already found whether
+        # there is a PublishedFileId.txt (there is none here).
+        extractor_time = time_per_file(
+            lambda path: extractor.extract(path, Path("")), paths
+        )
+
+    print(f"{count} About.xml files, best of 5 runs, per file:")
+    print(f"  etree.parse + find/xpath (4 fields): {tree_time * 1e6:8.1f} us")
+    print(f"  AboutXmlExtractor (full schema):     {extractor_time * 1e6:8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
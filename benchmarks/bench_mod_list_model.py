@@ -0,0 +1,161 @@
+"""
+Compare ModListModel against the QStandardItemModel that ModList used before it,
+on lists of 10,000 mods: filling a list, reordering rows, moving rows to the
+other list, and scrolling a list view through all of them.
+
+Run from the repository root:
+
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_mod_list_model [row count]
+"""
+import sys
+import time
+from typing import Callable, List, Optional, Tuple
+
+from PySide6.QtCore import QAbstractItemModel, QModelIndex, QSortFilterProxyModel, Qt
+from PySide6.QtGui import QStandardItem, QStandardItemModel
+from PySide6.QtWidgets import QApplication, QListView
+
+from models.mod import Mod
+from models.mod_list_model import ModListModel, ModListProxyModel
+
+MOVED_ROW_COUNT = 1000
+
+
+def time_ms(function: Callable[[], object]) -> float:
+    started_at = time.perf_counter()
+    function()
+    return (time.perf_counter() - started_at) * 1000
+
+
+def make_standard_item(mod: Mod) -> QStandardItem:
+    item = QStandardItem(mod.name)
+    item.setData(mod.handle, Qt.ItemDataRole.UserRole)
+    return item
+
+
+def fill_standard_item_model(model: QStandardItemModel, mods: List[Mod]) -> None:
+    for mod in mods:
+        model.appendRow(make_standard_item(mod))
+
+
+def reorder_standard_item_model(model: QStandardItemModel) -> None:
+    # QStandardItemModel has no moveRows; rows are taken and put back.
+    for _ in range(MOVED_ROW_COUNT):
+        model.appendRow(model.takeRow(0))
+
+
+def move_between_standard_item_models(
+    source_model: QStandardItemModel, target_model: QStandardItemModel
+) -> None:
+    # As MainWindowController moved a mod to the other list.
+    for _ in range(MOVED_ROW_COUNT):
+        item_clone = source_model.item(0).clone()
+        source_model.removeRow(0)
+        target_model.appendRow(item_clone)
+
+
+def fill_mod_list_model(model: ModListModel, mods: List[Mod]) -> None:
+    # One row at a time, as mods arrive from the database.
+    for mod in mods:
+        model.insert_handles(model.rowCount(), [mod.handle])
+
+
+def reorder_mod_list_model(model: ModListModel) -> None:
+    model.moveRows(QModelIndex(), 0, MOVED_ROW_COUNT, QModelIndex(), model.rowCount())
+
+
+def move_between_mod_list_models(
+    source_model: ModListModel, target_model: ModListModel
+) -> None:
+    handles = list(source_model.handles[:MOVED_ROW_COUNT])
+    source_model.removeRows(0, MOVED_ROW_COUNT)
+    target_model.insert_handles(target_model.rowCount(), handles)
+
+
+def scroll_ms_per_page(model: QAbstractItemModel, proxy_model_type: type) -> float:
+    proxy_model = proxy_model_type()
+    proxy_model.setSourceModel(model)
+    view = QListView()
+    view.setModel(proxy_model)
+    view.resize(400, 800)
+    view.show()
+    QApplication.processEvents()
+
+    scroll_bar = view.verticalScrollBar()
+    page_count = 0
+    started_at = time.perf_counter()
+    for value in range(0, scroll_bar.maximum() + 1, max(1, scroll_bar.pageStep())):
+        scroll_bar.setValue(value)
+        view.viewport().repaint()
+        page_count += 1
+    elapsed_ms = (time.perf_counter() - started_at) * 1000
+    view.close()
+    return elapsed_ms / max(1, page_count)
+
+
+def run(row_count: int, mods: List[Mod]) -> None:
+    # Handles index the mods, as in ModDatabase.
+    def get_mod(handle: int) -> Optional[Mod]:
+        return mods[handle]
+
+    results: List[Tuple[str, float, float]] = []
+
+    standard_model = QStandardItemModel()
+    mod_list_model = ModListModel(get_mod)
+    results.append(
+        (
+            f"Fill with {row_count} rows",
+            time_ms(lambda: fill_standard_item_model(standard_model, mods)),
+            time_ms(lambda: fill_mod_list_model(mod_list_model, mods)),
+        )
+    )
+    results.append(
+        (
+            f"Move {MOVED_ROW_COUNT} rows to the end",
+            time_ms(lambda: reorder_standard_item_model(standard_model)),
+            time_ms(lambda: reorder_mod_list_model(mod_list_model)),
+        )
+    )
+
+    other_standard_model = QStandardItemModel()
+    other_mod_list_model = ModListModel(get_mod)
+    results.append(
+        (
+            f"Move {MOVED_ROW_COUNT} rows to another list",
+            time_ms(
+                lambda: move_between_standard_item_models(
+                    standard_model, other_standard_model
+                )
+            ),
+            time_ms(
+                lambda: move_between_mod_list_models(
+                    mod_list_model, other_mod_list_model
+                )
+            ),
+        )
+    )
+    results.append(
+        (
+            "Scroll a list view, per page",
+            scroll_ms_per_page(standard_model, QSortFilterProxyModel),
+            scroll_ms_per_page(mod_list_model, ModListProxyModel),
+        )
+    )
+
+    print(f"{'':40} {'QStandardItemModel':>20} {'ModListModel':>14}")
+    for name, standard_ms, mod_list_ms in results:
+        print(f"{name:40} {standard_ms:17.1f} ms {mod_list_ms:11.1f} ms")
+
+
+def main() -> None:
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    app = QApplication(sys.argv[:1])
+    mods = [Mod(name=f"Benchmark Mod {index:05}") for index in range(row_count)]
+    for handle, mod in enumerate(mods):
+        mod.handle = handle
+    run(row_count, mods)
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
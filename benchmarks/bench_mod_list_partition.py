@@ -0,0 +1,133 @@
+"""
+Compare the ways of putting the mods of the database into the active and
+inactive lists: one mod at a time, as MainWindowController did, against
+partition_mods and ModList.insert_many_sorted. The mods are delivered all at
+once, and in the chunks of the initial load.
+
+Run from the repository root:
+
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_mod_list_partition \
+        [installed count] [active count]
+"""
+import random
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Set
+
+from PySide6.QtWidgets import QApplication, QListView
+
+from models.mod import Mod
+from models.mod_database import ModDatabase
+from models.mod_list import ModList, partition_mods
+
+
+def make_lists(mods: List[Mod]) -> List[ModList]:
+    # Handles index the mods, as in ModDatabase.
+    def get_mod(handle: int) -> Optional[Mod]:
+        return mods[handle]
+
+    return [ModList(get_mod), ModList(get_mod)]
+
+
+def add_one_at_a_time(
+    mod_lists: List[ModList], mods: List[Mod], active_ranks: Dict[str, int]
+) -> None:
+    active_mod_list, inactive_mod_list = mod_lists
+    for mod in mods:
+        rank = active_ranks.get(mod.package_id.lower())
+        if rank is not None:
+            # The linear search of the former _insert_active_mod.
+            row = active_mod_list.count()
+            is_active = False
+            for index, active_mod in enumerate(active_mod_list):
+                if active_mod is None:
+                    continue
+                active_mod_rank = active_ranks.get(
+                    active_mod.package_id.lower(), len(active_ranks)
+                )
+                if active_mod_rank == rank:
+                    is_active = True
+                    break
+                if active_mod_rank > rank:
+                    row = index
+                    break
+            if not is_active:
+                active_mod_list.insert(mod, row)
+                continue
+        inactive_mod_list.insert_sorted(mod)
+
+
+def add_partitioned(
+    mod_lists: List[ModList], mods: List[Mod], active_ranks: Dict[str, int]
+) -> None:
+    active_mod_list, inactive_mod_list = mod_lists
+    active_package_ids: Set[str] = {
+        mod.package_id.lower() for mod in active_mod_list if mod is not None
+    }
+    active_mods, inactive_mods = partition_mods(mods, active_ranks, active_package_ids)
+    rank_count = len(active_ranks)
+    active_mod_list.insert_many_sorted(
+        active_mods,
+        key=lambda mod: active_ranks.get(mod.package_id.lower(), rank_count),
+    )
+    inactive_mod_list.insert_many_sorted(inactive_mods)
+
+
+AddMods = Callable[[List[ModList], List[Mod], Dict[str, int]], None]
+
+
+def time_ms(
+    add_mods: AddMods, mods: List[Mod], active_ranks: Dict[str, int], chunk_size: int
+) -> float:
+    mod_lists = make_lists(mods)
+    views = []
+    for mod_list in mod_lists:
+        view = QListView()
+        view.setModel(mod_list.proxy_model)
+        views.append(view)
+
+    started_at = time.perf_counter()
+    for chunk_start in range(0, len(mods), chunk_size):
+        add_mods(mod_lists, mods[chunk_start : chunk_start + chunk_size], active_ranks)
+    elapsed_ms = (time.perf_counter() - started_at) * 1000
+
+    active_names = [mod.package_id for mod in mod_lists[0] if mod is not None]
+    assert active_names == sorted(active_names, key=active_ranks.__getitem__)
+    inactive_names = [mod.name.casefold() for mod in mod_lists[1] if mod is not None]
+    assert inactive_names == sorted(inactive_names)
+    assert len(mod_lists[0]) + len(mod_lists[1]) == len(mods)
+    return elapsed_ms
+
+
+def main() -> None:
+    installed_count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    active_count = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    app = QApplication(sys.argv[:1])
+
+    random.seed(0)
+    mods = [
+        Mod(name=f"Benchmark Mod {random.random():.8f}", package_id=f"bench.mod{index}")
+        for index in range(installed_count)
+    ]
+    for handle, mod in enumerate(mods):
+        mod.handle = handle
+    # The load order has nothing to do with the scan order.
+    active_package_ids = [mod.package_id for mod in random.sample(mods, active_count)]
+    active_ranks = {
+        package_id: rank for rank, package_id in enumerate(active_package_ids)
+    }
+
+    print(f"{installed_count} mods installed, {active_count} active")
+    print(f"{'':30} {'One at a time':>14} {'Partitioned':>12}")
+    for name, chunk_size in (
+        ("All at once", installed_count),
+        (f"In chunks of {ModDatabase.LOAD_CHUNK_SIZE}", ModDatabase.LOAD_CHUNK_SIZE),
+    ):
+        before_ms = time_ms(add_one_at_a_time, mods, active_ranks, chunk_size)
+        after_ms = time_ms(add_partitioned, mods, active_ranks, chunk_size)
+        print(f"{name:30} {before_ms:11.0f} ms {after_ms:9.0f} ms")
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+Compare a mod list view as it was, a QListView with the default delegate and
+rows of their own sizes, against DragDropListView with ModListItemDelegate:
+the time to lay out all rows, and the frame rate of scrolling through them,
+one page per frame, with badges on every row. With thumbnails, the delegate
+draws them from a ThumbnailAtlas, or, for comparison, decodes each visible
+mod's preview image as it paints it.
+
+Run from the repository root:
+
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_mod_list_scroll \
+        [row count] [frame count]
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QColor, QImage
+from PySide6.QtWidgets import QApplication, QListView
+
+from models.mod import Mod
+from models.mod_badges import ModBadgeProvider
+from models.mod_list import ModList
+from models.thumbnail_atlas import THUMBNAIL_SIZE, ThumbnailAtlas
+from runners.thumbnail_atlas_runner import ThumbnailAtlasRunner
+from widgets.drag_drop_list_view import DragDropListView
+from widgets.mod_list_item_delegate import ModListItemDelegate
+
+GAME_VERSION = "1.5.4104 rev435"
+LOCAL_FOLDER = Path("/mods/local")
+STEAM_FOLDER = Path("/mods/steam")
+
+# The number of distinct preview images; mods share them round-robin.
+PREVIEW_COUNT = 64
+
+
+def make_mods(row_count: int) -> List[Mod]:
+    mods = []
+    for index in range(row_count):
+        mod = Mod(
+            name=f"Benchmark Mod {index:05} with a fairly long name to elide",
+            package_id=f"bench.mod{index}",
+            path=(LOCAL_FOLDER if index % 3 else STEAM_FOLDER) / f"mod{index}",
+            supported_versions=["1.4", "1.5"] if index % 4 else ["1.3", "1.4"],
+            dependencies=["bench.missing"] if index % 7 == 0 else [],
+        )
+        mod.handle = index
+        mods.append(mod)
+    return mods
+
+
+def make_default_view(mods: List[Mod]) -> QListView:
+    view = QListView()
+    view.setAlternatingRowColors(True)
+    return view
+
+
+def make_delegate_view(
+    mods: List[Mod],
+    get_thumbnail: Optional[Callable[[int], Optional[QImage]]] = None,
+) -> QListView:
+    mods_by_package_id = {mod.package_id: mod for mod in mods}
+    badges = ModBadgeProvider(
+        GAME_VERSION,
+        {LOCAL_FOLDER: "Local", STEAM_FOLDER: "Steam"},
+        mods.__getitem__,
+        mods_by_package_id.get,
+    )
+    view = DragDropListView()
+    view.setItemDelegate(ModListItemDelegate(badges.get, get_thumbnail, parent=view))
+    return view
+
+
+def write_previews(folder: Path) -> List[Path]:
+    preview_image_paths = []
+    for index in range(PREVIEW_COUNT):
+        preview_image_path = folder / f"Preview{index}.png"
+        image = QImage(640, 360, QImage.Format.Format_RGB32)
+        image.fill(QColor.fromHsv(index * 360 // PREVIEW_COUNT, 200, 220))
+        image.save(str(preview_image_path))
+        preview_image_paths.append(preview_image_path)
+    return preview_image_paths
+
+
+def build_atlas(folder: Path, previews: List[Tuple[int, Path]]) -> ThumbnailAtlas:
+    emitted: List[Any] = []
+    runner = ThumbnailAtlasRunner(
+        previews, folder / "thumbnail_atlas.bin", folder / "thumbnail_atlas.json"
+    )
+    runner.signals.data_ready.connect(emitted.append)
+    runner.run()
+    atlas = ThumbnailAtlas(folder / "thumbnail_atlas.bin")
+    atlas.set_slots(emitted[0])
+    return atlas
+
+
+def decode_preview(previews_by_handle: Dict[int, Path]) -> Callable[[int], QImage]:
+    def get_thumbnail(handle: int) -> QImage:
+        return QImage(str(previews_by_handle[handle])).scaled(
+            THUMBNAIL_SIZE,
+            THUMBNAIL_SIZE,
+            Qt.AspectRatioMode.KeepAspectRatio,
+            Qt.TransformationMode.SmoothTransformation,
+        )
+
+    return get_thumbnail
+
+
+MakeView = Callable[[List[Mod]], QListView]
+
+
+def measure(
+    make_view: MakeView, mods: List[Mod], frame_count: int
+) -> Tuple[float, float]:
+    app = QApplication.instance()
+    assert app is not None
+
+    def get_mod(handle: int) -> Optional[Mod]:
+        return mods[handle]
+
+    mod_list = ModList(get_mod)
+    mod_list.append_many(mods)
+    view = make_view(mods)
+    view.resize(400, 800)
+    view.show()
+    app.processEvents()
+
+    started_at = time.perf_counter()
+    view.setModel(mod_list.proxy_model)
+    # Batched layout goes on over several events; wait for all of it. The
+    # views scroll by rows.
+    scroll_bar = view.verticalScrollBar()
+    app.processEvents()
+    while scroll_bar.maximum() + scroll_bar.pageStep() < len(mods):
+        app.processEvents()
+    layout_ms = (time.perf_counter() - started_at) * 1000
+
+    scroll_bar.setValue(0)
+    app.processEvents()
+    frame_times: List[float] = []
+    for _ in range(frame_count):
+        if scroll_bar.value() >= scroll_bar.maximum():
+            scroll_bar.setValue(0)
+        frame_started_at = time.perf_counter()
+        scroll_bar.setValue(scroll_bar.value() + scroll_bar.pageStep())
+        view.viewport().repaint()
+        frame_times.append(time.perf_counter() - frame_started_at)
+    view.close()
+
+    frame_times.sort()
+    median_frame_s = frame_times[len(frame_times) // 2]
+    return layout_ms, 1 / median_frame_s
+
+
+def main() -> None:
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    frame_count = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    app = QApplication(sys.argv[:1])
+    mods = make_mods(row_count)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        folder = Path(temp_dir)
+        preview_image_paths = write_previews(folder)
+        previews = [
+            (mod.handle, preview_image_paths[mod.handle % PREVIEW_COUNT])
+            for mod in mods
+        ]
+        started_at = time.perf_counter()
+        atlas = build_atlas(folder, previews)
+        atlas_ms = (time.perf_counter() - started_at) * 1000
+        started_at = time.perf_counter()
+        build_atlas(folder, previews).close()
+        atlas_update_ms = (time.perf_counter() - started_at) * 1000
+
+        print(f"{row_count} rows, {frame_count} frames")
+        print(
+            f"Thumbnail atlas of {PREVIEW_COUNT} previews built in {atlas_ms:.0f} ms, "
+            f"checked again in {atlas_update_ms:.0f} ms"
+        )
+        print(f"{'':30} {'Layout':>10} {'Scrolling':>12}")
+        views: List[Tuple[str, MakeView]] = [
+            ("Default delegate", make_default_view),
+            ("ModListItemDelegate", make_delegate_view),
+            (
+                "  with decoded previews",
+                lambda mods: make_delegate_view(mods, decode_preview(dict(previews))),
+            ),
+            (
+                "  with thumbnail atlas",
+                lambda mods: make_delegate_view(mods, atlas.get),
+            ),
+        ]
+        for name, make_view in views:
+            layout_ms, fps = measure(make_view, mods, frame_count)
+            print(f"{name:30} {layout_ms:7.0f} ms {fps:8.0f} fps")
+        atlas.close()
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Measure how much memory each mod's metadata takes once the database holds it.
+
+The mods are built from the same keyword arguments a scan delivers, chunk by
+chunk, and the scan data is dropped afterwards, as the database does. Python
+allocations are traced with tracemalloc; the change in resident memory also
+covers allocations made outside Python, where the platform reports it.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_mod_memory [mod count]
+"""
+import gc
+import os
+import sys
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from models.mod import Mod
+from models.mod_database import ModDatabase
+from utilities.mod_load_folders import LoadFolder
+
+
+def parsed(text: str) -> str:
+    # A scan gets a new string for every text it parses, even a repeated one.
+    return text.encode().decode()
+
+
+def make_mod_data(index: int) -> Dict[str, Any]:
+    mod_path = Path(f"/games/RimWorld/Mods/{2000000000 + index}")
+    return {
+        "name": f"Benchmark Mod {index}",
+        "package_id": f"benchmark.author{index % 200}.mod{index}",
+        "authors": [f"Author {index % 200}"],
+        "url": f"https://example.com/mods/{index}",
+        "description": f"Mod {index}. " + "A fairly long mod description. " * 16,
+        "mod_version": parsed("1.0.0"),
+        "supported_versions": [parsed("1.3"), parsed("1.4"), parsed("1.5")],
+        "dependencies": [parsed("brrainz.harmony")],
+        "dependencies_by_version": {},
+        "load_before": [],
+        "load_before_by_version": {},
+        "load_after": [parsed("brrainz.harmony"), parsed("ludeon.rimworld")],
+        "load_after_by_version": {},
+        "incompatible_with": [],
+        "incompatible_with_by_version": {},
+        "force_load_before": [],
+        "force_load_after": [],
+        "published_file_id": str(2000000000 + index),
+        "preview_image_path": mod_path / "About" / "Preview.png",
+        "path": mod_path,
+        "about_xml_path": mod_path / "About" / "About.xml",
+        "load_folders": [
+            LoadFolder(mod_path),
+            LoadFolder(mod_path / "Common"),
+            LoadFolder(mod_path / "1.5"),
+        ],
+    }
+
+
+def resident_bytes() -> Optional[int]:
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def build_mods(count: int) -> List[Mod]:
+    # In chunks, as the database receives them from a scan.
+    mods: List[Mod] = []
+    for chunk_start in range(0, count, ModDatabase.LOAD_CHUNK_SIZE):
+        chunk_end = min(chunk_start + ModDatabase.LOAD_CHUNK_SIZE, count)
+        data = [make_mod_data(index) for index in range(chunk_start, chunk_end)]
+        mods.extend(Mod(**item) for item in data)
+    gc.collect()
+    return mods
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+
+    # Resident memory first, as tracing allocations takes memory of its own.
+    gc.collect()
+    resident_before = resident_bytes()
+    mods = build_mods(count)
+    resident_after = resident_bytes()
+    del mods
+    gc.collect()
+
+    tracemalloc.start()
+    mods = build_mods(count)
+    traced_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{len(mods)} mods, per mod:")
+    print(f"  Python allocations: {traced_bytes / count:8.0f} bytes")
+    if resident_before is not None and resident_after is not None:
+        resident_per_mod = (resident_after - resident_before) / count
+        print(f"  Resident memory:    {resident_per_mod:8.0f} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Compare the ways of showing a mod's preview image in the selected mod panel:
+decoding the full image and scaling it on the GUI thread, as
+MainWindowController did on every click, against PreviewImageCache, both the
+first time, when it decodes the image scaled and saves it, and afterwards, when
+it reads the small saved image. The previews are 4K, as PNG and as JPEG.
+
+Run from the repository root:
+
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_preview_image_cache \
+        [panel width] [repeat count]
+"""
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QColor, QImage, QPainter, QPixmap
+from PySide6.QtWidgets import QApplication
+
+from models.preview_image_cache import PreviewImageCache
+
+
+def write_preview(preview_image_path: Path) -> None:
+    # Noise, so that the image compresses about as badly as a screenshot.
+    image = QImage(3840, 2160, QImage.Format.Format_RGB32)
+    image.fill(QColor(40, 80, 120))
+    painter = QPainter(image)
+    for _ in range(4000):
+        painter.fillRect(
+            random.randrange(3840),
+            random.randrange(2160),
+            random.randrange(8, 200),
+            random.randrange(8, 200),
+            QColor.fromRgb(random.randrange(0x1000000)),
+        )
+    painter.end()
+    image.save(str(preview_image_path))
+
+
+def time_ms(show_preview: Callable[[], object], repeat_count: int) -> float:
+    times: List[float] = []
+    for _ in range(repeat_count):
+        started_at = time.perf_counter()
+        show_preview()
+        times.append(time.perf_counter() - started_at)
+    times.sort()
+    return times[len(times) // 2] * 1000
+
+
+def main() -> None:
+    panel_width = int(sys.argv[1]) if len(sys.argv) > 1 else 470
+    repeat_count = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    app = QApplication(sys.argv[:1])
+    random.seed(0)
+
+    print(f"4K previews shown {panel_width} pixels wide")
+    print(f"{'':6} {'File':>9} {'Full decode':>12} {'First':>9} {'Cached':>9}")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        folder = Path(temp_dir)
+        for suffix in ("png", "jpg"):
+            preview_image_path = folder / f"Preview.{suffix}"
+            write_preview(preview_image_path)
+            file_size = preview_image_path.stat().st_size / (1024 * 1024)
+
+            before_ms = time_ms(
+                lambda: QPixmap(str(preview_image_path)).scaledToWidth(
+                    panel_width, Qt.TransformationMode.SmoothTransformation
+                ),
+                repeat_count,
+            )
+
+            def show_cached(cache: PreviewImageCache) -> QPixmap:
+                image = cache.get(preview_image_path, panel_width)
+                return QPixmap.fromImage(
+                    image.scaledToWidth(
+                        panel_width, Qt.TransformationMode.SmoothTransformation
+                    )
+                )
+
+            cache = PreviewImageCache(folder / f"cache_{suffix}")
+            first_ms = time_ms(lambda: show_cached(cache), 1)
+            cached_ms = time_ms(lambda: show_cached(cache), repeat_count)
+            print(
+                f"{suffix.upper():6} {file_size:5.1f} MiB {before_ms:9.0f} ms "
+                f"{first_ms:6.0f} ms {cached_ms:6.1f} ms"
+            )
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Measure when parsing mod folders in worker processes pays off: the cost of
+starting a worker, which imports utilities.mod_folder_parser, against the cost
+of parsing one mod folder, and whole parses of a few library sizes, serially
+and with worker processes.
+
+The break-even point, the start-up cost divided by the per-mod cost, is the
+fewest mod folders a worker must get for MIN_MOD_FOLDERS_PER_WORKER in
+runners.mods_from_folders_runner.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_scan_workers [worker count] [mod counts...]
+"""
+import multiprocessing
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List
+
+from benchmarks.bench_about_xml_extractor import make_about_xml_files
+from utilities.mod_folder_parser import parse_mod_folder
+from utilities.mod_folder_walker import ModFolderEntry, ModFolderWalker
+from utilities.process_pool import parallel_map
+
+
+def time_worker_start_up(mod_folder: ModFolderEntry) -> float:
+    # Until the first result is back: process start-up, imports and one parse.
+    best = float("inf")
+    for _ in range(3):
+        started_at = time.perf_counter()
+        with ProcessPoolExecutor(
+            max_workers=1, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            executor.submit(parse_mod_folder, mod_folder).result()
+        best = min(best, time.perf_counter() - started_at)
+    return best
+
+
+def time_parse(mod_folders: List[ModFolderEntry], worker_count: int) -> float:
+    started_at = time.perf_counter()
+    for _ in parallel_map(parse_mod_folder, mod_folders, worker_count, 1):
+        pass
+    return time.perf_counter() - started_at
+
+
+def main() -> None:
+    worker_count = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    mod_counts = [int(arg) for arg in sys.argv[2:]] or [100, 200, 1000, 5000]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        folder = Path(temp_dir)
+        make_about_xml_files(folder, max(mod_counts))
+        mod_folders = list(ModFolderWalker().walk([folder]))
+
+        per_mod = min(time_parse(mod_folders, 1) for _ in range(3)) / len(mod_folders)
+        start_up = time_worker_start_up(mod_folders[0])
+        print(f"Parsing one mod folder: {per_mod * 1000:.3f} ms")
+        print(f"Starting a worker:      {start_up * 1000:.0f} ms")
+        print(f"Break-even:             {start_up / per_mod:.0f} mod folders")
+        print()
+
+        print(f"{'Mods':>6} {'Serial':>9} {f'{worker_count} workers':>11}")
+        for mod_count in mod_counts:
+            serial = time_parse(mod_folders[:mod_count], 1)
+            parallel = time_parse(mod_folders[:mod_count], worker_count)
+            print(f"{mod_count:6} {serial * 1000:6.0f} ms {parallel * 1000:8.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Compare the ways of moving a multi-selection of mods from one list view to the
+other: one mod at a time, as a double-click did, against
+MainWindowController.move_mods_between_list_views. The selected mods are
+scattered over the list, and contiguous.
+
+Run from the repository root:
+
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_selection_move \
+        [installed count] [selected count]
+"""
+import random
+import sys
+import time
+from typing import Callable, List, Optional, Tuple
+
+from PySide6.QtCore import QModelIndex, QPersistentModelIndex, QSortFilterProxyModel
+from PySide6.QtWidgets import QApplication, QListView
+
+from controllers.main_window_controller import MainWindowController
+from models.mod import Mod
+from models.mod_list import ModList
+
+
+def make_views(mods: List[Mod]) -> Tuple[List[ModList], List[QListView]]:
+    # Handles index the mods, as in ModDatabase.
+    def get_mod(handle: int) -> Optional[Mod]:
+        return mods[handle]
+
+    mod_lists = [ModList(get_mod), ModList(get_mod)]
+    mod_lists[0].append_many(mods)
+    views = []
+    for mod_list in mod_lists:
+        view = QListView()
+        view.setModel(mod_list.proxy_model)
+        view.show()
+        views.append(view)
+    return mod_lists, views
+
+
+def move_one_at_a_time(
+    source_view: QListView, indexes: List[QModelIndex], target_view: QListView
+) -> None:
+    # Each move shifts the rows below it, so the indexes must be persistent.
+    persistent_indexes = [QPersistentModelIndex(index) for index in indexes]
+    proxy_model = source_view.model()
+    assert isinstance(proxy_model, QSortFilterProxyModel)
+    source_model = MainWindowController.get_mod_list_model(source_view)
+    target_model = MainWindowController.get_mod_list_model(target_view)
+    for persistent_index in persistent_indexes:
+        row = proxy_model.mapToSource(persistent_index).row()
+        handle = source_model.handles[row]
+        source_model.removeRows(row, 1)
+        target_model.insert_handles(target_model.rowCount(), [handle])
+
+
+def move_batched(
+    source_view: QListView, indexes: List[QModelIndex], target_view: QListView
+) -> None:
+    MainWindowController.move_mods_between_list_views(source_view, indexes, target_view)
+
+
+MoveMods = Callable[[QListView, List[QModelIndex], QListView], None]
+
+
+def time_ms(
+    move_mods: MoveMods, mods: List[Mod], rows: List[int]
+) -> Tuple[float, float]:
+    app = QApplication.instance()
+    assert app is not None
+    mod_lists, views = make_views(mods)
+    app.processEvents()
+    proxy_model = views[0].model()
+    indexes = [proxy_model.index(row, 0) for row in rows]
+
+    started_at = time.perf_counter()
+    move_mods(views[0], indexes, views[1])
+    moved_at = time.perf_counter()
+    # The views lay out their rows again once control returns to the event loop.
+    app.processEvents()
+    laid_out_at = time.perf_counter()
+
+    assert len(mod_lists[1]) == len(rows)
+    assert len(mod_lists[0]) + len(mod_lists[1]) == len(mods)
+    for view in views:
+        view.close()
+    return (moved_at - started_at) * 1000, (laid_out_at - moved_at) * 1000
+
+
+def main() -> None:
+    installed_count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    selected_count = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    app = QApplication(sys.argv[:1])
+
+    mods = [
+        Mod(name=f"Benchmark Mod {index:05}", package_id=f"bench.mod{index}")
+        for index in range(installed_count)
+    ]
+    for handle, mod in enumerate(mods):
+        mod.handle = handle
+
+    random.seed(0)
+    start_row = (installed_count - selected_count) // 2
+    selections = {
+        "Scattered": sorted(random.sample(range(installed_count), selected_count)),
+        "Contiguous": list(range(start_row, start_row + selected_count)),
+    }
+
+    print(f"{installed_count} mods installed, {selected_count} selected")
+    print(f"{'':12} {'One at a time':>14} {'Batched':>10} {'View layout':>12}")
+    for name, rows in selections.items():
+        before_ms, _ = time_ms(move_one_at_a_time, mods, rows)
+        after_ms, layout_ms = time_ms(move_batched, mods, rows)
+        print(f"{name:12} {before_ms:11.0f} ms {after_ms:7.0f} ms {layout_ms:9.0f} ms")
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
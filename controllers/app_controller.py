@@ -1,6 +1,8 @@
 import sys
+from pathlib import Path
+from typing import List, Optional
 
-from PySide6.QtCore import QObject
+from PySide6.QtCore import QObject, Slot
 from PySide6.QtWidgets import QApplication
 
 from controllers.about_dialog_controller import AboutDialogController
@@ -54,12 +56,11 @@ class AppController(QObject):
         EventBus()
 
         ModDatabase(
-            from_folders=[
-                self.settings_model.game_data_location,
-                self.settings_model.local_mods_folder_location,
-                self.settings_model.steam_mods_folder_location,
-            ]
+            from_folders=self._mod_folders(),
+            worker_count=self.settings_model.scan_worker_count,
+            game_version=GameInfo().version,
         )
+        self.settings_model.changed.connect(self._on_settings_changed)
 
         self.main_window_model = MainWindowModel()
         self.main_window = MainWindow()
@@ -77,6 +78,19 @@ class AppController(QObject):
 
         EventBus().menu_bar_quit_action_triggered.connect(self.quit)
 
+    def _mod_folders(self) -> List[Optional[Path]]:
+        return [
+            self.settings_model.game_data_location,
+            self.settings_model.local_mods_folder_location,
+            self.settings_model.steam_mods_folder_location,
+        ]
+
+    @Slot()
+    def _on_settings_changed(self) -> None:
+        # Restarts the mod scan if, and only if, a mod location changed.
+        ModDatabase().set_worker_count(self.settings_model.scan_worker_count)
+        ModDatabase().set_folders(self._mod_folders())
+
     def run(self) -> int:
         self.main_window.show()
         return self.app.exec()
@@ -1,3 +1,6 @@
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
 from PySide6.QtCore import (
     QObject,
     Slot,
@@ -6,19 +9,53 @@ from PySide6.QtCore import (
     QSortFilterProxyModel,
     QItemSelection,
     QItemSelectionModel,
+    QThreadPool,
+    QTimer,
+    QPoint,
 )
-from PySide6.QtGui import QPixmap, QStandardItemModel
+from PySide6.QtGui import QImage, QPixmap
 from PySide6.QtWidgets import QListView
+from loguru import logger
 
 from controllers.settings_controller import SettingsController
 from models.main_window_model import MainWindowModel
 from models.mod import Mod
+from models.mod_badges import ModBadgeProvider
 from models.mod_database import ModDatabase
+from models.mod_list import ModList, partition_mods
+from models.mod_list_model import ModListModel
+from models.patch_cost_report import PatchCostReport
+from models.preview_image_cache import PreviewImageCache
+from models.preview_pixmap_cache import PreviewPixmapCache, PreviewPixmapKey
+from models.thumbnail_atlas import ThumbnailAtlas
+from models.thumbnail_atlas_updater import ThumbnailAtlasUpdater
+from runners.patch_cost_runner import PatchCostRunner
+from runners.prefetch_runner import PrefetchRunner
+from runners.preview_image_runner import PreviewImageRunner
+from utilities.app_info import AppInfo
 from utilities.event_bus import EventBus
+from utilities.game_info import GameInfo
+from utilities.file_signature import file_signature
 from views.main_window import MainWindow
+from widgets.mod_list_item_delegate import ModListItemDelegate
 
 
 class MainWindowController(QObject):
+    # The patch costs of the active mods are analyzed again once the active mod
+    # list has not changed for this long.
+    PATCH_COST_ANALYSIS_DELAY_MS = 500
+
+    # The thumbnail atlas is updated once the mods have not changed for this
+    # long, so that it is not updated for every chunk of a scan.
+    THUMBNAIL_ATLAS_UPDATE_DELAY_MS = 1000
+
+    # The number of rows ahead of the current one, in the direction the user is
+    # moving through a mod list, whose preview and description are read ahead.
+    PREFETCH_ROW_COUNT = 8
+    # Below the default priority, so that reading ahead never delays showing
+    # the selected mod.
+    PREFETCH_PRIORITY = -1
+
     def __init__(
         self,
         model: MainWindowModel,
@@ -59,6 +96,35 @@ class MainWindowController(QObject):
             self.main_window_model.active_mod_list.proxy_model
         )
 
+        # The badges drawn next to the mods' names. They depend on the other
+        # mods and on the settings, so they are worked out again when either
+        # changes.
+        self._mod_badges = ModBadgeProvider(
+            GameInfo().version, self._mod_folder_labels()
+        )
+        # The thumbnails of the mods' preview images, packed into one file in
+        # the background once the mods stop changing.
+        self._thumbnail_atlas = ThumbnailAtlas(
+            AppInfo().user_data_folder / "thumbnail_atlas.bin"
+        )
+        self._thumbnail_atlas_updater = ThumbnailAtlasUpdater(
+            self._thumbnail_atlas,
+            AppInfo().user_data_folder / "thumbnail_atlas_index.json",
+            parent=self,
+        )
+        self._thumbnail_atlas_updater.updated.connect(self._on_thumbnail_atlas_updated)
+        self._thumbnail_atlas_timer = QTimer(self)
+        self._thumbnail_atlas_timer.setSingleShot(True)
+        self._thumbnail_atlas_timer.setInterval(self.THUMBNAIL_ATLAS_UPDATE_DELAY_MS)
+        self._thumbnail_atlas_timer.timeout.connect(self._start_thumbnail_atlas_update)
+        for list_view in self._mod_list_views():
+            list_view.setItemDelegate(
+                ModListItemDelegate(
+                    self._mod_badges.get, self._thumbnail_atlas.get, parent=list_view
+                )
+            )
+        self.settings_controller.settings.changed.connect(self._on_settings_changed)
+
         self.main_window.inactive_mods_filter_field.textChanged.connect(
             self._update_inactive_mods_filter
         )
@@ -73,21 +139,257 @@ class MainWindowController(QObject):
             self._on_mods_list_view_selection_changed
         )
 
-        EventBus().database_ready.connect(self._on_database_ready)
+        self.main_window.refresh_button.clicked.connect(self._on_refresh_button_clicked)
 
-    @Slot()
-    def _on_database_ready(self) -> None:
-        if self.settings_controller.settings.config_folder_location is not None:
-            self.main_window_model.active_mod_list.from_xml(
-                self.settings_controller.settings.config_folder_location
-                / "ModsConfig.xml"
+        self._active_mod_ranks: Dict[str, int] = {}
+        self._load_active_mod_ranks()
+
+        EventBus().database_mods_added.connect(self._on_database_mods_added)
+        EventBus().database_mods_removed.connect(self._on_database_mods_removed)
+        EventBus().database_mods_updated.connect(self._on_database_mods_updated)
+        EventBus().database_scan_progress.connect(self._on_database_scan_progress)
+
+        # The mod shown in the selected mod panel, and its preview image, scaled
+        # on disk and decoded in the background. The most recently shown
+        # previews are kept in memory, up to the budget in the settings.
+        self._selected_mod: Optional[Mod] = None
+        self._preview_image_cache = PreviewImageCache(
+            AppInfo().user_data_folder / "preview_cache"
+        )
+        self._preview_pixmaps = PreviewPixmapCache(self._preview_byte_budget())
+        self._preview_image_runner: Optional[PreviewImageRunner] = None
+        self._preview_pixmap_key: Optional[PreviewPixmapKey] = None
+        self._preview_pixmap_hits = 0
+        self._preview_pixmap_misses = 0
+
+        # The runner reading ahead of the current row, and the direction it
+        # reads in: 1 down the list, -1 up.
+        self._prefetch_runner: Optional[PrefetchRunner] = None
+        self._prefetch_direction = 0
+        self._scroll_values: Dict[QListView, int] = {}
+        for list_view in self._mod_list_views():
+            list_view.selectionModel().currentChanged.connect(
+                self._on_mods_list_view_current_changed
+            )
+            scroll_bar = list_view.verticalScrollBar()
+            self._scroll_values[list_view] = scroll_bar.value()
+            scroll_bar.valueChanged.connect(
+                lambda value, list_view=list_view: self._on_mods_list_view_scrolled(
+                    list_view, value
+                )
             )
 
-        for mod in ModDatabase():
-            if mod not in self.main_window_model.active_mod_list:
-                self.main_window_model.inactive_mod_list.append(mod)
+        self._patch_cost_report = PatchCostReport([])
+        self._patch_cost_runner: Optional[PatchCostRunner] = None
+        self._patch_cost_analysis_timer = QTimer(self)
+        self._patch_cost_analysis_timer.setSingleShot(True)
+        self._patch_cost_analysis_timer.setInterval(self.PATCH_COST_ANALYSIS_DELAY_MS)
+        self._patch_cost_analysis_timer.timeout.connect(self._start_patch_cost_analysis)
+        active_mods_model = (
+            self.main_window_model.active_mod_list.proxy_model.sourceModel()
+        )
+        active_mods_model.rowsInserted.connect(self._patch_cost_analysis_timer.start)
+        active_mods_model.rowsRemoved.connect(self._patch_cost_analysis_timer.start)
+        EventBus().database_mods_updated.connect(self._patch_cost_analysis_timer.start)
+
+    def _mod_list_views(self) -> Sequence[QListView]:
+        return [
+            self.main_window.inactive_mods_list_view,
+            self.main_window.active_mods_list_view,
+        ]
+
+    def _mod_folder_labels(self) -> Dict[Path, str]:
+        """
+        :return: The labels of the mod folders, as shown in the mods' badges.
+        :rtype: Dict[Path, str]
+        """
+        settings = self.settings_controller.settings
+        folder_labels: Dict[Path, str] = {}
+        for folder, label in (
+            (settings.game_data_location, "Game"),
+            (settings.local_mods_folder_location, "Local"),
+            (settings.steam_mods_folder_location, "Steam"),
+        ):
+            if folder is not None:
+                folder_labels.setdefault(folder, label)
+        return folder_labels
 
-        self.main_window_model.inactive_mod_list.sort()
+    def _refresh_mod_badges(self) -> None:
+        self._mod_badges.clear()
+        for list_view in self._mod_list_views():
+            list_view.viewport().update()
+
+    @Slot()
+    def _on_settings_changed(self) -> None:
+        self._mod_badges.set_folder_labels(self._mod_folder_labels())
+        self._refresh_mod_badges()
+        self._preview_pixmaps.byte_budget = self._preview_byte_budget()
+
+    def _preview_byte_budget(self) -> int:
+        return self.settings_controller.settings.preview_memory_budget * 1024 * 1024
+
+    def _load_active_mod_ranks(self) -> None:
+        """
+        Read the load order from ModsConfig.xml, so that mods can be put in the
+        right list, at the right place, as they are loaded.
+        """
+        self._active_mod_ranks = {}
+        config_folder_location = (
+            self.settings_controller.settings.config_folder_location
+        )
+        if config_folder_location is None:
+            return
+        package_ids = ModList.read_active_package_ids(
+            config_folder_location / "ModsConfig.xml"
+        )
+        for rank, package_id in enumerate(package_ids):
+            self._active_mod_ranks.setdefault(package_id.lower(), rank)
+
+    @Slot(object)
+    def _on_database_mods_added(self, mods: object) -> None:
+        if not isinstance(mods, list):
+            raise TypeError(f"Expected a list of mods, but got {type(mods)}")
+        self._refresh_mod_badges()
+        self._thumbnail_atlas_timer.start()
+        active_mod_list = self.main_window_model.active_mod_list
+        active_mods, inactive_mods = partition_mods(
+            mods,
+            self._active_mod_ranks,
+            {mod.package_id.lower() for mod in active_mod_list if mod is not None},
+        )
+        # Mods that are not in ModsConfig.xml, e.g. dragged there, go last.
+        rank_count = len(self._active_mod_ranks)
+        active_mod_list.insert_many_sorted(
+            active_mods,
+            key=lambda mod: self._active_mod_ranks.get(
+                mod.package_id.lower(), rank_count
+            ),
+        )
+        self.main_window_model.inactive_mod_list.insert_many_sorted(inactive_mods)
+
+    @Slot(object)
+    def _on_database_mods_removed(self, mods: object) -> None:
+        if not isinstance(mods, list):
+            raise TypeError(f"Expected a list of mods, but got {type(mods)}")
+        self._refresh_mod_badges()
+        self._thumbnail_atlas_timer.start()
+        self.main_window_model.inactive_mod_list.remove_many(mods)
+        self.main_window_model.active_mod_list.remove_many(mods)
+
+    @Slot(object)
+    def _on_database_mods_updated(self, mods: object) -> None:
+        if not isinstance(mods, list):
+            raise TypeError(f"Expected a list of mods, but got {type(mods)}")
+        self._refresh_mod_badges()
+        self._thumbnail_atlas_timer.start()
+        for mod in mods:
+            self.main_window_model.inactive_mod_list.refresh(mod)
+            self.main_window_model.active_mod_list.refresh(mod)
+
+    @Slot(int, int)
+    def _on_database_scan_progress(self, visited_count: int, total_count: int) -> None:
+        progress_bar = self.main_window.scan_progress_bar
+        if visited_count >= total_count:
+            progress_bar.hide()
+            return
+        progress_bar.setRange(0, total_count)
+        progress_bar.setValue(visited_count)
+        progress_bar.setToolTip(f"Scanning mods: {visited_count} of {total_count}")
+        progress_bar.show()
+
+    @Slot()
+    def _start_patch_cost_analysis(self) -> None:
+        """
+        Analyze the patch costs of the active mods, replacing any analysis in
+        progress.
+        """
+        if self._patch_cost_runner is not None:
+            self._patch_cost_runner.cancel()
+        active_mods = [
+            mod for mod in self.main_window_model.active_mod_list if mod is not None
+        ]
+        runner = PatchCostRunner(
+            [(mod.path, mod.load_folders) for mod in active_mods],
+            self.settings_controller.settings.scan_worker_count,
+            cache_file=AppInfo().user_data_folder / "patch_cost_cache.json",
+            active_package_ids={mod.package_id.lower() for mod in active_mods},
+        )
+        # Keep the runner alive after it ran, so that its signals can still be
+        # compared against.
+        runner.setAutoDelete(False)
+        runner.signals.data_ready.connect(self._on_patch_cost_report_ready)
+        self._patch_cost_runner = runner
+        QThreadPool.globalInstance().start(runner)
+
+    @Slot(object)
+    def _on_patch_cost_report_ready(self, report: object) -> None:
+        if not isinstance(report, PatchCostReport):
+            raise TypeError(f"Expected a PatchCostReport, but got {type(report)}")
+        if (
+            self._patch_cost_runner is None
+            or self.sender() != self._patch_cost_runner.signals
+        ):
+            return
+        self._patch_cost_runner = None
+        self._patch_cost_report = report
+        if self._selected_mod is not None:
+            self._show_selected_mod_patch_cost(self._selected_mod)
+
+    @Slot()
+    def _start_thumbnail_atlas_update(self) -> None:
+        """
+        Pack the thumbnails of new and changed preview images into the atlas,
+        replacing any update in progress.
+        """
+        self._thumbnail_atlas_updater.update(
+            [
+                (mod.handle, mod.preview_image_path)
+                for mod in ModDatabase()
+                if mod.preview_image_path.name
+            ]
+        )
+
+    @Slot()
+    def _on_thumbnail_atlas_updated(self) -> None:
+        for list_view in self._mod_list_views():
+            list_view.viewport().update()
+
+    def _show_selected_mod_patch_cost(self, mod: Mod) -> None:
+        label = self.main_window.selected_mod_patch_cost_label
+        patch_cost = self._patch_cost_report.get(mod.path)
+        if patch_cost is None:
+            label.setText("Only analyzed for active mods")
+            label.setToolTip("")
+            return
+        if patch_cost.operation_count == 0:
+            label.setText("No patches")
+            label.setToolTip("")
+            return
+
+        label.setText(
+            f"{patch_cost.cost} (rank {self._patch_cost_report.rank_of(mod.path)} "
+            f"of {len(self._patch_cost_report)}, "
+            f"{patch_cost.operation_count} operations)"
+        )
+        tooltip_lines = [
+            f"{patch_cost.operation_count} patch operations "
+            f"in {patch_cost.file_count} files"
+        ]
+        if patch_cost.longest_sequence > 0:
+            tooltip_lines.append(
+                f"Longest PatchOperationSequence: "
+                f"{patch_cost.longest_sequence} operations"
+            )
+        if patch_cost.expensive_xpaths:
+            tooltip_lines.append("Most expensive XPaths:")
+            tooltip_lines.extend(
+                f"{cost}: {xpath}" for xpath, cost in patch_cost.expensive_xpaths
+            )
+        label.setToolTip("\n".join(tooltip_lines))
+
+    @Slot()
+    def _on_refresh_button_clicked(self) -> None:
+        ModDatabase().reload()
 
     @Slot(str)
     def _update_inactive_mods_filter(self, text: str) -> None:
@@ -126,12 +428,15 @@ class MainWindowController(QObject):
             else self.main_window.inactive_mods_list_view
         )
 
-        source_model = source_list_view.model()
-        if isinstance(source_model, QSortFilterProxyModel):
-            index = source_model.mapToSource(index)
-
-        MainWindowController.move_mod_between_list_views(
-            source_list_view, index, target_list_view
+        # Double-clicking a selected mod moves the whole selection with it.
+        selection_model = source_list_view.selectionModel()
+        indexes = (
+            selection_model.selectedRows()
+            if selection_model.isSelected(index)
+            else [index]
+        )
+        MainWindowController.move_mods_between_list_views(
+            source_list_view, indexes, target_list_view
         )
 
     @Slot(QItemSelection, QItemSelection)
@@ -152,18 +457,13 @@ class MainWindowController(QObject):
                 self._clear_selected_mod_info()
 
     def _show_selected_mod_info_by_index(self, index: QModelIndex) -> None:
-        mod_id = index.data(Qt.ItemDataRole.UserRole)
-        mod = ModDatabase().get_mod_by_id(mod_id)
+        handle = index.data(Qt.ItemDataRole.UserRole)
+        mod = ModDatabase().get_mod_by_handle(handle)
         if not isinstance(mod, Mod):
             return
+        self._selected_mod = mod
 
-        if mod.preview_pixmap is not None:
-            desired_width = self.main_window.selected_mod_preview_image.width()
-            self.main_window.selected_mod_preview_image.setPixmap(
-                mod.preview_pixmap.scaledToWidth(
-                    desired_width, Qt.TransformationMode.SmoothTransformation
-                )
-            )
+        self._show_selected_mod_preview(mod)
 
         self.main_window.selected_mod_name_label.setText(mod.name)
 
@@ -173,33 +473,247 @@ class MainWindowController(QObject):
             ", ".join(mod.supported_versions)
         )
 
-        if mod.description != "":
+        # Read from About.xml, so only once.
+        description = mod.description
+        if description != "":
             self.main_window.selected_mod_description.show()
         else:
             self.main_window.selected_mod_description.hide()
-        self.main_window.selected_mod_description.setText(mod.description)
+        self.main_window.selected_mod_description.setText(description)
         height = self.main_window.selected_mod_description.document().size().height()
         self.main_window.selected_mod_description.setFixedHeight(int(height))
 
+        self._show_selected_mod_patch_cost(mod)
+
+    def _show_selected_mod_preview(self, mod: Mod) -> None:
+        """
+        Show a mod's preview image, from memory if it was shown recently, and
+        otherwise once it is decoded in the background. A preview still being
+        decoded for the previously selected mod is dropped.
+        """
+        self._cancel_preview_image()
+        preview_label = self.main_window.selected_mod_preview_image
+        signature = (
+            file_signature(mod.preview_image_path)
+            if mod.preview_image_path.name
+            else None
+        )
+        if signature is None:
+            preview_label.setPixmap(QPixmap())
+            return
+        width = self._preview_width()
+        key: PreviewPixmapKey = (str(mod.preview_image_path), signature, width)
+        preview_pixmap = self._preview_pixmaps.get(key)
+        self._log_preview_pixmap_hit_rate(preview_pixmap is not None)
+        if preview_pixmap is not None:
+            self._set_preview_pixmap(preview_pixmap)
+            return
+
+        preview_label.setPixmap(QPixmap())
+        runner = PreviewImageRunner(
+            mod.preview_image_path, width, self._preview_image_cache
+        )
+        # Keep the runner alive after it ran, so that its signals can still be
+        # compared against.
+        runner.setAutoDelete(False)
+        runner.signals.data_ready.connect(self._on_preview_image_ready)
+        self._preview_image_runner = runner
+        self._preview_pixmap_key = key
+        QThreadPool.globalInstance().start(runner)
+
+    @Slot(object)
+    def _on_preview_image_ready(self, image: object) -> None:
+        if not isinstance(image, QImage):
+            raise TypeError(f"Expected a QImage, but got {type(image)}")
+        if (
+            self._preview_image_runner is None
+            or self._preview_pixmap_key is None
+            or self.sender() != self._preview_image_runner.signals
+        ):
+            return
+        key = self._preview_pixmap_key
+        self._preview_image_runner = None
+        self._preview_pixmap_key = None
+        if image.isNull():
+            return
+        preview_pixmap = QPixmap.fromImage(image)
+        self._preview_pixmaps.put(key, preview_pixmap)
+        self._set_preview_pixmap(preview_pixmap)
+
+    def _preview_width(self) -> int:
+        """
+        :return: The width in pixels of the preview shown in the selected mod
+            panel, scaled for the screen's pixels.
+        :rtype: int
+        """
+        preview_label = self.main_window.selected_mod_preview_image
+        return round(preview_label.width() * preview_label.devicePixelRatioF())
+
+    def _log_preview_pixmap_hit_rate(self, is_hit: bool) -> None:
+        if is_hit:
+            self._preview_pixmap_hits += 1
+        else:
+            self._preview_pixmap_misses += 1
+        lookup_count = self._preview_pixmap_hits + self._preview_pixmap_misses
+        logger.debug(
+            f"Preview {'hit' if is_hit else 'miss'}: {self._preview_pixmap_hits} "
+            f"of {lookup_count} previews shown from memory "
+            f"({self._preview_pixmap_hits / lookup_count:.0%})"
+        )
+
+    @Slot(QModelIndex, QModelIndex)
+    def _on_mods_list_view_current_changed(
+        self, current: QModelIndex, previous: QModelIndex
+    ) -> None:
+        sender_object = self.sender()
+        if not isinstance(sender_object, QItemSelectionModel):
+            raise TypeError(
+                f"Expected sender of type QItemSelectionModel, but got "
+                f"{type(sender_object)}"
+            )
+        list_view = next(
+            (
+                list_view
+                for list_view in self._mod_list_views()
+                if list_view.selectionModel() is sender_object
+            ),
+            None,
+        )
+        if list_view is None or not current.isValid():
+            return
+        direction = -1 if previous.isValid() and current.row() < previous.row() else 1
+        self._prefetch(list_view, direction)
+
+    def _on_mods_list_view_scrolled(self, list_view: QListView, value: int) -> None:
+        previous_value = self._scroll_values.get(list_view, value)
+        self._scroll_values[list_view] = value
+        if value != previous_value:
+            self._prefetch(list_view, 1 if value > previous_value else -1)
+
+    def _prefetch_rows(self, list_view: QListView, direction: int) -> List[int]:
+        """
+        :return: The rows to read ahead, nearest first: those after the current
+            row in the direction, or, if the current row is scrolled out of
+            view, those from the edge of the view the rows scroll in from.
+        :rtype: List[int]
+        """
+        row_count = list_view.model().rowCount()
+        viewport = list_view.viewport()
+        current_index = list_view.currentIndex()
+        if current_index.isValid() and viewport.rect().intersects(
+            list_view.visualRect(current_index)
+        ):
+            first_row = current_index.row() + direction
+        else:
+            edge_y = 0 if direction > 0 else viewport.height() - 1
+            edge_index = list_view.indexAt(QPoint(0, edge_y))
+            if edge_index.isValid():
+                first_row = edge_index.row()
+            else:
+                first_row = 0 if direction > 0 else row_count - 1
+        rows = range(
+            first_row, first_row + direction * self.PREFETCH_ROW_COUNT, direction
+        )
+        return [row for row in rows if 0 <= row < row_count]
+
+    def _prefetch(self, list_view: QListView, direction: int) -> None:
+        """
+        Read ahead the previews and descriptions of the mods the user is moving
+        towards in a mod list. A runner still reading in the same direction is
+        left to finish; one reading the other way is cancelled.
+        """
+        if self._prefetch_runner is not None:
+            if direction == self._prefetch_direction:
+                return
+            self._prefetch_runner.cancel()
+            self._prefetch_runner = None
+
+        model = list_view.model()
+        width = self._preview_width()
+        mods: List[Mod] = []
+        previews: List[Tuple[PreviewPixmapKey, Path]] = []
+        for row in self._prefetch_rows(list_view, direction):
+            handle = model.index(row, 0).data(Qt.ItemDataRole.UserRole)
+            mod = ModDatabase().get_mod_by_handle(handle)
+            if not isinstance(mod, Mod):
+                continue
+            mods.append(mod)
+            if not mod.preview_image_path.name:
+                continue
+            signature = file_signature(mod.preview_image_path)
+            if signature is None:
+                continue
+            key: PreviewPixmapKey = (str(mod.preview_image_path), signature, width)
+            if self._preview_pixmaps.get(key) is None:
+                previews.append((key, mod.preview_image_path))
+        if not mods:
+            return
+
+        runner = PrefetchRunner(mods, previews, self._preview_image_cache)
+        # Keep the runner alive after it ran, so that its signals can still be
+        # compared against.
+        runner.setAutoDelete(False)
+        runner.signals.data_chunk_ready.connect(self._on_prefetched_preview_ready)
+        runner.signals.finished.connect(self._on_prefetch_finished)
+        self._prefetch_runner = runner
+        self._prefetch_direction = direction
+        QThreadPool.globalInstance().start(runner, self.PREFETCH_PRIORITY)
+
+    @Slot(object)
+    def _on_prefetched_preview_ready(self, preview: object) -> None:
+        if not isinstance(preview, tuple):
+            raise TypeError(f"Expected a (key, QImage) tuple, but got {type(preview)}")
+        # Previews read ahead by a cancelled runner are still worth keeping.
+        key, image = preview
+        preview_pixmap = QPixmap.fromImage(image)
+        self._preview_pixmaps.put(key, preview_pixmap)
+        if key == self._preview_pixmap_key:
+            # The selected mod's preview, read ahead before its own runner ran.
+            self._cancel_preview_image()
+            self._set_preview_pixmap(preview_pixmap)
+
+    @Slot()
+    def _on_prefetch_finished(self) -> None:
+        if (
+            self._prefetch_runner is not None
+            and self.sender() == self._prefetch_runner.signals
+        ):
+            self._prefetch_runner = None
+
+    def _set_preview_pixmap(self, preview_pixmap: QPixmap) -> None:
+        preview_label = self.main_window.selected_mod_preview_image
+        preview_pixmap.setDevicePixelRatio(preview_label.devicePixelRatioF())
+        preview_label.setPixmap(preview_pixmap)
+
+    def _cancel_preview_image(self) -> None:
+        if self._preview_image_runner is not None:
+            self._preview_image_runner.cancel()
+        self._preview_image_runner = None
+        self._preview_pixmap_key = None
+
     def _clear_selected_mod_info(self) -> None:
+        self._selected_mod = None
+        self._cancel_preview_image()
         self.main_window.selected_mod_preview_image.setPixmap(QPixmap())
         self.main_window.selected_mod_name_label.setText("")
         self.main_window.selected_mod_package_id_label.setText("")
         self.main_window.selected_mod_supported_versions_label.setText("")
+        self.main_window.selected_mod_patch_cost_label.setText("")
+        self.main_window.selected_mod_patch_cost_label.setToolTip("")
         self.main_window.selected_mod_description.setText("")
         self.main_window.selected_mod_description.hide()
 
     @staticmethod
-    def get_standard_item_model(view: QListView) -> QStandardItemModel:
-        """Retrieve the underlying QStandardItemModel from a QListView."""
+    def get_mod_list_model(view: QListView) -> ModListModel:
+        """Retrieve the underlying ModListModel from a QListView."""
         model = view.model()
 
         if isinstance(model, QSortFilterProxyModel):
             model = model.sourceModel()
 
-        if not isinstance(model, QStandardItemModel):
+        if not isinstance(model, ModListModel):
             raise TypeError(
-                f"Expected model of type QStandardItemModel, but got {type(model)}"
+                f"Expected model of type ModListModel, but got {type(model)}"
             )
 
         return model
@@ -218,21 +732,58 @@ class MainWindowController(QObject):
                 "Both source_list_view and target_list_view must be of type QListView"
             )
 
-        # Retrieve the item from the source model
-        source_model = MainWindowController.get_standard_item_model(source_list_view)
-
-        # Retrieve and clone the item
-        item = source_model.itemFromIndex(index)
-        item_clone = item.clone()
+        MainWindowController.move_mods_between_list_views(
+            source_list_view, [index], target_list_view
+        )
 
-        # Remove the item from the source model
-        source_model.removeRow(index.row())
+    @staticmethod
+    def move_mods_between_list_views(
+        source_list_view: QListView,
+        indexes: Sequence[QModelIndex],
+        target_list_view: QListView,
+        target_row: int = -1,
+    ) -> None:
+        """
+        Move mods from one list view to another, as one operation.
+
+        Only the mods' handles move; the mods themselves stay in the database.
+        Each run of consecutive rows is removed from the source list with one
+        call, and all the mods are inserted in the target list with one call,
+        in the order they had in the source list.
+
+        :param source_list_view: The list view to move the mods from.
+        :type source_list_view: QListView
+        :param indexes: The indexes of the mods, in the source list view's
+            model or in its source model.
+        :type indexes: Sequence[QModelIndex]
+        :param target_list_view: The list view to move the mods to.
+        :type target_list_view: QListView
+        :param target_row: The row to insert the mods at, or -1 for the end.
+        :type target_row: int
+        """
+        if not isinstance(source_list_view, QListView) or not isinstance(
+            target_list_view, QListView
+        ):
+            raise TypeError(
+                "Both source_list_view and target_list_view must be of type QListView"
+            )
 
-        # Add the item to the target model
-        target_model = MainWindowController.get_standard_item_model(
-            target_list_view
-        )  # Use the class name to call the static method
-        target_model.appendRow(item_clone)
+        source_model = MainWindowController.get_mod_list_model(source_list_view)
+        target_model = MainWindowController.get_mod_list_model(target_list_view)
+
+        rows: Set[int] = set()
+        for index in indexes:
+            model = index.model()
+            if isinstance(model, QSortFilterProxyModel):
+                index = model.mapToSource(index)
+            if index.isValid() and index.model() is source_model:
+                rows.add(index.row())
+        handles = [source_model.handles[row] for row in sorted(rows)]
+
+        source_model.remove_handles(handles)
+        if target_row < 0:
+            target_row = target_model.rowCount()
+        target_model.insert_handles(target_row, handles)
 
     @Slot()
     def _on_zoom_action_triggered(self) -> None:
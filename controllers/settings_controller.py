@@ -258,6 +258,14 @@ class SettingsController(QObject):
         else:
             self.settings.debug_logging = False
 
+    @Slot(int)
+    def _on_scan_worker_count_spinbox_value_changed(self, value: int) -> None:
+        self.settings.scan_worker_count = value
+
+    @Slot(int)
+    def _on_preview_memory_budget_spinbox_value_changed(self, value: int) -> None:
+        self.settings.preview_memory_budget = value
+
     def _connect_signals(self) -> None:
         EventBus().menu_bar_settings_triggered.connect(self.settings_dialog.exec)
 
@@ -330,6 +338,12 @@ class SettingsController(QObject):
         self.settings_dialog.debug_logging_checkbox.toggled.connect(
             self._on_debug_logging_button_toggled
         )
+        self.settings_dialog.scan_worker_count_spinbox.valueChanged.connect(
+            self._on_scan_worker_count_spinbox_value_changed
+        )
+        self.settings_dialog.preview_memory_budget_spinbox.valueChanged.connect(
+            self._on_preview_memory_budget_spinbox_value_changed
+        )
 
         self.settings.changed.connect(self._on_settings_changed)
 
@@ -370,6 +384,13 @@ class SettingsController(QObject):
         else:
             self.settings_dialog.debug_logging_checkbox.setChecked(False)
 
+        self.settings_dialog.scan_worker_count_spinbox.setValue(
+            self.settings.scan_worker_count
+        )
+        self.settings_dialog.preview_memory_budget_spinbox.setValue(
+            self.settings.preview_memory_budget
+        )
+
     def _autodetect_locations_windows(self) -> None:
         self.settings.game_location = None
         self.settings.config_folder_location = None
@@ -0,0 +1,56 @@
+from pathlib import Path
+from typing import Dict, List, NamedTuple
+
+
+class DefDefinition(NamedTuple):
+    """
+    A def defined in a mod's Defs files.
+    """
+
+    def_type: str
+    def_name: str
+    file: Path
+    mod_path: Path
+
+
+class DefsIndex:
+    """
+    An index of the defs defined by the installed mods, keyed by defName.
+
+    The same defName defined by more than one mod means that the later mods in
+    the load order override the earlier ones.
+    """
+
+    def __init__(self) -> None:
+        self._definitions_by_def_name: Dict[str, List[DefDefinition]] = {}
+
+    def __len__(self) -> int:
+        """
+        :return: The number of definitions in the index.
+        :rtype: int
+        """
+        return sum(
+            len(definitions) for definitions in self._definitions_by_def_name.values()
+        )
+
+    def add(self, definition: DefDefinition) -> None:
+        """
+        Add a definition to the index.
+
+        :param definition: The definition to add.
+        :type definition: DefDefinition
+        """
+        self._definitions_by_def_name.setdefault(definition.def_name, []).append(
+            definition
+        )
+
+    def get_definitions(self, def_name: str) -> List[DefDefinition]:
+        """
+        Retrieve the definitions of a defName.
+
+        :param def_name: The defName to look up.
+        :type def_name: str
+        :return: The definitions of the defName, in indexing order.
+        :rtype: List[DefDefinition]
+        """
+        return list(self._definitions_by_def_name.get(def_name, []))
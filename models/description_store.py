@@ -0,0 +1,110 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple
+
+from loguru import logger
+
+from utilities.about_xml_extractor import extract_about_xml
+
+
+def description_digest(description: str) -> int:
+    """
+    :param description: A mod description.
+    :type description: str
+    :return: A digest of the description, the same in every process.
+    :rtype: int
+    """
+    digest = hashlib.blake2b(description.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+class DescriptionStore:
+    """
+    Mod descriptions, read from About.xml when they are asked for.
+
+    Descriptions are the longest text a mod has and are only shown for the
+    selected mod, so mods do not keep them. The most recently read ones are kept
+    here, as the same few mods tend to be selected again.
+    """
+
+    _instance = None
+
+    # The number of descriptions kept.
+    CACHE_SIZE = 32
+
+    def __new__(cls) -> "DescriptionStore":
+        """
+        Ensure a single instance of DescriptionStore is created (Singleton pattern).
+        """
+        if cls._instance is None:
+            cls._instance = super(DescriptionStore, cls).__new__(cls)
+            cls._instance._is_initialized = False
+        return cls._instance
+
+    def __init__(self) -> None:
+        """
+        Initialize the DescriptionStore.
+        """
+        if hasattr(self, "_is_initialized") and self._is_initialized:
+            return
+
+        # Descriptions keyed by About.xml path and the digest of the description
+        # the mod was scanned with, least recently used first.
+        self._descriptions: "OrderedDict[Tuple[str, int], str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._is_initialized: bool = True
+
+    def get(self, about_xml_path: Path, digest: int) -> str:
+        """
+        Get the description of a mod.
+
+        :param about_xml_path: The path to the mod's About.xml.
+        :type about_xml_path: Path
+        :param digest: The description_digest() of the description the mod was
+            scanned with. A mod whose About.xml changed gets a new digest, and so
+            does not get the description cached for the old one.
+        :type digest: int
+        :return: The description, or "" if About.xml cannot be read or no longer
+            holds the description the mod was scanned with.
+        :rtype: str
+        """
+        key = (str(about_xml_path), digest)
+        with self._lock:
+            description: Optional[str] = self._descriptions.get(key)
+            if description is not None:
+                self._descriptions.move_to_end(key)
+                return description
+
+        try:
+            description = str(extract_about_xml(about_xml_path)["description"])
+        except Exception as e:
+            logger.warning(f"Could not read the description from {about_xml_path}: {e}")
+            return ""
+        if description_digest(description) != digest:
+            # About.xml was edited since the mod was scanned; the rescan that
+            # follows makes a new mod with the new description.
+            logger.debug(f"The description in {about_xml_path} changed since the scan")
+            return ""
+
+        with self._lock:
+            self._descriptions[key] = description
+            while len(self._descriptions) > self.CACHE_SIZE:
+                self._descriptions.popitem(last=False)
+        return description
+
+    def clear(self) -> None:
+        """
+        Forget all cached descriptions.
+        """
+        with self._lock:
+            self._descriptions.clear()
+
+    def __len__(self) -> int:
+        """
+        :return: The number of cached descriptions.
+        :rtype: int
+        """
+        return len(self._descriptions)
@@ -1,14 +1,60 @@
-import uuid
+import os
+import sys
 from pathlib import Path
-from typing import Optional, List
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+from uuid import UUID, uuid4
 
-from PySide6.QtGui import QStandardItem, Qt, QPixmap
+from models.description_store import DescriptionStore, description_digest
+from utilities.mod_load_folders import LoadFolder
 
+# Shared by every mod without per-version lists, and read-only so that it stays
+# empty.
+_NO_PACKAGE_IDS_BY_VERSION: Mapping[str, Tuple[str, ...]] = MappingProxyType({})
 
-class Mod(QStandardItem):
+
+# A load folder as a mod stores it: its path relative to the mod folder, then its
+# conditions.
+_CompactLoadFolder = Tuple[str, Tuple[str, ...], Tuple[str, ...], Tuple[str, ...]]
+
+
+def _interned(values: Optional[Iterable[str]]) -> Tuple[str, ...]:
+    # Versions, package IDs and authors repeat across thousands of mods; interned,
+    # every mod shares one copy of each.
+    if not values:
+        return ()
+    return tuple(sys.intern(str(value)) for value in values)
+
+
+def _package_ids_by_version(
+    value: Optional[Mapping[str, Iterable[str]]]
+) -> Mapping[str, Tuple[str, ...]]:
+    if not value:
+        return _NO_PACKAGE_IDS_BY_VERSION
+    return {
+        sys.intern(str(version)): _interned(package_ids)
+        for version, package_ids in value.items()
+    }
+
+
+class Mod:
     """
     Represents a RimWorld mod.
 
+    This is the metadata of a mod, and nothing else: it holds no Qt objects, so
+    it can be created and used on any thread, or without a Qt application. List
+    fields are stored as tuples of interned strings and the attributes live in
+    slots, which keeps thousands of mods small. The mod lists hold only the
+    mod's handle.
+
+    The description a mod with an About.xml is created with is not kept: it is
+    read again from About.xml, through the DescriptionStore, when it is asked
+    for. A description assigned later is kept.
+
+    A mod in the ModDatabase is not changed once added: a mod that changed is
+    replaced with a new one that takes its handle, so that snapshots of the
+    database never change under their readers.
+
     :param name: The display name of the mod.
     :type name: str, optional
     :param package_id: The unique identifier for the mod package.
@@ -19,8 +65,71 @@ class Mod(QStandardItem):
     :type description: str, optional
     :param preview_image_path: The path to the mod's preview image.
     :type preview_image_path: Path, optional
+    :param path: The path to the mod's folder.
+    :type path: Path, optional
+    :param about_xml_path: The path to the mod's About.xml.
+    :type about_xml_path: Path, optional
+    :param authors: The authors of the mod.
+    :type authors: List[str], optional
+    :param url: The URL of the mod's homepage.
+    :type url: str, optional
+    :param mod_version: The version of the mod itself.
+    :type mod_version: str, optional
+    :param dependencies: The package IDs of the mods this mod requires.
+    :type dependencies: List[str], optional
+    :param dependencies_by_version: The package IDs of the mods this mod requires, per game version.
+    :type dependencies_by_version: Dict[str, List[str]], optional
+    :param load_before: The package IDs of the mods this mod loads before.
+    :type load_before: List[str], optional
+    :param load_before_by_version: The package IDs of the mods this mod loads before, per game version.
+    :type load_before_by_version: Dict[str, List[str]], optional
+    :param load_after: The package IDs of the mods this mod loads after.
+    :type load_after: List[str], optional
+    :param load_after_by_version: The package IDs of the mods this mod loads after, per game version.
+    :type load_after_by_version: Dict[str, List[str]], optional
+    :param incompatible_with: The package IDs of the mods this mod is incompatible with.
+    :type incompatible_with: List[str], optional
+    :param incompatible_with_by_version: The package IDs of the mods this mod is incompatible with, per game version.
+    :type incompatible_with_by_version: Dict[str, List[str]], optional
+    :param force_load_before: The package IDs of the mods this mod always loads before.
+    :type force_load_before: List[str], optional
+    :param force_load_after: The package IDs of the mods this mod always loads after.
+    :type force_load_after: List[str], optional
+    :param published_file_id: The Steam Workshop ID of the mod.
+    :type published_file_id: str, optional
+    :param load_folders: The folders the game loads the mod's content from.
+    :type load_folders: List[LoadFolder], optional
     """
 
+    # The slots that identify the mod, then those that describe it.
+    _IDENTITY_SLOTS = ("_handle", "_uuid")
+    _METADATA_SLOTS = (
+        "_name",
+        "_package_id",
+        "_supported_versions",
+        "_description",
+        "_description_digest",
+        "_preview_image_path",
+        "_path",
+        "_about_xml_path",
+        "_authors",
+        "_url",
+        "_mod_version",
+        "_dependencies",
+        "_dependencies_by_version",
+        "_load_before",
+        "_load_before_by_version",
+        "_load_after",
+        "_load_after_by_version",
+        "_incompatible_with",
+        "_incompatible_with_by_version",
+        "_force_load_before",
+        "_force_load_after",
+        "_published_file_id",
+        "_load_folders",
+    )
+    __slots__ = _IDENTITY_SLOTS + _METADATA_SLOTS
+
     def __init__(
         self,
         name: str = "",
@@ -28,20 +137,55 @@ class Mod(QStandardItem):
         supported_versions: Optional[List[str]] = None,
         description: str = "",
         preview_image_path: Path = Path(""),
+        path: Path = Path(""),
+        about_xml_path: Path = Path(""),
+        authors: Optional[List[str]] = None,
+        url: str = "",
+        mod_version: str = "",
+        dependencies: Optional[List[str]] = None,
+        dependencies_by_version: Optional[Dict[str, List[str]]] = None,
+        load_before: Optional[List[str]] = None,
+        load_before_by_version: Optional[Dict[str, List[str]]] = None,
+        load_after: Optional[List[str]] = None,
+        load_after_by_version: Optional[Dict[str, List[str]]] = None,
+        incompatible_with: Optional[List[str]] = None,
+        incompatible_with_by_version: Optional[Dict[str, List[str]]] = None,
+        force_load_before: Optional[List[str]] = None,
+        force_load_after: Optional[List[str]] = None,
+        published_file_id: str = "",
+        load_folders: Optional[List[LoadFolder]] = None,
     ) -> None:
-        super().__init__(name)
-
-        self._id = uuid.uuid4()
+        # Assigned when the mod is added to the database.
+        self._handle = -1
+        # Made on first use, as nothing inside the application needs it.
+        self._uuid: Optional[UUID] = None
 
         self._name = name
         self._package_id = package_id
-        self._supported_versions = (
-            list(supported_versions) if supported_versions else []
+        self._supported_versions = _interned(supported_versions)
+        # Paths are stored as strings, which take a fraction of the memory.
+        self._preview_image_path = str(preview_image_path)
+        self._path = path
+        # Path("") would become ".", which is not empty.
+        self._about_xml_path = str(about_xml_path) if about_xml_path.name else ""
+        self._set_description(description)
+        self._authors = _interned(authors)
+        self._url = url
+        self._mod_version = sys.intern(mod_version)
+        self._dependencies = _interned(dependencies)
+        self._dependencies_by_version = _package_ids_by_version(dependencies_by_version)
+        self._load_before = _interned(load_before)
+        self._load_before_by_version = _package_ids_by_version(load_before_by_version)
+        self._load_after = _interned(load_after)
+        self._load_after_by_version = _package_ids_by_version(load_after_by_version)
+        self._incompatible_with = _interned(incompatible_with)
+        self._incompatible_with_by_version = _package_ids_by_version(
+            incompatible_with_by_version
         )
-        self._description = description
-        self._preview_image_path = preview_image_path
-
-        self._preview_pixmap: Optional[QPixmap] = None
+        self._force_load_before = _interned(force_load_before)
+        self._force_load_after = _interned(force_load_after)
+        self._published_file_id = published_file_id
+        self._load_folders = self._compact_load_folders(load_folders or ())
 
         if self._name == "" and self._package_id.lower() == "ludeon.rimworld":
             self._name = "Core"
@@ -55,16 +199,55 @@ class Mod(QStandardItem):
         if self._name == "" and self._package_id.lower() == "ludeon.rimworld.biotech":
             self._name = "Biotech"
 
-        self.setData(self.name, Qt.ItemDataRole.DisplayRole)
-        self.setData(self.id, Qt.ItemDataRole.UserRole)
+    def has_same_metadata(self, other: "Mod") -> bool:
+        """
+        Compare the metadata of two mods, without reading their descriptions.
+
+        :param other: The mod to compare with.
+        :type other: Mod
+        :return: True if every field but the handle and UUID is the same.
+        :rtype: bool
+        """
+        return all(
+            getattr(self, slot) == getattr(other, slot)
+            for slot in self._METADATA_SLOTS
+            if slot != "_description"
+        )
+
+    def take_identity_of(self, other: "Mod") -> None:
+        """
+        Take the handle and UUID of another mod, so that this mod replaces it.
+
+        :param other: The mod to replace.
+        :type other: Mod
+        """
+        self._handle = other._handle
+        # Made now if need be, so that both mods have the same one.
+        self._uuid = other.uuid
 
     @property
-    def id(self) -> uuid.UUID:
+    def handle(self) -> int:
         """
-        :return: The unique identifier of the mod.
-        :rtype: uuid.UUID
+        :return: The handle of the mod: a small integer, unique among the mods
+            of the database, or -1 if the mod was never added to it.
+        :rtype: int
         """
-        return self._id
+        return self._handle
+
+    @handle.setter
+    def handle(self, value: int) -> None:
+        self._handle = value
+
+    @property
+    def uuid(self) -> UUID:
+        """
+        :return: A unique identifier of the mod, for use outside the application.
+            Handles are only unique within one database.
+        :rtype: UUID
+        """
+        if self._uuid is None:
+            self._uuid = uuid4()
+        return self._uuid
 
     @property
     def name(self) -> str:
@@ -77,7 +260,6 @@ class Mod(QStandardItem):
     @name.setter
     def name(self, value: str) -> None:
         self._name = value
-        self.setData(self._name, Qt.ItemDataRole.DisplayRole)
 
     @property
     def package_id(self) -> str:
@@ -92,16 +274,16 @@ class Mod(QStandardItem):
         self._package_id = value
 
     @property
-    def supported_versions(self) -> List[str]:
+    def supported_versions(self) -> Tuple[str, ...]:
         """
         :return: A list of versions the mod supports.
-        :rtype: List[str]
+        :rtype: Tuple[str, ...]
         """
         return self._supported_versions
 
     @supported_versions.setter
-    def supported_versions(self, value: List[str]) -> None:
-        self._supported_versions = list(value)
+    def supported_versions(self, value: Tuple[str, ...]) -> None:
+        self._supported_versions = _interned(value)
 
     @property
     def description(self) -> str:
@@ -109,11 +291,23 @@ class Mod(QStandardItem):
         :return: A brief description of the mod.
         :rtype: str
         """
-        return self._description
+        if self._description is not None:
+            return self._description
+        return DescriptionStore().get(
+            Path(self._about_xml_path), self._description_digest
+        )
 
     @description.setter
     def description(self, value: str) -> None:
-        self._description = value
+        self._set_description(value, keep=True)
+
+    def _set_description(self, value: str, keep: bool = False) -> None:
+        # The digest tells whether the description changed without reading it.
+        self._description_digest = description_digest(value)
+        if value and self._about_xml_path and not keep:
+            self._description: Optional[str] = None
+        else:
+            self._description = value
 
     @property
     def preview_image_path(self) -> Path:
@@ -121,17 +315,235 @@ class Mod(QStandardItem):
         :return: The path to the mod's preview image.
         :rtype: Path
         """
-        return self._preview_image_path
+        return Path(self._preview_image_path)
 
     @preview_image_path.setter
     def preview_image_path(self, value: Path) -> None:
-        self._preview_image_path = value
+        self._preview_image_path = str(value)
+
+    @property
+    def about_xml_path(self) -> Path:
+        """
+        :return: The path to the mod's About.xml, or Path("") if it has none.
+        :rtype: Path
+        """
+        return Path(self._about_xml_path)
+
+    @about_xml_path.setter
+    def about_xml_path(self, value: Path) -> None:
+        # Kept, as the new About.xml may hold another description.
+        self.description = self.description
+        self._about_xml_path = str(value) if value.name else ""
+
+    @property
+    def path(self) -> Path:
+        """
+        :return: The path to the mod's folder.
+        :rtype: Path
+        """
+        return self._path
+
+    @path.setter
+    def path(self, value: Path) -> None:
+        self._path = value
+
+    @property
+    def authors(self) -> Tuple[str, ...]:
+        """
+        :return: The authors of the mod.
+        :rtype: Tuple[str, ...]
+        """
+        return self._authors
+
+    @authors.setter
+    def authors(self, value: Tuple[str, ...]) -> None:
+        self._authors = _interned(value)
+
+    @property
+    def url(self) -> str:
+        """
+        :return: The URL of the mod's homepage.
+        :rtype: str
+        """
+        return self._url
+
+    @url.setter
+    def url(self, value: str) -> None:
+        self._url = value
+
+    @property
+    def mod_version(self) -> str:
+        """
+        :return: The version of the mod itself.
+        :rtype: str
+        """
+        return self._mod_version
+
+    @mod_version.setter
+    def mod_version(self, value: str) -> None:
+        self._mod_version = sys.intern(value)
+
+    @property
+    def dependencies(self) -> Tuple[str, ...]:
+        """
+        :return: The package IDs of the mods this mod requires.
+        :rtype: Tuple[str, ...]
+        """
+        return self._dependencies
+
+    @dependencies.setter
+    def dependencies(self, value: Tuple[str, ...]) -> None:
+        self._dependencies = _interned(value)
+
+    @property
+    def dependencies_by_version(self) -> Mapping[str, Tuple[str, ...]]:
+        """
+        :return: The package IDs of the mods this mod requires, per game version.
+        :rtype: Mapping[str, Tuple[str, ...]]
+        """
+        return self._dependencies_by_version
+
+    @dependencies_by_version.setter
+    def dependencies_by_version(self, value: Mapping[str, Tuple[str, ...]]) -> None:
+        self._dependencies_by_version = _package_ids_by_version(value)
+
+    @property
+    def load_before(self) -> Tuple[str, ...]:
+        """
+        :return: The package IDs of the mods this mod loads before.
+        :rtype: Tuple[str, ...]
+        """
+        return self._load_before
+
+    @load_before.setter
+    def load_before(self, value: Tuple[str, ...]) -> None:
+        self._load_before = _interned(value)
+
+    @property
+    def load_before_by_version(self) -> Mapping[str, Tuple[str, ...]]:
+        """
+        :return: The package IDs of the mods this mod loads before, per game version.
+        :rtype: Mapping[str, Tuple[str, ...]]
+        """
+        return self._load_before_by_version
+
+    @load_before_by_version.setter
+    def load_before_by_version(self, value: Mapping[str, Tuple[str, ...]]) -> None:
+        self._load_before_by_version = _package_ids_by_version(value)
+
+    @property
+    def load_after(self) -> Tuple[str, ...]:
+        """
+        :return: The package IDs of the mods this mod loads after.
+        :rtype: Tuple[str, ...]
+        """
+        return self._load_after
+
+    @load_after.setter
+    def load_after(self, value: Tuple[str, ...]) -> None:
+        self._load_after = _interned(value)
+
+    @property
+    def load_after_by_version(self) -> Mapping[str, Tuple[str, ...]]:
+        """
+        :return: The package IDs of the mods this mod loads after, per game version.
+        :rtype: Mapping[str, Tuple[str, ...]]
+        """
+        return self._load_after_by_version
+
+    @load_after_by_version.setter
+    def load_after_by_version(self, value: Mapping[str, Tuple[str, ...]]) -> None:
+        self._load_after_by_version = _package_ids_by_version(value)
+
+    @property
+    def incompatible_with(self) -> Tuple[str, ...]:
+        """
+        :return: The package IDs of the mods this mod is incompatible with.
+        :rtype: Tuple[str, ...]
+        """
+        return self._incompatible_with
+
+    @incompatible_with.setter
+    def incompatible_with(self, value: Tuple[str, ...]) -> None:
+        self._incompatible_with = _interned(value)
+
+    @property
+    def incompatible_with_by_version(self) -> Mapping[str, Tuple[str, ...]]:
+        """
+        :return: The package IDs of the mods this mod is incompatible with, per game version.
+        :rtype: Mapping[str, Tuple[str, ...]]
+        """
+        return self._incompatible_with_by_version
+
+    @incompatible_with_by_version.setter
+    def incompatible_with_by_version(
+        self, value: Mapping[str, Tuple[str, ...]]
+    ) -> None:
+        self._incompatible_with_by_version = _package_ids_by_version(value)
+
+    @property
+    def force_load_before(self) -> Tuple[str, ...]:
+        """
+        :return: The package IDs of the mods this mod always loads before.
+        :rtype: Tuple[str, ...]
+        """
+        return self._force_load_before
+
+    @force_load_before.setter
+    def force_load_before(self, value: Tuple[str, ...]) -> None:
+        self._force_load_before = _interned(value)
+
+    @property
+    def force_load_after(self) -> Tuple[str, ...]:
+        """
+        :return: The package IDs of the mods this mod always loads after.
+        :rtype: Tuple[str, ...]
+        """
+        return self._force_load_after
+
+    @force_load_after.setter
+    def force_load_after(self, value: Tuple[str, ...]) -> None:
+        self._force_load_after = _interned(value)
 
     @property
-    def preview_pixmap(self) -> Optional[QPixmap]:
-        if self._preview_pixmap is None and self._preview_image_path.exists():
-            self._preview_pixmap = QPixmap(str(self._preview_image_path))
-        return self._preview_pixmap
+    def published_file_id(self) -> str:
+        """
+        :return: The Steam Workshop ID of the mod.
+        :rtype: str
+        """
+        return self._published_file_id
+
+    @published_file_id.setter
+    def published_file_id(self, value: str) -> None:
+        self._published_file_id = value
+
+    @property
+    def load_folders(self) -> Tuple[LoadFolder, ...]:
+        """
+        :return: The folders the game loads the mod's content from, in load order.
+        :rtype: Tuple[LoadFolder, ...]
+        """
+        return tuple(
+            LoadFolder(self._path / relative_path, *conditions)
+            for relative_path, *conditions in self._load_folders
+        )
+
+    @load_folders.setter
+    def load_folders(self, value: Tuple[LoadFolder, ...]) -> None:
+        self._load_folders = self._compact_load_folders(value)
+
+    def _compact_load_folders(
+        self, load_folders: Iterable[LoadFolder]
+    ) -> Tuple[_CompactLoadFolder, ...]:
+        return tuple(
+            (
+                os.path.relpath(load_folder.path, self._path),
+                load_folder.if_mod_active,
+                load_folder.if_mod_active_all,
+                load_folder.if_mod_not_active,
+            )
+            for load_folder in load_folders
+        )
 
     def __str__(self) -> str:
         """
@@ -0,0 +1,121 @@
+from pathlib import Path
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+
+from models.mod import Mod
+from models.mod_database import ModDatabase
+from utilities.mod_load_folders import game_version_key
+
+
+class ModBadges(NamedTuple):
+    """
+    The badges shown next to a mod's name in the mod lists.
+    """
+
+    # The label of the folder the mod was loaded from, e.g. "Local".
+    folder_label: str = ""
+    # The newest game version the mod supports, if it does not support the
+    # game version.
+    unsupported_version: str = ""
+    # The package IDs of the mods this mod requires that are not installed.
+    missing_dependencies: Tuple[str, ...] = ()
+
+
+class ModBadgeProvider:
+    """
+    Works out the badges of mods, and keeps them until the mods change.
+
+    The badges of a mod depend on other mods as well, so the cache must be
+    cleared whenever mods are added, removed or updated.
+
+    :param game_version: The game version, e.g. "1.5.4104 rev435". Mods are not
+        checked against an unknown game version.
+    :type game_version: str
+    :param folder_labels: The labels of the mod folders.
+    :type folder_labels: Optional[Dict[Path, str]]
+    :param get_mod: Look up a mod by its handle. Defaults to the mod database.
+    :type get_mod: Optional[Callable[[int], Optional[Mod]]]
+    :param get_mod_by_package_id: Look up a mod by its package ID. Defaults to
+        the mod database.
+    :type get_mod_by_package_id: Optional[Callable[[str], Optional[Mod]]]
+    """
+
+    def __init__(
+        self,
+        game_version: str = "",
+        folder_labels: Optional[Dict[Path, str]] = None,
+        get_mod: Optional[Callable[[int], Optional[Mod]]] = None,
+        get_mod_by_package_id: Optional[Callable[[str], Optional[Mod]]] = None,
+    ) -> None:
+        self._game_version_key = game_version_key(game_version)
+        self._folder_labels: Dict[Path, str] = dict(folder_labels or {})
+        self._get_mod = (
+            get_mod if get_mod is not None else ModDatabase().get_mod_by_handle
+        )
+        self._get_mod_by_package_id = (
+            get_mod_by_package_id
+            if get_mod_by_package_id is not None
+            else ModDatabase().get_mod_by_package_id
+        )
+        self._badges_by_handle: Dict[int, ModBadges] = {}
+
+    def set_folder_labels(self, folder_labels: Dict[Path, str]) -> None:
+        """
+        Change the labels of the mod folders.
+
+        :param folder_labels: The labels of the mod folders.
+        :type folder_labels: Dict[Path, str]
+        """
+        self._folder_labels = dict(folder_labels)
+        self.clear()
+
+    def clear(self) -> None:
+        """
+        Forget the badges worked out so far.
+        """
+        self._badges_by_handle.clear()
+
+    def get(self, handle: int) -> ModBadges:
+        """
+        :param handle: The handle of the mod.
+        :type handle: int
+        :return: The badges of the mod, or no badges if it is not in the
+            database.
+        :rtype: ModBadges
+        """
+        badges = self._badges_by_handle.get(handle)
+        if badges is None:
+            mod = self._get_mod(handle)
+            badges = self.badges_of(mod) if mod is not None else ModBadges()
+            self._badges_by_handle[handle] = badges
+        return badges
+
+    def badges_of(self, mod: Mod) -> ModBadges:
+        """
+        Work out the badges of a mod, without the cache.
+
+        :param mod: The mod.
+        :type mod: Mod
+        :return: The badges of the mod.
+        :rtype: ModBadges
+        """
+        unsupported_version = ""
+        if self._game_version_key is not None and mod.supported_versions:
+            versions_by_key = {
+                game_version_key(version): version for version in mod.supported_versions
+            }
+            if self._game_version_key not in versions_by_key:
+                keys = [key for key in versions_by_key if key is not None]
+                if keys:
+                    unsupported_version = versions_by_key[max(keys)]
+
+        missing_dependencies = tuple(
+            package_id
+            for package_id in mod.dependencies
+            if self._get_mod_by_package_id(package_id) is None
+        )
+
+        return ModBadges(
+            self._folder_labels.get(mod.path.parent, ""),
+            unsupported_version,
+            missing_dependencies,
+        )
@@ -1,12 +1,115 @@
+import threading
+import time
 from pathlib import Path
-from typing import Optional, Dict, List
+from typing import (
+    Any,
+    Optional,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Set,
+    Tuple,
+)
 
-import uuid
 from PySide6.QtCore import QObject, Slot, QThreadPool
+from loguru import logger
 
+from models.defs_index import DefDefinition, DefsIndex
 from models.mod import Mod
+from models.mod_database_snapshot import ModDatabaseSnapshot
+from models.mod_indexes import ModIndexes
+from runners.defs_index_runner import DefsIndexRunner
 from runners.mods_from_folders_runner import ModsFromFoldersRunner
+from utilities.app_info import AppInfo
 from utilities.event_bus import EventBus
+from utilities.memory_usage import deep_size_of
+from utilities.mod_folder_watcher import ModFolderWatcher
+
+
+class ScanDiff(NamedTuple):
+    """
+    The differences between a scan and the mods in the database.
+    """
+
+    # The Mod keyword arguments of the mods that are new.
+    added: List[Dict[str, Any]]
+    # The mods that are still there, with their scanned keyword arguments, which
+    # may or may not differ from the mods.
+    matched: List[Tuple[Mod, Dict[str, Any]]]
+    # The mods that are gone.
+    removed: List[Mod]
+
+
+def diff_scan(
+    mods_by_path: Mapping[Path, Mod],
+    scanned_data: List[Dict[str, Any]],
+    scanned_folders: Iterable[Path],
+    mod_folders: Iterable[Path],
+    scanned_mod_folders: Iterable[Path] = (),
+) -> ScanDiff:
+    """
+    Work out the differences between a scan and the mods in the database.
+
+    Mods are matched by folder first. A new folder with the package ID of a mod
+    whose folder is gone, e.g. a renamed folder or a mod moved to another mod
+    folder, is matched to that mod, so that it keeps its handle. Mods outside
+    the mod folders are removed, whether they were scanned or not.
+
+    :param mods_by_path: The mods in the database, keyed by folder.
+    :type mods_by_path: Mapping[Path, Mod]
+    :param scanned_data: The Mod keyword arguments of the scanned mods.
+    :type scanned_data: List[Dict[str, Any]]
+    :param scanned_folders: The mod folders that were scanned.
+    :type scanned_folders: Iterable[Path]
+    :param mod_folders: All mod folders.
+    :type mod_folders: Iterable[Path]
+    :param scanned_mod_folders: The folders of single mods that were scanned.
+    :type scanned_mod_folders: Iterable[Path]
+    :return: The differences.
+    :rtype: ScanDiff
+    """
+    scanned_folder_set = set(scanned_folders)
+    mod_folder_set = set(mod_folders)
+    scanned_mod_folder_set = set(scanned_mod_folders)
+
+    scan_diff = ScanDiff([], [], [])
+    new_items: List[Dict[str, Any]] = []
+    scanned_paths: Set[Path] = set()
+    for item in scanned_data:
+        scanned_paths.add(item["path"])
+        mod = mods_by_path.get(item["path"])
+        if mod is None:
+            new_items.append(item)
+        else:
+            scan_diff.matched.append((mod, item))
+
+    vanished_mods_by_package_id: Dict[str, List[Mod]] = {}
+    for path, mod in mods_by_path.items():
+        if path in scanned_paths:
+            continue
+        if (
+            path.parent in scanned_folder_set
+            or path in scanned_mod_folder_set
+            or path.parent not in mod_folder_set
+        ):
+            vanished_mods_by_package_id.setdefault(mod.package_id.lower(), []).append(
+                mod
+            )
+
+    for item in new_items:
+        package_id = str(item.get("package_id", "")).lower()
+        # Mods without a package ID cannot be told apart, so they are not matched.
+        vanished_mods = vanished_mods_by_package_id.get(package_id)
+        if package_id and vanished_mods:
+            scan_diff.matched.append((vanished_mods.pop(0), item))
+        else:
+            scan_diff.added.append(item)
+    for vanished_mods in vanished_mods_by_package_id.values():
+        scan_diff.removed.extend(vanished_mods)
+    return scan_diff
 
 
 class ModDatabase(QObject):
@@ -16,7 +119,17 @@ class ModDatabase(QObject):
 
     _instance = None
 
-    def __new__(cls, from_folders: Optional[List[Path]] = None) -> "ModDatabase":
+    # The initial load streams mods to the lists in chunks of this many mods, or
+    # of whatever was scanned in this many milliseconds, whichever comes first.
+    LOAD_CHUNK_SIZE = 50
+    LOAD_CHUNK_INTERVAL_MS = 100
+
+    def __new__(
+        cls,
+        from_folders: Optional[List[Optional[Path]]] = None,
+        worker_count: int = 1,
+        game_version: str = "",
+    ) -> "ModDatabase":
         """
         Ensure a single instance of ModDatabase is created (Singleton pattern).
         """
@@ -25,9 +138,21 @@ class ModDatabase(QObject):
             cls._instance._is_initialized = False
         return cls._instance
 
-    def __init__(self, from_folders: Optional[List[Optional[Path]]] = None) -> None:
+    def __init__(
+        self,
+        from_folders: Optional[List[Optional[Path]]] = None,
+        worker_count: int = 1,
+        game_version: str = "",
+    ) -> None:
         """
         Initialize the ModDatabase.
+
+        :param from_folders: The folders to load mods from.
+        :type from_folders: Optional[List[Optional[Path]]]
+        :param worker_count: The number of processes to scan the folders with.
+        :type worker_count: int
+        :param game_version: The game version to work out mods' load folders for.
+        :type game_version: str
         """
         if hasattr(self, "_is_initialized") and self._is_initialized:
             return
@@ -39,10 +164,52 @@ class ModDatabase(QObject):
 
         super().__init__()
 
-        self._mods_by_id: Dict[uuid.UUID, Mod] = {}
-        self._mods_by_package_id: Dict[str, Mod] = {}
+        # Indexed by handle. The slots of removed mods stay empty, so that a
+        # handle never changes meaning while a list may still hold it.
+        self._mods_by_handle: List[Optional[Mod]] = []
+        self._mods_by_path: Dict[Path, Mod] = {}
 
-        self._load_mods(from_folders)
+        self._from_folders = [folder for folder in from_folders if folder is not None]
+        # Package IDs, authors, folders, versions and Workshop IDs.
+        self._indexes = ModIndexes(self._from_folders)
+
+        # Changes happen on the GUI thread; readers on other threads take a
+        # snapshot. Every change starts a new generation, and the snapshot of a
+        # generation is taken once, by the first reader that asks for it.
+        self._lock = threading.RLock()
+        self._generation = 0
+        self._snapshot: Optional[ModDatabaseSnapshot] = None
+        self._worker_count = worker_count
+        self._game_version = game_version
+
+        # The folders being scanned right now, and the folders to rescan once
+        # that scan is done; the same for the folders of single mods. Scans
+        # never overlap, so they never race on the scan cache or on the database
+        # contents.
+        self._scanning_folders: Optional[List[Path]] = None
+        self._scanning_mod_folders: List[Path] = []
+        self._pending_rescan_folders: Set[Path] = set()
+        self._pending_rescan_mod_folders: Set[Path] = set()
+
+        # Signals from any other runner come from a cancelled scan and are
+        # ignored.
+        self._runner: Optional[ModsFromFoldersRunner] = None
+        # Set once a scan of all folders has finished: the initial load, or the
+        # rescan that replaced it if reload() cancelled it.
+        self._is_loaded = False
+
+        # The defs index is rebuilt in the background whenever the mods change;
+        # until then, queries are answered from the previous index.
+        self._defs_index = DefsIndex()
+        self._defs_index_runner: Optional[DefsIndexRunner] = None
+
+        # Only the folders are watched until the first scan is done; see
+        # _on_load_finished.
+        self._folder_watcher = ModFolderWatcher(self._from_folders)
+        self._folder_watcher.mod_folders_changed.connect(self._on_mod_folders_changed)
+        self._folder_watcher.mods_changed.connect(self._on_mods_changed)
+
+        self._load_mods(from_folders, worker_count)
 
         self._is_initialized: bool = True
 
@@ -55,30 +222,161 @@ class ModDatabase(QObject):
         :param mod: The Mod object to add.
         :type mod: Mod
         """
-        self._mods_by_id[mod.id] = mod
-        self._mods_by_package_id[mod.package_id.lower()] = mod
+        with self._lock:
+            if 0 <= mod.handle < len(self._mods_by_handle):
+                # A mod that replaces an updated one has its handle.
+                self._mods_by_handle[mod.handle] = mod
+            else:
+                mod.handle = len(self._mods_by_handle)
+                self._mods_by_handle.append(mod)
+            self._mods_by_path[mod.path] = mod
+            self._indexes.add(mod)
+            self._start_generation()
+
+    def snapshot(self) -> ModDatabaseSnapshot:
+        """
+        Take a snapshot of the mods in the database, to read on any thread.
+
+        Snapshots are shared: until the database changes, every reader gets the
+        same one. The first reader after a change pays for copying the mods,
+        which grows with the number of mods; later readers pay nothing.
+
+        :return: The snapshot of the current generation.
+        :rtype: ModDatabaseSnapshot
+        """
+        with self._lock:
+            if self._snapshot is None:
+                self._snapshot = ModDatabaseSnapshot(
+                    self._generation,
+                    self._mods_by_handle,
+                    self._mods_by_path,
+                    self._indexes.get_mods_by_package_id(),
+                )
+            return self._snapshot
+
+    def _start_generation(self) -> None:
+        """
+        Start a new generation after a change, dropping the snapshot of the
+        previous one. Readers that hold it keep it.
+        """
+        self._generation += 1
+        self._snapshot = None
 
     def get_mod_by_package_id(self, mod_package_id: str) -> Optional[Mod]:
         """
         Retrieve a Mod object by its package ID.
 
+        When the package ID is installed in more than one folder, this is the
+        copy in the folder that comes first, which is the one RimWorld loads.
+
         :param mod_package_id: The package ID of the Mod.
         :type mod_package_id: str
         :return: The Mod object if found, otherwise None.
         :rtype: Optional[Mod]
         """
-        return self._mods_by_package_id.get(mod_package_id.lower())
+        return self._indexes.get_by_package_id(mod_package_id)
 
-    def get_mod_by_id(self, mod_id: uuid.UUID) -> Optional[Mod]:
+    def get_mod_candidates(self, mod_package_id: str) -> List[Mod]:
+        """
+        Retrieve every installed copy of a package ID.
+
+        :param mod_package_id: The package ID of the Mod.
+        :type mod_package_id: str
+        :return: The Mod objects, the one RimWorld loads first.
+        :rtype: List[Mod]
         """
-        Retrieve a Mod object by its UUID.
+        return self._indexes.get_candidates(mod_package_id)
 
-        :param mod_id: The UUID of the Mod.
-        :type mod_id: uuid.UUID
+    def get_shadowing_mod(self, mod: Mod) -> Optional[Mod]:
+        """
+        Retrieve the copy of a Mod that RimWorld loads instead of it.
+
+        :param mod: The Mod object.
+        :type mod: Mod
+        :return: The Mod object that shadows it, or None if it is not shadowed.
+        :rtype: Optional[Mod]
+        """
+        return self._indexes.get_shadowing_mod(mod)
+
+    def get_shadowed_mods(self) -> List[Mod]:
+        """
+        Retrieve the Mod objects that RimWorld does not load, because another
+        copy of the same package ID takes precedence.
+
+        :return: The shadowed Mod objects.
+        :rtype: List[Mod]
+        """
+        return self._indexes.get_shadowed_mods()
+
+    def find_mods(
+        self,
+        author: Optional[str] = None,
+        folder: Optional[Path] = None,
+        supported_version: Optional[str] = None,
+        published_file_id: Optional[str] = None,
+    ) -> List[Mod]:
+        """
+        Find the Mod objects that match all of the given criteria, e.g. all mods
+        from the Steam mods folder that support 1.5.
+
+        :param author: An author of the Mod, in any case.
+        :type author: Optional[str]
+        :param folder: The folder the Mod was loaded from.
+        :type folder: Optional[Path]
+        :param supported_version: A game version the Mod supports.
+        :type supported_version: Optional[str]
+        :param published_file_id: The Steam Workshop ID of the Mod.
+        :type published_file_id: Optional[str]
+        :return: The matching Mod objects.
+        :rtype: List[Mod]
+        """
+        return self._indexes.find(
+            author=author,
+            folder=folder,
+            supported_version=supported_version,
+            published_file_id=published_file_id,
+        )
+
+    def get_mod_by_handle(self, handle: int) -> Optional[Mod]:
+        """
+        Retrieve a Mod object by its handle.
+
+        :param handle: The handle of the Mod.
+        :type handle: int
         :return: The Mod object if found, otherwise None.
         :rtype: Optional[Mod]
         """
-        return self._mods_by_id.get(mod_id)
+        if 0 <= handle < len(self._mods_by_handle):
+            return self._mods_by_handle[handle]
+        return None
+
+    def get_def_definitions(self, def_name: str) -> List[DefDefinition]:
+        """
+        Retrieve the definitions of a def across all mods.
+
+        :param def_name: The defName of the def.
+        :type def_name: str
+        :return: The definitions of the def, or an empty list if no mod defines
+            it or the defs have not been indexed yet.
+        :rtype: List[DefDefinition]
+        """
+        return self._defs_index.get_definitions(def_name)
+
+    def get_mods_defining(self, def_name: str) -> List[Mod]:
+        """
+        Retrieve the mods that define or override a def.
+
+        :param def_name: The defName of the def.
+        :type def_name: str
+        :return: The Mod objects whose Defs define the def, each listed once.
+        :rtype: List[Mod]
+        """
+        mods: List[Mod] = []
+        for definition in self._defs_index.get_definitions(def_name):
+            mod = self._mods_by_path.get(definition.mod_path)
+            if mod is not None and mod not in mods:
+                mods.append(mod)
+        return mods
 
     def remove_mod(self, mod: Mod) -> None:
         """
@@ -87,67 +385,442 @@ class ModDatabase(QObject):
         :param mod: The Mod object to remove.
         :type mod: Mod
         """
-        if mod.package_id in self._mods_by_package_id:
-            del self._mods_by_package_id[mod.package_id]
-        if mod.id in self._mods_by_id:
-            del self._mods_by_id[mod.id]
+        with self._lock:
+            self._indexes.remove(mod)
+            if self._mods_by_path.get(mod.path) is mod:
+                del self._mods_by_path[mod.path]
+            if (
+                0 <= mod.handle < len(self._mods_by_handle)
+                and self._mods_by_handle[mod.handle] is mod
+            ):
+                self._mods_by_handle[mod.handle] = None
+            self._start_generation()
+
+    def update_mod(self, mod: Mod, mod_data: Dict[str, Any]) -> Optional[Mod]:
+        """
+        Update the fields of a Mod object in the database, keeping its handle.
+
+        The Mod object itself is not changed, as snapshots may hold it; a new one
+        replaces it.
+
+        :param mod: The Mod object to update.
+        :type mod: Mod
+        :param mod_data: The new Mod keyword arguments. Fields left out take
+            their default values.
+        :type mod_data: Dict[str, Any]
+        :return: The Mod object that replaced it if any field changed, otherwise
+            None.
+        :rtype: Optional[Mod]
+        """
+        # Compare against a Mod made from the data, so that the values are in
+        # the form a Mod stores them in, and descriptions are compared by digest
+        # without being read back from About.xml.
+        new_mod = Mod(**mod_data)
+        if mod.has_same_metadata(new_mod):
+            return None
+
+        new_mod.take_identity_of(mod)
+        with self._lock:
+            self.remove_mod(mod)
+            self.add_mod(new_mod)
+        return new_mod
 
     def clear(self) -> None:
         """
         Clear all Mod objects from the database.
         """
-        self._mods_by_id.clear()
-        self._mods_by_package_id.clear()
+        with self._lock:
+            # Handles are not reused, as the mod lists may still hold them.
+            self._mods_by_handle[:] = [None] * len(self._mods_by_handle)
+            self._indexes.clear()
+            self._mods_by_path.clear()
+            self._start_generation()
+
+    def set_folders(self, from_folders: List[Optional[Path]]) -> None:
+        """
+        Change the folders mods are loaded from, and reload the database from
+        them. Nothing happens if the folders did not change.
+
+        :param from_folders: The folders to load mods from.
+        :type from_folders: List[Optional[Path]]
+        """
+        folders = [folder for folder in from_folders if folder is not None]
+        if folders == self._from_folders:
+            return
+        self.reload(from_folders)
+
+    def reload(self, from_folders: Optional[List[Optional[Path]]] = None) -> None:
+        """
+        Scan all mod folders again and apply the differences to the database.
+
+        The database is not rebuilt: mods that are still there keep their
+        handles, so the mod lists keep their rows and selections, and only the
+        mods that were added, changed or removed are announced. Unchanged mods
+        come from the scan cache, so the cost grows with the number of changes
+        rather than with the number of mods.
+
+        :param from_folders: New folders to load mods from. Defaults to the
+            current folders. Mods in folders that are dropped are removed.
+        :type from_folders: Optional[List[Optional[Path]]]
+        """
+        if from_folders is not None:
+            folders = [folder for folder in from_folders if folder is not None]
+            if folders != self._from_folders:
+                # The scan in progress covers the old folders; the mods it
+                # already delivered are diffed like any others.
+                self.cancel_scan()
+                self._pending_rescan_folders.clear()
+                self._pending_rescan_mod_folders.clear()
+                self._from_folders = folders
+                with self._lock:
+                    self._indexes.set_folders(folders)
+                    self._start_generation()
+                self._folder_watcher.set_folders(folders)
+        if not self._from_folders:
+            # There is nothing to scan, so every mod is gone.
+            self._apply_scan_diff(diff_scan(self._mods_by_path, [], [], []))
+            return
+        self.rescan()
+
+    def set_worker_count(self, worker_count: int) -> None:
+        """
+        Change the number of processes later scans use.
+
+        :param worker_count: The number of processes to scan the folders with.
+        :type worker_count: int
+        """
+        self._worker_count = worker_count
+
+    def cancel_scan(self) -> None:
+        """
+        Cancel the scan in progress, if any. Results it already delivered stay in
+        the database.
+        """
+        if self._runner is not None:
+            self._runner.cancel()
+            self._runner = None
+            EventBus().database_scan_progress.emit(0, 0)
+        self._scanning_folders = None
+        self._scanning_mod_folders = []
+
+    def rescan(self, folders: Optional[List[Path]] = None) -> None:
+        """
+        Rescan mod folders and apply the differences to the database.
+
+        Mods whose About.xml did not change are served from the scan cache, so
+        only the mods that appeared, changed or vanished cost any parsing. The
+        differences are announced through the EventBus database_mods_added,
+        database_mods_updated and database_mods_removed signals.
+
+        :param folders: The folders to rescan. Defaults to all mod folders.
+        :type folders: Optional[List[Path]]
+        """
+        if folders is None:
+            folders = self._from_folders
+        self._pending_rescan_folders.update(
+            folder for folder in folders if folder in self._from_folders
+        )
+        if self._scanning_folders is None:
+            self._start_pending_rescan()
 
-    def _load_mods(self, from_folders: List[Optional[Path]]) -> None:
+    def rescan_mods(self, mod_folders: List[Path]) -> None:
+        """
+        Rescan the folders of single mods, such as mods updated in place, and
+        apply the differences to the database like rescan() does. Mods whose
+        folder or About.xml is gone are removed.
+
+        :param mod_folders: The folders of the mods.
+        :type mod_folders: List[Path]
+        """
+        self._pending_rescan_mod_folders.update(
+            mod_folder
+            for mod_folder in mod_folders
+            if mod_folder.parent in self._from_folders
+        )
+        if self._scanning_folders is None:
+            self._start_pending_rescan()
+
+    def _start_pending_rescan(self) -> None:
+        # Mods in a folder that is rescanned anyway need no rescan of their own.
+        self._pending_rescan_mod_folders = {
+            mod_folder
+            for mod_folder in self._pending_rescan_mod_folders
+            if mod_folder.parent not in self._pending_rescan_folders
+        }
+        if self._pending_rescan_folders:
+            self._scanning_folders = sorted(self._pending_rescan_folders)
+            self._pending_rescan_folders.clear()
+            runner = self._create_runner(list(self._scanning_folders))
+        elif self._pending_rescan_mod_folders:
+            self._scanning_folders = []
+            self._scanning_mod_folders = sorted(self._pending_rescan_mod_folders)
+            self._pending_rescan_mod_folders.clear()
+            runner = self._create_runner([], self._scanning_mod_folders)
+        else:
+            return
+        runner.signals.data_ready.connect(self._on_rescan_data_ready)
+        QThreadPool.globalInstance().start(runner)
+
+    def _create_runner(
+        self,
+        from_folders: List[Optional[Path]],
+        mod_folders: Optional[List[Path]] = None,
+    ) -> ModsFromFoldersRunner:
+        """
+        Create the runner for a new scan and make it the current one.
+        """
+        runner = ModsFromFoldersRunner(
+            from_folders,
+            self._worker_count,
+            cache_file=AppInfo().user_data_folder / "scan_cache.json",
+            game_version=self._game_version,
+            mod_folders=mod_folders,
+        )
+        # Keep the runner alive after it ran, so that it can still be cancelled
+        # and its signals compared against.
+        runner.setAutoDelete(False)
+        runner.signals.progress.connect(self._on_scan_progress)
+        self._runner = runner
+        return runner
+
+    def _is_current_scan(self) -> bool:
+        """
+        :return: True if the signal being handled comes from the current scan.
+        :rtype: bool
+        """
+        return self._runner is not None and self.sender() == self._runner.signals
+
+    @Slot(int, int)
+    def _on_scan_progress(self, visited_count: int, total_count: int) -> None:
+        if not self._is_current_scan():
+            return
+        EventBus().database_scan_progress.emit(visited_count, total_count)
+
+    def _load_mods(
+        self, from_folders: List[Optional[Path]], worker_count: int = 1
+    ) -> None:
         """
         Load Mod items into the database from a list of folders.
 
         :param from_folders: The list of folders from which to load mods.
         :type from_folders: List[Path]
+        :param worker_count: The number of processes to scan the folders with.
+        :type worker_count: int
         """
-        runner = ModsFromFoldersRunner(from_folders)
-        runner.signals.data_ready.connect(self._on_data_ready)
+        self._scanning_folders = [
+            folder for folder in from_folders if folder is not None
+        ]
+        self._worker_count = worker_count
+
+        self._load_started_at = time.perf_counter()
+        self._is_first_chunk = True
+
+        runner = self._create_runner(from_folders)
+        runner.chunk_size = self.LOAD_CHUNK_SIZE
+        runner.chunk_interval_ms = self.LOAD_CHUNK_INTERVAL_MS
+        runner.signals.data_chunk_ready.connect(self._on_data_chunk_ready)
+        runner.signals.finished.connect(self._on_load_finished)
         QThreadPool.globalInstance().start(runner)
 
     @Slot(object)
-    def _on_data_ready(self, data: object) -> None:
+    def _on_data_chunk_ready(self, data: object) -> None:
         """
-        Load found Mod items into the database.
+        Create Mod items from a chunk of scanned mod data and load them into the
+        database as they arrive.
 
-        :param data: The ModDatabase instance.
+        :param data: A list of dicts of Mod keyword arguments.
         :type data: object
         """
         if not isinstance(data, list) or not all(
-            isinstance(item, Mod) for item in data
+            isinstance(item, dict) for item in data
         ):
-            raise TypeError("Expected a list of Mod objects")
-        for mod in data:
+            raise TypeError("Expected a list of dicts")
+        if not self._is_current_scan():
+            return
+        mods = [Mod(**item) for item in data]
+        for mod in mods:
             self.add_mod(mod)
+        EventBus().database_mods_added.emit(mods)
+
+        if self._is_first_chunk:
+            self._is_first_chunk = False
+            elapsed_ms = (time.perf_counter() - self._load_started_at) * 1000
+            logger.info(f"Time to first mod row: {elapsed_ms:.0f} ms")
+
+    @Slot()
+    def _on_load_finished(self) -> None:
+        """
+        Finish the initial load once the last chunk has been delivered.
+        """
+        if not self._is_current_scan():
+            return
+        self._runner = None
+        self._scanning_folders = None
+        # Watching every mod costs a watch each, so it waits until the mods are
+        # shown.
+        self._folder_watcher.watch_mods(
+            mod.about_xml_path.parent for mod in self._mods_by_path.values()
+        )
+        self._log_memory_usage()
+        self._finish_load()
+        self._start_defs_indexing()
+        self._start_pending_rescan()
+
+    def _finish_load(self) -> None:
+        """
+        Log how long loading took and announce that the database is ready.
+        """
+        self._is_loaded = True
+        elapsed_ms = (time.perf_counter() - self._load_started_at) * 1000
+        logger.info(f"Loaded {len(self._mods_by_path)} mods in {elapsed_ms:.0f} ms")
         EventBus().database_ready.emit()
 
-    def __iter__(self) -> "ModDatabase":
+    @Slot(object)
+    def _on_rescan_data_ready(self, data: object) -> None:
         """
-        Initialize the iterator for the ModDatabase.
+        Apply the differences between a rescan and the database contents.
 
-        :return: The ModDatabase instance.
-        :rtype: ModDatabase
+        :param data: A list of dicts of Mod keyword arguments.
+        :type data: object
         """
-        self._current_iter_index = 0
-        self._mods_list = list(self._mods_by_id.values())
-        return self
+        if not isinstance(data, list) or not all(
+            isinstance(item, dict) for item in data
+        ):
+            raise TypeError("Expected a list of dicts")
+        if not self._is_current_scan():
+            return
 
-    def __next__(self) -> Mod:
+        scan_diff = diff_scan(
+            self._mods_by_path,
+            data,
+            self._scanning_folders or [],
+            self._from_folders,
+            self._scanning_mod_folders,
+        )
+        self._runner = None
+        self._scanning_folders = None
+        self._scanning_mod_folders = []
+        # Mods that were added, or whose About folder was replaced, are not
+        # watched yet.
+        self._folder_watcher.watch_mods(item["about_xml_path"].parent for item in data)
+        self._apply_scan_diff(scan_diff)
+
+    def _apply_scan_diff(self, scan_diff: ScanDiff) -> None:
         """
-        Get the next Mod object in the iteration.
+        Apply the differences between a scan and the database contents, and
+        announce them.
 
-        :return: The next Mod object.
-        :rtype: Mod
-        :raises StopIteration: If there are no more Mod objects to iterate over.
+        :param scan_diff: The differences.
+        :type scan_diff: ScanDiff
         """
-        if self._current_iter_index < len(self._mods_list):
-            mod = self._mods_list[self._current_iter_index]
-            self._current_iter_index += 1
-            return mod
-        else:
-            raise StopIteration
+        added_mods: List[Mod] = []
+        updated_mods: List[Mod] = []
+        removed_mods: List[Mod] = []
+        for item in scan_diff.added:
+            mod = Mod(**item)
+            self.add_mod(mod)
+            added_mods.append(mod)
+        for mod, item in scan_diff.matched:
+            updated_mod = self.update_mod(mod, item)
+            if updated_mod is not None:
+                updated_mods.append(updated_mod)
+        for mod in scan_diff.removed:
+            self.remove_mod(mod)
+            removed_mods.append(mod)
+        logger.debug(
+            f"Rescan: {len(added_mods)} mods added, {len(updated_mods)} updated, "
+            f"{len(removed_mods)} removed"
+        )
+
+        if removed_mods:
+            EventBus().database_mods_removed.emit(removed_mods)
+        if updated_mods:
+            EventBus().database_mods_updated.emit(updated_mods)
+        if added_mods:
+            EventBus().database_mods_added.emit(added_mods)
+
+        self._log_memory_usage()
+        if not self._is_loaded:
+            self._finish_load()
+        # Defs can change without About.xml changing, and unchanged files cost
+        # only a stat, so always reindex.
+        self._start_defs_indexing()
+        self._start_pending_rescan()
+
+    def _log_memory_usage(self) -> None:
+        """
+        Log how much memory the mods in the database take.
+        """
+        # Measuring walks every mod, so it is only done when debug logging is on.
+        logger.opt(lazy=True).debug("Mod database: {}", self._describe_memory_usage)
+
+    def _describe_memory_usage(self) -> str:
+        """
+        :return: The number of mods in the database and the memory they take.
+        :rtype: str
+        """
+        mod_count = len(self._mods_by_path)
+        size = deep_size_of(self._mods_by_path.values())
+        return (
+            f"{mod_count} mods in {size / 1024**2:.1f} MB"
+            f" ({size / max(1, mod_count):.0f} bytes per mod)"
+        )
+
+    def _start_defs_indexing(self) -> None:
+        """
+        Index the defs of the mods in the database, replacing any indexing in
+        progress.
+        """
+        self._cancel_defs_indexing()
+        runner = DefsIndexRunner(
+            [(mod.path, mod.load_folders) for mod in self.snapshot()],
+            self._worker_count,
+            cache_file=AppInfo().user_data_folder / "defs_index_cache.json",
+        )
+        # Keep the runner alive after it ran, so that its signals can still be
+        # compared against.
+        runner.setAutoDelete(False)
+        runner.signals.data_ready.connect(self._on_defs_index_ready)
+        self._defs_index_runner = runner
+        QThreadPool.globalInstance().start(runner)
+
+    def _cancel_defs_indexing(self) -> None:
+        if self._defs_index_runner is not None:
+            self._defs_index_runner.cancel()
+            self._defs_index_runner = None
+
+    @Slot(object)
+    def _on_defs_index_ready(self, index: object) -> None:
+        if not isinstance(index, DefsIndex):
+            raise TypeError("Expected a DefsIndex")
+        if (
+            self._defs_index_runner is None
+            or self.sender() != self._defs_index_runner.signals
+        ):
+            return
+        self._defs_index_runner = None
+        self._defs_index = index
+        EventBus().database_defs_indexed.emit()
+
+    @Slot(object)
+    def _on_mod_folders_changed(self, folders: object) -> None:
+        if not isinstance(folders, list):
+            raise TypeError("Expected a list of folders")
+        self.rescan(folders)
+
+    @Slot(object)
+    def _on_mods_changed(self, mod_folders: object) -> None:
+        if not isinstance(mod_folders, list):
+            raise TypeError("Expected a list of mod folders")
+        self.rescan_mods(mod_folders)
+
+    def __iter__(self) -> Iterator[Mod]:
+        """
+        Iterate over a snapshot of the mods in the database, so that changes
+        during the iteration do not affect it. The first iteration after a
+        change takes the snapshot; see snapshot().
+
+        :return: An iterator over the Mod objects.
+        :rtype: Iterator[Mod]
+        """
+        return iter(self.snapshot())
@@ -0,0 +1,100 @@
+from pathlib import Path
+from typing import Dict, Iterator, Mapping, Optional, Sequence, Tuple
+
+from models.mod import Mod
+
+
+class ModDatabaseSnapshot:
+    """
+    The mods in the ModDatabase as they were at one generation.
+
+    A snapshot never changes, and neither do the mods in it, so it can be read on
+    any thread, by any number of readers at once, while the database goes on
+    changing on the GUI thread. Iterating it copies nothing, but taking it
+    copies the database's handle list and its path and package ID maps, so it
+    costs time in proportion to the number of mods.
+
+    :param generation: The generation of the database the snapshot was taken at.
+    :type generation: int
+    :param mods_by_handle: The mods, indexed by handle; None for removed mods.
+    :type mods_by_handle: Sequence[Optional[Mod]]
+    :param mods_by_path: The mods, keyed by folder, in the order they were added.
+    :type mods_by_path: Mapping[Path, Mod]
+    :param mods_by_package_id: The mod RimWorld loads for each lower-case
+        package ID.
+    :type mods_by_package_id: Mapping[str, Mod]
+    """
+
+    __slots__ = (
+        "_generation",
+        "_mods_by_handle",
+        "_mods_by_path",
+        "_mods_by_package_id",
+        "_mods",
+    )
+
+    def __init__(
+        self,
+        generation: int,
+        mods_by_handle: Sequence[Optional[Mod]],
+        mods_by_path: Mapping[Path, Mod],
+        mods_by_package_id: Mapping[str, Mod],
+    ) -> None:
+        self._generation = generation
+        self._mods_by_handle: Tuple[Optional[Mod], ...] = tuple(mods_by_handle)
+        self._mods_by_path: Dict[Path, Mod] = dict(mods_by_path)
+        self._mods_by_package_id: Dict[str, Mod] = dict(mods_by_package_id)
+        self._mods: Tuple[Mod, ...] = tuple(self._mods_by_path.values())
+
+    @property
+    def generation(self) -> int:
+        """
+        :return: The generation of the database the snapshot was taken at. It
+            grows with every change to the database.
+        :rtype: int
+        """
+        return self._generation
+
+    def get_mod_by_handle(self, handle: int) -> Optional[Mod]:
+        """
+        :param handle: The handle of the mod.
+        :type handle: int
+        :return: The mod, or None if it was not in the database.
+        :rtype: Optional[Mod]
+        """
+        if 0 <= handle < len(self._mods_by_handle):
+            return self._mods_by_handle[handle]
+        return None
+
+    def get_mod_by_path(self, path: Path) -> Optional[Mod]:
+        """
+        :param path: The folder of the mod.
+        :type path: Path
+        :return: The mod, or None if it was not in the database.
+        :rtype: Optional[Mod]
+        """
+        return self._mods_by_path.get(path)
+
+    def get_mod_by_package_id(self, package_id: str) -> Optional[Mod]:
+        """
+        :param package_id: The package ID, in any case.
+        :type package_id: str
+        :return: The copy of the mod RimWorld loads, or None if no mod had the
+            package ID.
+        :rtype: Optional[Mod]
+        """
+        return self._mods_by_package_id.get(package_id.lower())
+
+    def __len__(self) -> int:
+        """
+        :return: The number of mods in the snapshot.
+        :rtype: int
+        """
+        return len(self._mods)
+
+    def __iter__(self) -> Iterator[Mod]:
+        """
+        :return: An iterator over the mods, in the order they were added.
+        :rtype: Iterator[Mod]
+        """
+        return iter(self._mods)
@@ -0,0 +1,250 @@
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple, TypeVar
+
+from models.mod import Mod
+
+_Key = TypeVar("_Key")
+
+
+def _index_add(index: Dict[_Key, Set[int]], key: _Key, handle: int) -> None:
+    index.setdefault(key, set()).add(handle)
+
+
+def _index_discard(index: Dict[_Key, Set[int]], key: _Key, handle: int) -> None:
+    handles = index.get(key)
+    if handles is None:
+        return
+    handles.discard(handle)
+    if not handles:
+        del index[key]
+
+
+class ModIndexes:
+    """
+    The indexes of the mods in the database, kept up to date as mods are added
+    and removed.
+
+    Mods are indexed by package ID, author, source folder, supported version and
+    Steam Workshop ID. The same package ID can be installed more than once, e.g.
+    in both the local and the Steam mods folder; RimWorld loads the copy in the
+    folder that comes first, and the other copies are shadowed. Mods without a
+    package ID cannot be told apart, so they are left out of the package ID
+    index and are never copies of each other.
+
+    Mods must have their handle before they are added.
+
+    :param folders: The folders mods are loaded from, in order of precedence.
+    :type folders: Sequence[Path]
+    """
+
+    def __init__(self, folders: Sequence[Path] = ()) -> None:
+        self._mods_by_handle: Dict[int, Mod] = {}
+        # Every copy of a package ID, the one that takes precedence first.
+        self._mods_by_package_id: Dict[str, List[Mod]] = {}
+        # The package IDs installed more than once.
+        self._duplicate_package_ids: Set[str] = set()
+        self._handles_by_author: Dict[str, Set[int]] = {}
+        self._handles_by_folder: Dict[Path, Set[int]] = {}
+        self._handles_by_supported_version: Dict[str, Set[int]] = {}
+        self._handles_by_published_file_id: Dict[str, Set[int]] = {}
+        self._folder_ranks: Dict[Path, int] = {}
+        self.set_folders(folders)
+
+    def set_folders(self, folders: Sequence[Path]) -> None:
+        """
+        Change the order of precedence of the mod folders.
+
+        :param folders: The folders mods are loaded from, in order of precedence.
+        :type folders: Sequence[Path]
+        """
+        self._folder_ranks = {folder: rank for rank, folder in enumerate(folders)}
+        for package_id in self._duplicate_package_ids:
+            self._mods_by_package_id[package_id].sort(key=self._precedence)
+
+    def _precedence(self, mod: Mod) -> Tuple[int, str]:
+        # Mods outside the known folders come last; ties go by path, so that the
+        # order does not depend on the order mods were scanned in.
+        folder = mod.path.parent
+        return self._folder_ranks.get(folder, len(self._folder_ranks)), str(mod.path)
+
+    def add(self, mod: Mod) -> None:
+        """
+        Add a mod to the indexes.
+
+        :param mod: The mod to add.
+        :type mod: Mod
+        """
+        handle = mod.handle
+        if handle in self._mods_by_handle:
+            self.remove(self._mods_by_handle[handle])
+        self._mods_by_handle[handle] = mod
+
+        package_id = mod.package_id.lower()
+        if package_id:
+            candidates = self._mods_by_package_id.setdefault(package_id, [])
+            candidates.append(mod)
+            if len(candidates) > 1:
+                candidates.sort(key=self._precedence)
+                self._duplicate_package_ids.add(package_id)
+
+        for author in mod.authors:
+            _index_add(self._handles_by_author, author.casefold(), handle)
+        _index_add(self._handles_by_folder, mod.path.parent, handle)
+        for version in mod.supported_versions:
+            _index_add(self._handles_by_supported_version, version, handle)
+        if mod.published_file_id:
+            _index_add(
+                self._handles_by_published_file_id, mod.published_file_id, handle
+            )
+
+    def remove(self, mod: Mod) -> None:
+        """
+        Remove a mod from the indexes. Nothing happens if it is not in them.
+
+        :param mod: The mod to remove, with the fields it was added with.
+        :type mod: Mod
+        """
+        handle = mod.handle
+        if self._mods_by_handle.get(handle) is not mod:
+            return
+        del self._mods_by_handle[handle]
+
+        package_id = mod.package_id.lower()
+        if package_id:
+            candidates = self._mods_by_package_id[package_id]
+            candidates.remove(mod)
+            if len(candidates) < 2:
+                self._duplicate_package_ids.discard(package_id)
+            if not candidates:
+                del self._mods_by_package_id[package_id]
+
+        for author in mod.authors:
+            _index_discard(self._handles_by_author, author.casefold(), handle)
+        _index_discard(self._handles_by_folder, mod.path.parent, handle)
+        for version in mod.supported_versions:
+            _index_discard(self._handles_by_supported_version, version, handle)
+        if mod.published_file_id:
+            _index_discard(
+                self._handles_by_published_file_id, mod.published_file_id, handle
+            )
+
+    def clear(self) -> None:
+        """
+        Remove all mods from the indexes.
+        """
+        self._mods_by_handle.clear()
+        self._mods_by_package_id.clear()
+        self._duplicate_package_ids.clear()
+        self._handles_by_author.clear()
+        self._handles_by_folder.clear()
+        self._handles_by_supported_version.clear()
+        self._handles_by_published_file_id.clear()
+
+    def get_by_package_id(self, package_id: str) -> Optional[Mod]:
+        """
+        :param package_id: The package ID, in any case.
+        :type package_id: str
+        :return: The copy of the mod that RimWorld loads, or None if no mod has
+            the package ID.
+        :rtype: Optional[Mod]
+        """
+        candidates = self._mods_by_package_id.get(package_id.lower())
+        return candidates[0] if candidates else None
+
+    def get_mods_by_package_id(self) -> Dict[str, Mod]:
+        """
+        :return: The copy of each mod that RimWorld loads, keyed by lower-case
+            package ID.
+        :rtype: Dict[str, Mod]
+        """
+        return {
+            package_id: candidates[0]
+            for package_id, candidates in self._mods_by_package_id.items()
+        }
+
+    def get_candidates(self, package_id: str) -> List[Mod]:
+        """
+        :param package_id: The package ID, in any case.
+        :type package_id: str
+        :return: Every copy of the mod, the one RimWorld loads first.
+        :rtype: List[Mod]
+        """
+        return list(self._mods_by_package_id.get(package_id.lower(), []))
+
+    def get_shadowing_mod(self, mod: Mod) -> Optional[Mod]:
+        """
+        :param mod: A mod in the indexes.
+        :type mod: Mod
+        :return: The copy of the mod that RimWorld loads instead of it, or None if
+            the mod is not shadowed.
+        :rtype: Optional[Mod]
+        """
+        candidates = self._mods_by_package_id.get(mod.package_id.lower())
+        if not candidates or candidates[0] is mod:
+            return None
+        return candidates[0]
+
+    def get_shadowed_mods(self) -> List[Mod]:
+        """
+        :return: The copies of mods that RimWorld does not load, because another
+            copy takes precedence.
+        :rtype: List[Mod]
+        """
+        return [
+            mod
+            for package_id in sorted(self._duplicate_package_ids)
+            for mod in self._mods_by_package_id[package_id][1:]
+        ]
+
+    def find(
+        self,
+        author: Optional[str] = None,
+        folder: Optional[Path] = None,
+        supported_version: Optional[str] = None,
+        published_file_id: Optional[str] = None,
+    ) -> List[Mod]:
+        """
+        Find the mods that match all of the given criteria.
+
+        :param author: An author of the mod, in any case.
+        :type author: Optional[str]
+        :param folder: The folder the mod was loaded from.
+        :type folder: Optional[Path]
+        :param supported_version: A game version the mod supports, e.g. "1.5".
+        :type supported_version: Optional[str]
+        :param published_file_id: The Steam Workshop ID of the mod.
+        :type published_file_id: Optional[str]
+        :return: The matching mods, in the order they were first added. With no
+            criteria, all mods.
+        :rtype: List[Mod]
+        """
+        handle_sets: List[Set[int]] = []
+        if author is not None:
+            handle_sets.append(self._handles_by_author.get(author.casefold(), set()))
+        if folder is not None:
+            handle_sets.append(self._handles_by_folder.get(folder, set()))
+        if supported_version is not None:
+            handle_sets.append(
+                self._handles_by_supported_version.get(supported_version, set())
+            )
+        if published_file_id is not None:
+            handle_sets.append(
+                self._handles_by_published_file_id.get(published_file_id, set())
+            )
+
+        handles: Iterable[int]
+        if not handle_sets:
+            handles = self._mods_by_handle
+        else:
+            # Intersect starting from the smallest set, so that the work is
+            # bounded by the fewest matches.
+            handle_sets.sort(key=len)
+            handles = handle_sets[0].intersection(*handle_sets[1:])
+        return [self._mods_by_handle[handle] for handle in sorted(handles)]
+
+    def __len__(self) -> int:
+        """
+        :return: The number of mods in the indexes.
+        :rtype: int
+        """
+        return len(self._mods_by_handle)
@@ -1,6 +1,17 @@
-import uuid
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Optional, Dict
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 
 from PySide6.QtCore import (
     QObject,
@@ -8,28 +19,79 @@ from PySide6.QtCore import (
     Qt,
     QModelIndex,
 )
-from PySide6.QtGui import QStandardItemModel
 from lxml import etree
 
 from models.mod import Mod
 from models.mod_database import ModDatabase
+from models.mod_list_model import ModListModel, ModListProxyModel
+
+
+def _name_key(mod: Mod) -> str:
+    return mod.name.casefold()
+
+
+def partition_mods(
+    mods: Iterable[Mod], active_ranks: Mapping[str, int], active_package_ids: Set[str]
+) -> Tuple[List[Mod], List[Mod]]:
+    """
+    Split mods into those to activate and the others, in one pass.
+
+    :param mods: The mods to split.
+    :type mods: Iterable[Mod]
+    :param active_ranks: The load order rank of each active package ID, in lower
+        case, as read from ModsConfig.xml.
+    :type active_ranks: Mapping[str, int]
+    :param active_package_ids: The lower-case package IDs of the mods that are
+        already active. The package IDs of the mods to activate are added to it,
+        as only one mod per package ID can be active.
+    :type active_package_ids: Set[str]
+    :return: The mods to activate, in load order, and the other mods.
+    :rtype: Tuple[List[Mod], List[Mod]]
+    """
+    active_mods: List[Tuple[int, Mod]] = []
+    inactive_mods: List[Mod] = []
+    for mod in mods:
+        package_id = mod.package_id.lower()
+        rank = active_ranks.get(package_id)
+        if rank is None or package_id in active_package_ids:
+            inactive_mods.append(mod)
+        else:
+            active_package_ids.add(package_id)
+            active_mods.append((rank, mod))
+    active_mods.sort(key=lambda rank_and_mod: rank_and_mod[0])
+    return [mod for _, mod in active_mods], inactive_mods
 
 
 class ModList(QObject):
     """
     Represents a list of RimWorld mods.
+
+    :param get_mod: Look up a mod by its handle. Defaults to the mod database.
+    :type get_mod: Optional[Callable[[int], Optional[Mod]]]
     """
 
-    def __init__(self) -> None:
+    # insert_many_sorted merges the items in a single model reset once there is
+    # at least one item for this many rows in the list.
+    BULK_INSERT_RATIO = 8
+
+    def __init__(
+        self, get_mod: Optional[Callable[[int], Optional[Mod]]] = None
+    ) -> None:
         super().__init__()
 
-        self._inner_model: QStandardItemModel = QStandardItemModel()
+        self._inner_model = ModListModel(get_mod)
 
-        self._proxy_model: QSortFilterProxyModel = QSortFilterProxyModel()
+        self._proxy_model: QSortFilterProxyModel = ModListProxyModel()
         self._proxy_model.setSourceModel(self._inner_model)
         self._proxy_model.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
 
-        self._id_to_mod_map: Dict[uuid.UUID, Mod] = {}
+    @property
+    def model(self) -> ModListModel:
+        """
+        :return: The model holding the mods of the list, in order.
+        :rtype: ModListModel
+        """
+        return self._inner_model
 
     @property
     def proxy_model(self) -> QSortFilterProxyModel:
@@ -47,8 +109,18 @@ class ModList(QObject):
         :param item: The Mod item to append.
         :type item: Mod
         """
-        self._inner_model.appendRow(item)
-        self._id_to_mod_map[item.id] = item
+        self._inner_model.insert_handles(self._inner_model.rowCount(), [item.handle])
+
+    def append_many(self, items: Sequence[Mod]) -> None:
+        """
+        Append Mod items to the end of the list, as one change.
+
+        :param items: The Mod items to append.
+        :type items: Sequence[Mod]
+        """
+        self._inner_model.insert_handles(
+            self._inner_model.rowCount(), [item.handle for item in items]
+        )
 
     def insert(self, item: Mod, index: int) -> None:
         """
@@ -59,8 +131,64 @@ class ModList(QObject):
         :param index: The index at which to insert the item.
         :type index: int
         """
-        self._inner_model.insertRow(index, item)
-        self._id_to_mod_map[item.id] = item
+        self._inner_model.insert_handles(index, [item.handle])
+
+    def insert_sorted(self, item: Mod, key: Callable[[Mod], Any] = _name_key) -> None:
+        """
+        Insert a Mod item at its place in a sorted list.
+
+        :param item: The Mod item to insert.
+        :type item: Mod
+        :param key: The key the list is sorted by. Defaults to the name.
+        :type key: Callable[[Mod], Any]
+        """
+        item_key = key(item)
+        low, high = 0, self._inner_model.rowCount()
+        while low < high:
+            middle = (low + high) // 2
+            middle_item = self.get_item(middle)
+            if middle_item is not None and key(middle_item) <= item_key:
+                low = middle + 1
+            else:
+                high = middle
+        self.insert(item, low)
+
+    def insert_many_sorted(
+        self, items: Sequence[Mod], key: Callable[[Mod], Any] = _name_key
+    ) -> None:
+        """
+        Insert Mod items at their places in a sorted list.
+
+        A few items are inserted one by one, which keeps the selection. When the
+        items are many compared to the list, the list and the items are merged
+        in one pass instead, and the model is filled in a single reset.
+
+        :param items: The Mod items to insert.
+        :type items: Sequence[Mod]
+        :param key: The key the list is sorted by. Defaults to the name.
+        :type key: Callable[[Mod], Any]
+        """
+        if len(items) * self.BULK_INSERT_RATIO <= self.count():
+            for item in items:
+                self.insert_sorted(item, key)
+            return
+
+        new_items = sorted(items, key=key)
+        merged_handles: List[int] = []
+        new_index = 0
+        for handle in self._inner_model.handles:
+            mod = self._inner_model.get_mod(handle)
+            # Rows of mods no longer in the database stay where they are.
+            if mod is not None:
+                mod_key = key(mod)
+                while (
+                    new_index < len(new_items) and key(new_items[new_index]) < mod_key
+                ):
+                    merged_handles.append(new_items[new_index].handle)
+                    new_index += 1
+            merged_handles.append(handle)
+        merged_handles.extend(item.handle for item in new_items[new_index:])
+        self._inner_model.set_handles(merged_handles)
 
     def update(self, index: int, new_item: Mod) -> None:
         """
@@ -71,7 +199,80 @@ class ModList(QObject):
         :param new_item: The new Mod item to replace the existing one.
         :type new_item: Mod
         """
-        self._inner_model.setItem(index, new_item)
+        self._inner_model.set_handle(index, new_item.handle)
+
+    def refresh(self, mod: Mod) -> None:
+        """
+        Show the current name of a Mod item that was updated, if it is in the
+        list.
+
+        :param mod: The updated Mod item.
+        :type mod: Mod
+        """
+        row = self._inner_model.row_of(mod.handle)
+        if row >= 0:
+            self._inner_model.refresh(row)
+
+    def move(self, index: int, count: int, to_index: int) -> bool:
+        """
+        Move Mod items to another place in the list.
+
+        :param index: The index of the first item to move.
+        :type index: int
+        :param count: The number of items to move.
+        :type count: int
+        :param to_index: The index to move the items before, counted before the
+            move.
+        :type to_index: int
+        :return: True if the items were moved.
+        :rtype: bool
+        """
+        return self._inner_model.moveRows(
+            QModelIndex(), index, count, QModelIndex(), to_index
+        )
+
+    def move_to(self, index: int, count: int, other: "ModList", to_index: int) -> None:
+        """
+        Move Mod items to another list.
+
+        :param index: The index of the first item to move.
+        :type index: int
+        :param count: The number of items to move.
+        :type count: int
+        :param other: The list to move the items to.
+        :type other: ModList
+        :param to_index: The index in the other list to insert the items at.
+        :type to_index: int
+        """
+        handles = list(self._inner_model.handles[index : index + count])
+        self._inner_model.removeRows(index, count)
+        other._inner_model.insert_handles(to_index, handles)
+
+    def move_many_to(
+        self, items: Sequence[Mod], other: "ModList", to_index: int = -1
+    ) -> None:
+        """
+        Move Mod items to another list, keeping their order in this list.
+
+        Only the handles move; each run of consecutive items is removed with one
+        call, and the items are inserted in the other list in one call.
+
+        :param items: The Mod items to move. Those not in the list are ignored.
+        :type items: Sequence[Mod]
+        :param other: The list to move the items to.
+        :type other: ModList
+        :param to_index: The index in the other list to insert the items at, or
+            -1 for the end.
+        :type to_index: int
+        """
+        moved_handles = {item.handle for item in items}
+        handles = [
+            handle for handle in self._inner_model.handles if handle in moved_handles
+        ]
+        self._inner_model.remove_handles(handles)
+        if to_index < 0:
+            to_index = other.count()
+        other._inner_model.insert_handles(to_index, handles)
 
     def remove(self, index: int) -> None:
         """
@@ -80,30 +281,74 @@ class ModList(QObject):
         :param index: The index of the item to remove.
         :type index: int
         """
-        item = self.get_item(index)
-        if item:
-            del self._id_to_mod_map[item.id]
-        self._inner_model.removeRow(index)
+        self._inner_model.removeRows(index, 1)
+
+    def remove_mod(self, mod: Mod) -> None:
+        """
+        Remove a Mod item from the list, wherever it is.
+
+        :param mod: The Mod item to remove.
+        :type mod: Mod
+        """
+        row = self._inner_model.row_of(mod.handle)
+        if row >= 0:
+            self._inner_model.removeRows(row, 1)
+
+    def remove_many(self, items: Iterable[Mod]) -> None:
+        """
+        Remove Mod items from the list, wherever they are, as one change.
+
+        :param items: The Mod items to remove. Those not in the list are ignored.
+        :type items: Iterable[Mod]
+        """
+        self._inner_model.remove_handles(item.handle for item in items)
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """
+        Make many changes to the list as one.
+
+        Within the block, the model signals nothing and the proxy model does
+        not filter or sort; the views are updated once, when the block ends.
+        Selections in the list do not survive a batch.
+        """
+        is_dynamic = self._proxy_model.dynamicSortFilter()
+        self._proxy_model.setDynamicSortFilter(False)
+        try:
+            with self._inner_model.batch():
+                yield
+        finally:
+            self._proxy_model.setDynamicSortFilter(is_dynamic)
 
     def clear(self) -> None:
         """
         Remove all Mod items from the list.
         """
         self._inner_model.clear()
-        self._id_to_mod_map.clear()
 
     # I/O Methods
 
-    def from_xml(self, xml_path: Path) -> None:
+    @staticmethod
+    def read_active_package_ids(xml_path: Path) -> List[str]:
+        """
+        Read the package IDs of the active mods from a ModsConfig.xml file.
+
+        :param xml_path: The path to ModsConfig.xml.
+        :type xml_path: Path
+        :return: The package IDs in load order.
+        :rtype: List[str]
+        """
         if not xml_path.exists() or not xml_path.is_file():
-            return
+            return []
         xml_data = xml_path.read_bytes()
         root = etree.fromstring(xml_data)
         results = root.xpath("./activeMods/li/text()")
         if isinstance(results, list):
-            active_mods = [str(result) for result in results]
-        else:
-            active_mods = []
+            return [str(result) for result in results]
+        return []
+
+    def from_xml(self, xml_path: Path) -> None:
+        active_mods = ModList.read_active_package_ids(xml_path)
         for package_id in active_mods:
             mod = ModDatabase().get_mod_by_package_id(package_id.lower())
             if mod is not None:
@@ -122,16 +367,16 @@ class ModList(QObject):
         """
         return self._inner_model.rowCount()
 
-    def get_by_id(self, mod_id: uuid.UUID) -> Optional[Mod]:
+    def get_by_handle(self, handle: int) -> Optional[Mod]:
         """
-        Find a Mod item by its unique identifier.
+        Find a Mod item by its handle.
 
-        :param mod_id: The unique identifier of the Mod item.
-        :type mod_id: uuid.UUID
+        :param handle: The handle of the Mod item.
+        :type handle: int
         :return: The Mod item if found, otherwise None.
         :rtype: Optional[Mod]
         """
-        return self._id_to_mod_map.get(mod_id)
+        return self._inner_model.get_mod(handle)
 
     def sort(self, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder) -> None:
         """
@@ -140,7 +385,10 @@ class ModList(QObject):
         :param order: The order in which to sort (ascending or descending).
         :type order: Qt.SortOrder
         """
-        self._inner_model.sort(0, order)
+        self._inner_model.sort_by(
+            lambda mod: mod.name.casefold() if mod is not None else "",
+            reverse=order == Qt.SortOrder.DescendingOrder,
+        )
 
     def filter(self, text: str) -> None:
         """
@@ -184,10 +432,7 @@ class ModList(QObject):
         :return: The Mod item if found, otherwise None.
         :rtype: Optional[Mod]
         """
-        item = self._inner_model.item(index)
-        if isinstance(item, Mod):
-            return item
-        return None
+        return self._inner_model.mod(index)
 
     # Representation and Special Methods
     def __repr__(self) -> str:
@@ -206,7 +451,7 @@ class ModList(QObject):
         :return: The formatted list of Mod names.
         :rtype: str
         """
-        mod_names = [mod.name for mod in self._id_to_mod_map.values()]
+        mod_names = [mod.name for mod in self if mod is not None]
         return "\n".join(mod_names)
 
     def __len__(self) -> int:
@@ -218,30 +463,17 @@ class ModList(QObject):
         """
         return self._inner_model.rowCount()
 
-    def __iter__(self) -> "ModList":
+    def __iter__(self) -> Iterator[Optional[Mod]]:
         """
         Return an iterator over the Mod items.
 
-        :return: The iterator for the ModList.
-        :rtype: ModList
-        """
-        self._current_index = 0
-        return self
-
-    def __next__(self) -> Optional[Mod]:
-        """
-        Return the next Mod item in the iteration.
+        Each iteration has its own position, so iterations can be nested.
 
-        :return: The next Mod item.
-        :rtype: Optional[Mod]
-        :raises StopIteration: If there are no more items to iterate over.
+        :return: The iterator over the Mod items, None for those no longer in
+            the database.
+        :rtype: Iterator[Optional[Mod]]
         """
-        if self._current_index < self.count():
-            mod = self.get_item(self._current_index)
-            self._current_index += 1
-            return mod
-        else:
-            raise StopIteration
+        return map(self._inner_model.get_mod, list(self._inner_model.handles))
 
     def __contains__(self, mod: Mod) -> bool:
         """
@@ -252,4 +484,4 @@ class ModList(QObject):
         :return: True if the Mod object exists in the ModList, otherwise False.
         :rtype: bool
         """
-        return mod in self._id_to_mod_map.values()
+        return self._inner_model.contains(mod.handle)
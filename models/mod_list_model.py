@@ -0,0 +1,505 @@
+import json
+import os
+from contextlib import contextmanager
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Union,
+)
+
+from PySide6.QtCore import (
+    QAbstractListModel,
+    QMimeData,
+    QModelIndex,
+    QPersistentModelIndex,
+    QSortFilterProxyModel,
+    Qt,
+)
+
+from models.mod import Mod
+from models.mod_database import ModDatabase
+
+ModIndex = Union[QModelIndex, QPersistentModelIndex]
+
+# The roles ModListModel has data for, as plain integers, which compare faster.
+_DISPLAY_ROLE = int(Qt.ItemDataRole.DisplayRole)
+_USER_ROLE = int(Qt.ItemDataRole.UserRole)
+
+
+class ModListModel(QAbstractListModel):
+    """
+    A list model whose rows are the handles of mods.
+
+    The model holds nothing but a list of mod handles; the data of each row is looked
+    up from the mod database when a view asks for it. Rows are reordered with
+    moveRows, and mods are moved between lists by their handles, so no row is ever
+    copied.
+
+    :param get_mod: Look up a mod by its handle. Defaults to the mod database.
+    :type get_mod: Optional[Callable[[int], Optional[Mod]]]
+    """
+
+    # Mod handles dragged between lists, as JSON. Handles only mean something
+    # within one process, so the process ID goes along with them.
+    MIME_TYPE = "application/x-rimsort-mod-handles"
+
+    # remove_handles removes up to this many runs of rows one run at a time,
+    # which keeps the selection and the scroll position; beyond that, one model
+    # reset is cheaper.
+    MAX_REMOVED_RUNS = 32
+
+    def __init__(
+        self, get_mod: Optional[Callable[[int], Optional[Mod]]] = None
+    ) -> None:
+        super().__init__()
+        self._get_mod = (
+            get_mod if get_mod is not None else ModDatabase().get_mod_by_handle
+        )
+        self._handles: List[int] = []
+        # The same handles, to tell quickly whether a mod is in the list.
+        self._handle_set: Set[int] = set()
+        # The row of each handle. Changes to the rows drop it, and row_of builds
+        # it again when it is next asked for a row.
+        self._row_by_handle: Optional[Dict[int, int]] = None
+        # How many batch() blocks are open. Within them, changes are made
+        # without signals, inside a single model reset.
+        self._batch_depth = 0
+
+    @property
+    def handles(self) -> Sequence[int]:
+        """
+        :return: The handles of the mods in the list, in row order.
+        :rtype: Sequence[int]
+        """
+        return self._handles
+
+    def mod(self, row: int) -> Optional[Mod]:
+        """
+        :param row: The row of the mod.
+        :type row: int
+        :return: The mod in the row, or None if there is no such row or the mod
+            is no longer in the database.
+        :rtype: Optional[Mod]
+        """
+        if not 0 <= row < len(self._handles):
+            return None
+        return self._get_mod(self._handles[row])
+
+    def get_mod(self, handle: int) -> Optional[Mod]:
+        """
+        :param handle: The handle of the mod.
+        :type handle: int
+        :return: The mod, or None if it is not in the list or no longer in the
+            database.
+        :rtype: Optional[Mod]
+        """
+        if handle not in self._handle_set:
+            return None
+        return self._get_mod(handle)
+
+    def contains(self, handle: int) -> bool:
+        """
+        :param handle: The handle of the mod.
+        :type handle: int
+        :return: True if the mod is in the list.
+        :rtype: bool
+        """
+        return handle in self._handle_set
+
+    def row_of(self, handle: int) -> int:
+        """
+        :param handle: The handle of the mod.
+        :type handle: int
+        :return: The row of the mod, or -1 if it is not in the list.
+        :rtype: int
+        """
+        if handle not in self._handle_set:
+            return -1
+        if self._row_by_handle is None:
+            self._row_by_handle = {
+                handle: row for row, handle in enumerate(self._handles)
+            }
+        return self._row_by_handle[handle]
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """
+        Make many changes to the list as one: the changes made in the block are
+        announced by a single model reset when it ends, instead of one signal
+        each. Blocks can be nested.
+
+        Persistent indexes and selections do not survive the reset.
+        """
+        if self._batch_depth == 0:
+            self.beginResetModel()
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.endResetModel()
+
+    def insert_handles(self, row: int, handles: Sequence[int]) -> None:
+        """
+        Insert mods at a row.
+
+        :param row: The row to insert the mods at.
+        :type row: int
+        :param handles: The handles of the mods to insert.
+        :type handles: Sequence[int]
+        """
+        if not handles:
+            return
+        if self._batch_depth:
+            self._handles[row:row] = handles
+            self._handle_set.update(handles)
+            self._row_by_handle = None
+            return
+        self.beginInsertRows(QModelIndex(), row, row + len(handles) - 1)
+        self._handles[row:row] = handles
+        self._handle_set.update(handles)
+        self._row_by_handle = None
+        self.endInsertRows()
+
+    def remove_handles(self, handles: Iterable[int]) -> None:
+        """
+        Remove mods from the list, wherever they are.
+
+        Each run of consecutive rows is removed with one removeRows call, from
+        the bottom up. Mods scattered over more than MAX_REMOVED_RUNS runs are
+        removed in a single pass instead, inside a batch.
+
+        :param handles: The handles of the mods to remove. Those not in the list
+            are ignored.
+        :type handles: Iterable[int]
+        """
+        removed_handles = self._handle_set.intersection(handles)
+        if not removed_handles:
+            return
+        runs: List[List[int]] = []
+        for row, handle in enumerate(self._handles):
+            if handle not in removed_handles:
+                continue
+            if runs and runs[-1][0] + runs[-1][1] == row:
+                runs[-1][1] += 1
+            else:
+                runs.append([row, 1])
+
+        if len(runs) <= self.MAX_REMOVED_RUNS:
+            for first_row, count in reversed(runs):
+                self.removeRows(first_row, count)
+            return
+        with self.batch():
+            self._handles = [
+                handle for handle in self._handles if handle not in removed_handles
+            ]
+            self._handle_set -= removed_handles
+            self._row_by_handle = None
+
+    def move_handles(self, handles: Sequence[int], row: int) -> None:
+        """
+        Move mods in the list to a row, one after the other.
+
+        :param handles: The handles of the mods to move, in the order they end up in.
+        :type handles: Sequence[int]
+        :param row: The row to move the mods before, counted before the move.
+        :type row: int
+        """
+        # The rows of the moved mods are looked up in one pass, and kept up to
+        # date through the moves, rather than searched for after each.
+        moved_handles = set(handles)
+        rows = {
+            handle: mod_row
+            for mod_row, handle in enumerate(self._handles)
+            if handle in moved_handles
+        }
+        for handle in handles:
+            mod_row = rows.get(handle)
+            if mod_row is None:
+                continue
+            if (
+                mod_row != row
+                and mod_row + 1 != row
+                and self.moveRows(QModelIndex(), mod_row, 1, QModelIndex(), row)
+            ):
+                for other_handle, other_row in rows.items():
+                    if mod_row < other_row < row:
+                        rows[other_handle] = other_row - 1
+                    elif row <= other_row < mod_row:
+                        rows[other_handle] = other_row + 1
+                rows[handle] = row - 1 if row > mod_row else row
+            row = rows[handle] + 1
+
+    def set_handle(self, row: int, handle: int) -> None:
+        """
+        Replace the mod in a row.
+
+        :param row: The row to replace the mod in.
+        :type row: int
+        :param handle: The handle of the new mod.
+        :type handle: int
+        """
+        self._handle_set.discard(self._handles[row])
+        if self._row_by_handle is not None:
+            del self._row_by_handle[self._handles[row]]
+            self._row_by_handle[handle] = row
+        self._handles[row] = handle
+        self._handle_set.add(handle)
+        if not self._batch_depth:
+            self.dataChanged.emit(self.index(row), self.index(row))
+
+    def refresh(self, row: int) -> None:
+        """
+        Tell the views that the mod in a row changed.
+
+        :param row: The row of the mod.
+        :type row: int
+        """
+        if not self._batch_depth:
+            self.dataChanged.emit(self.index(row), self.index(row))
+
+    def sort_by(self, key: Callable[[Optional[Mod]], Any], reverse: bool) -> None:
+        """
+        Sort the rows, keeping persistent indexes on the same mods.
+
+        :param key: Get the sort key of a mod.
+        :type key: Callable[[Optional[Mod]], Any]
+        :param reverse: True to sort in descending order.
+        :type reverse: bool
+        """
+        if self._batch_depth:
+            self._handles.sort(key=lambda handle: key(self._get_mod(handle)))
+            if reverse:
+                self._handles.reverse()
+            self._row_by_handle = None
+            return
+
+        self.layoutAboutToBeChanged.emit()
+        old_persistent_indexes = self.persistentIndexList()
+        old_rows: Dict[int, int] = {
+            handle: row for row, handle in enumerate(self._handles)
+        }
+        self._handles.sort(key=lambda handle: key(self._get_mod(handle)))
+        if reverse:
+            self._handles.reverse()
+        new_rows = {handle: row for row, handle in enumerate(self._handles)}
+        self._row_by_handle = new_rows
+        row_map = {old_rows[handle]: row for handle, row in new_rows.items()}
+        self.changePersistentIndexList(
+            old_persistent_indexes,
+            [self.index(row_map[index.row()]) for index in old_persistent_indexes],
+        )
+        self.layoutChanged.emit()
+
+    def set_handles(self, handles: Sequence[int]) -> None:
+        """
+        Replace all rows, in a single model reset.
+
+        :param handles: The handles of the mods, in row order.
+        :type handles: Sequence[int]
+        """
+        with self.batch():
+            self._handles = list(handles)
+            self._handle_set = set(self._handles)
+            self._row_by_handle = None
+
+    def clear(self) -> None:
+        """
+        Remove all rows.
+        """
+        with self.batch():
+            self._handles.clear()
+            self._handle_set.clear()
+            self._row_by_handle = None
+
+    # QAbstractListModel
+
+    def rowCount(self, parent: ModIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._handles)
+
+    def data(self, index: ModIndex, role: int = _DISPLAY_ROLE) -> Any:
+        # Views call this for every role of every row they paint, so the roles
+        # without data are turned away first, and without touching Qt enums.
+        if role != _DISPLAY_ROLE and role != _USER_ROLE:
+            return None
+        row = index.row()
+        if not 0 <= row < len(self._handles):
+            return None
+        if role == _USER_ROLE:
+            return self._handles[row]
+        mod = self._get_mod(self._handles[row])
+        return mod.name if mod is not None else None
+
+    def flags(self, index: ModIndex) -> Qt.ItemFlag:
+        if not index.isValid():
+            return Qt.ItemFlag.ItemIsDropEnabled
+        return (
+            Qt.ItemFlag.ItemIsEnabled
+            | Qt.ItemFlag.ItemIsSelectable
+            | Qt.ItemFlag.ItemIsDragEnabled
+            | Qt.ItemFlag.ItemNeverHasChildren
+        )
+
+    def removeRows(
+        self, row: int, count: int, parent: ModIndex = QModelIndex()
+    ) -> bool:
+        if parent.isValid() or row < 0 or count <= 0:
+            return False
+        if row + count > len(self._handles):
+            return False
+        if not self._batch_depth:
+            self.beginRemoveRows(QModelIndex(), row, row + count - 1)
+        self._handle_set.difference_update(self._handles[row : row + count])
+        del self._handles[row : row + count]
+        self._row_by_handle = None
+        if not self._batch_depth:
+            self.endRemoveRows()
+        return True
+
+    def moveRows(
+        self,
+        sourceParent: ModIndex,
+        sourceRow: int,
+        count: int,
+        destinationParent: ModIndex,
+        destinationChild: int,
+    ) -> bool:
+        if sourceParent.isValid() or destinationParent.isValid() or count <= 0:
+            return False
+        if sourceRow < 0 or sourceRow + count > len(self._handles):
+            return False
+        if not 0 <= destinationChild <= len(self._handles):
+            return False
+        # Moves into the moved rows themselves are refused, as beginMoveRows
+        # does.
+        if self._batch_depth:
+            if sourceRow <= destinationChild <= sourceRow + count:
+                return False
+        elif not self.beginMoveRows(
+            QModelIndex(),
+            sourceRow,
+            sourceRow + count - 1,
+            QModelIndex(),
+            destinationChild,
+        ):
+            return False
+        moved_handles = self._handles[sourceRow : sourceRow + count]
+        del self._handles[sourceRow : sourceRow + count]
+        if destinationChild > sourceRow:
+            destinationChild -= count
+        self._handles[destinationChild:destinationChild] = moved_handles
+        self._row_by_handle = None
+        if not self._batch_depth:
+            self.endMoveRows()
+        return True
+
+    def supportedDropActions(self) -> Qt.DropAction:
+        return Qt.DropAction.MoveAction
+
+    def mimeTypes(self) -> List[str]:
+        return [self.MIME_TYPE]
+
+    def mimeData(self, indexes: Sequence[QModelIndex]) -> QMimeData:
+        rows = sorted({index.row() for index in indexes if index.isValid()})
+        mime_data = QMimeData()
+        mime_data.setData(
+            self.MIME_TYPE,
+            json.dumps(
+                {"pid": os.getpid(), "handles": [self._handles[row] for row in rows]}
+            ).encode(),
+        )
+        return mime_data
+
+    def canDropMimeData(
+        self,
+        data: QMimeData,
+        action: Qt.DropAction,
+        row: int,
+        column: int,
+        parent: ModIndex,
+    ) -> bool:
+        return action == Qt.DropAction.MoveAction and data.hasFormat(self.MIME_TYPE)
+
+    def dropMimeData(
+        self,
+        data: QMimeData,
+        action: Qt.DropAction,
+        row: int,
+        column: int,
+        parent: ModIndex,
+    ) -> bool:
+        if not self.canDropMimeData(data, action, row, column, parent):
+            return False
+        try:
+            payload = json.loads(bytes(data.data(self.MIME_TYPE).data()))
+            if payload["pid"] != os.getpid():
+                return False
+            handles = [int(handle) for handle in payload["handles"]]
+        except (ValueError, TypeError, KeyError):
+            return False
+        if row < 0:
+            row = parent.row() if parent.isValid() else len(self._handles)
+
+        present_handles = [handle for handle in handles if handle in self._handle_set]
+        if present_handles:
+            if len(present_handles) != len(handles):
+                return False
+            # A move within the list, which QListView normally makes with
+            # moveRows itself. The view removes the dragged rows after a
+            # successful drop, so report failure once the rows are moved.
+            self.move_handles(handles, row)
+            return False
+
+        self.insert_handles(row, handles)
+        # The view of the source list removes the rows there once this returns.
+        return True
+
+
+class ModListProxyModel(QSortFilterProxyModel):
+    """
+    The sort and filter proxy of a ModListModel, which passes moveRows on to it.
+    """
+
+    def moveRows(
+        self,
+        sourceParent: ModIndex,
+        sourceRow: int,
+        count: int,
+        destinationParent: ModIndex,
+        destinationChild: int,
+    ) -> bool:
+        source_model = self.sourceModel()
+        if sourceParent.isValid() or destinationParent.isValid() or count <= 0:
+            return False
+        if sourceRow < 0 or sourceRow + count > self.rowCount():
+            return False
+
+        # Rows that are next to each other here may not be in the source model,
+        # when a filter hides the rows between them.
+        source_rows = [
+            self.mapToSource(self.index(row, 0)).row()
+            for row in range(sourceRow, sourceRow + count)
+        ]
+        if source_rows != list(range(source_rows[0], source_rows[0] + count)):
+            return False
+        if destinationChild < self.rowCount():
+            source_destination = self.mapToSource(self.index(destinationChild, 0)).row()
+        elif self.rowCount() > 0:
+            source_destination = (
+                self.mapToSource(self.index(self.rowCount() - 1, 0)).row() + 1
+            )
+        else:
+            source_destination = source_model.rowCount()
+        return source_model.moveRows(
+            QModelIndex(), source_rows[0], count, QModelIndex(), source_destination
+        )
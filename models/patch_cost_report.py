@@ -0,0 +1,68 @@
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+
+class ModPatchCost(NamedTuple):
+    """
+    The estimated cost of a mod's XML patches.
+    """
+
+    mod_path: Path
+    file_count: int
+    operation_count: int
+    cost: int
+    longest_sequence: int
+    expensive_xpaths: List[Tuple[str, int]]
+
+
+class PatchCostReport:
+    """
+    The estimated patch costs of a set of mods, ranked from the most to the least
+    expensive.
+
+    :param costs: The patch cost of each mod.
+    :type costs: List[ModPatchCost]
+    """
+
+    def __init__(self, costs: List[ModPatchCost]) -> None:
+        self._ranked_costs = sorted(costs, key=lambda cost: cost.cost, reverse=True)
+        self._ranks_by_mod_path: Dict[Path, int] = {
+            cost.mod_path: rank for rank, cost in enumerate(self._ranked_costs, 1)
+        }
+
+    def __len__(self) -> int:
+        """
+        :return: The number of mods in the report.
+        :rtype: int
+        """
+        return len(self._ranked_costs)
+
+    def get(self, mod_path: Path) -> Optional[ModPatchCost]:
+        """
+        Retrieve the patch cost of a mod.
+
+        :param mod_path: The mod's folder.
+        :type mod_path: Path
+        :return: The mod's patch cost, or None if the mod is not in the report.
+        :rtype: Optional[ModPatchCost]
+        """
+        rank = self._ranks_by_mod_path.get(mod_path)
+        return self._ranked_costs[rank - 1] if rank is not None else None
+
+    def rank_of(self, mod_path: Path) -> Optional[int]:
+        """
+        Retrieve the rank of a mod, 1 being the most expensive.
+
+        :param mod_path: The mod's folder.
+        :type mod_path: Path
+        :return: The mod's rank, or None if the mod is not in the report.
+        :rtype: Optional[int]
+        """
+        return self._ranks_by_mod_path.get(mod_path)
+
+    def ranked(self) -> List[ModPatchCost]:
+        """
+        :return: The patch costs, from the most to the least expensive.
+        :rtype: List[ModPatchCost]
+        """
+        return list(self._ranked_costs)
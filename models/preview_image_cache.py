@@ -0,0 +1,218 @@
+import hashlib
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import List, Set, Tuple
+
+from PySide6.QtCore import QSize, Qt
+from PySide6.QtGui import QImage, QImageReader, QImageWriter
+from loguru import logger
+
+from utilities.file_signature import FileSignature, file_signature
+
+
+class PreviewImageCache:
+    """
+    Preview images of mods, scaled down to the width they are shown at and kept
+    on disk.
+
+    Preview images can be far larger than they are ever shown, so they are
+    scaled while they are decoded, to the smallest of a few widths that is at
+    least as wide as asked for. The scaled image is saved in the cache folder
+    under the preview's path, modification time, size and that width, and later
+    requests read the small image instead.
+
+    Preview images larger than MAX_PREVIEW_SIZE or MAX_PREVIEW_FILE_SIZE are
+    reported once each. The cache can be used from several threads at once.
+
+    :param cache_folder: The folder the scaled images are kept in.
+    :type cache_folder: Path
+    """
+
+    # The widths images are scaled to. Sizes in between are scaled from the next
+    # larger one, which is cheap.
+    WIDTH_BUCKETS = (160, 320, 480, 640, 960, 1280, 1920)
+
+    # RimWorld shows previews at 640x360; much larger ones only slow it down.
+    MAX_PREVIEW_SIZE = QSize(1920, 1080)
+    MAX_PREVIEW_FILE_SIZE = 2 * 1024 * 1024
+
+    # The number of scaled images kept; the least recently written go first.
+    MAX_CACHED_IMAGES = 512
+
+    def __init__(self, cache_folder: Path) -> None:
+        self._cache_folder = cache_folder
+        self._reported_images: Set[Tuple[str, FileSignature]] = set()
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def hits(self) -> int:
+        """
+        :return: The number of images read from the cache.
+        :rtype: int
+        """
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """
+        :return: The number of images decoded from the preview image.
+        :rtype: int
+        """
+        return self._misses
+
+    @property
+    def oversized_images(self) -> List[Path]:
+        """
+        :return: The preview images reported as too large so far.
+        :rtype: List[Path]
+        """
+        with self._lock:
+            return sorted({Path(path) for path, _ in self._reported_images})
+
+    @classmethod
+    def bucket_width(cls, width: int) -> int:
+        """
+        :param width: The width an image is shown at.
+        :type width: int
+        :return: The width the image is scaled to for it.
+        :rtype: int
+        """
+        for bucket_width in cls.WIDTH_BUCKETS:
+            if bucket_width >= width:
+                return bucket_width
+        return cls.WIDTH_BUCKETS[-1]
+
+    def get(self, preview_image_path: Path, width: int) -> QImage:
+        """
+        Get a preview image, scaled down to at least a width.
+
+        :param preview_image_path: The preview image.
+        :type preview_image_path: Path
+        :param width: The width the image is shown at.
+        :type width: int
+        :return: The image, no wider than the width bucket for the width and
+            never scaled up, or a null image if it cannot be read.
+        :rtype: QImage
+        """
+        signature = file_signature(preview_image_path)
+        if signature is None:
+            return QImage()
+        bucket_width = self.bucket_width(width)
+        cache_file = self._cache_file(preview_image_path, signature, bucket_width)
+
+        image = QImage(str(cache_file))
+        with self._lock:
+            if not image.isNull():
+                self._hits += 1
+                return image
+            self._misses += 1
+
+        reader = QImageReader(str(preview_image_path))
+        size = reader.size()
+        if size.isValid():
+            self._report_oversized(preview_image_path, signature, size)
+            if size.width() > bucket_width:
+                reader.setScaledSize(
+                    size.scaled(
+                        bucket_width, size.height(), Qt.AspectRatioMode.KeepAspectRatio
+                    )
+                )
+        image = reader.read()
+        if image.isNull():
+            logger.warning(
+                f"Could not read preview image {preview_image_path}: "
+                f"{reader.errorString()}"
+            )
+            return image
+
+        self._save(image, cache_file)
+        return image
+
+    def clear(self) -> None:
+        """
+        Delete all cached images.
+        """
+        for cache_file in self._cached_files():
+            cache_file.unlink(missing_ok=True)
+
+    def _cache_file(
+        self, preview_image_path: Path, signature: FileSignature, bucket_width: int
+    ) -> Path:
+        key = f"{preview_image_path}|{signature[0]}|{signature[1]}|{bucket_width}"
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return self._cache_folder / f"{digest}.png"
+
+    def _cached_files(self) -> List[Path]:
+        try:
+            return list(self._cache_folder.glob("*.png"))
+        except OSError:
+            return []
+
+    def _save(self, image: QImage, cache_file: Path) -> None:
+        try:
+            self._cache_folder.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            logger.warning(f"Could not create preview cache {self._cache_folder}: {e}")
+            return
+        # Write to a unique temporary file and swap it in, so that another
+        # thread never reads a half-written image.
+        try:
+            file_descriptor, temp_file_name = tempfile.mkstemp(
+                dir=str(self._cache_folder), suffix=".tmp"
+            )
+            os.close(file_descriptor)
+        except OSError as e:
+            logger.warning(f"Could not write preview cache file {cache_file}: {e}")
+            return
+        try:
+            writer = QImageWriter(temp_file_name, b"png")
+            if not writer.write(image):
+                logger.warning(
+                    f"Could not write preview cache file {cache_file}: "
+                    f"{writer.errorString()}"
+                )
+                return
+            os.replace(temp_file_name, str(cache_file))
+        finally:
+            if os.path.exists(temp_file_name):
+                os.unlink(temp_file_name)
+
+        cached_files = self._cached_files()
+        if len(cached_files) <= self.MAX_CACHED_IMAGES:
+            return
+        # Images of previews that changed are never read again, and go first.
+        cached_files.sort(key=self._modification_time)
+        for stale_file in cached_files[: len(cached_files) - self.MAX_CACHED_IMAGES]:
+            stale_file.unlink(missing_ok=True)
+
+    @staticmethod
+    def _modification_time(cache_file: Path) -> int:
+        try:
+            return cache_file.stat().st_mtime_ns
+        except OSError:
+            # Already pruned by another thread.
+            return 0
+
+    def _report_oversized(
+        self, preview_image_path: Path, signature: FileSignature, size: QSize
+    ) -> None:
+        file_size = signature[1]
+        if (
+            size.width() <= self.MAX_PREVIEW_SIZE.width()
+            and size.height() <= self.MAX_PREVIEW_SIZE.height()
+            and file_size <= self.MAX_PREVIEW_FILE_SIZE
+        ):
+            return
+        key = (str(preview_image_path), signature)
+        with self._lock:
+            if key in self._reported_images:
+                return
+            self._reported_images.add(key)
+        logger.warning(
+            f"Oversized preview image {preview_image_path}: "
+            f"{size.width()}x{size.height()}, {file_size / (1024 * 1024):.1f} MiB"
+        )
@@ -0,0 +1,111 @@
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from PySide6.QtGui import QPixmap
+
+from utilities.file_signature import FileSignature
+
+# A preview image's path and signature, and the width in pixels it was scaled to.
+PreviewPixmapKey = Tuple[str, FileSignature, int]
+
+
+def pixmap_byte_count(pixmap: QPixmap) -> int:
+    """
+    :param pixmap: A pixmap.
+    :type pixmap: QPixmap
+    :return: The number of bytes its pixels take up.
+    :rtype: int
+    """
+    return pixmap.width() * pixmap.height() * pixmap.depth() // 8
+
+
+class PreviewPixmapCache:
+    """
+    Decoded preview images, kept in memory so that a mod selected again shows its
+    preview at once.
+
+    The least recently shown pixmaps are dropped once together they take up more
+    than the byte budget. Only use it from the GUI thread, as it holds pixmaps.
+
+    :param byte_budget: The number of bytes the pixmaps may take up. 0 keeps
+        none.
+    :type byte_budget: int
+    """
+
+    def __init__(self, byte_budget: int) -> None:
+        # Least recently used first.
+        self._pixmaps: "OrderedDict[PreviewPixmapKey, QPixmap]" = OrderedDict()
+        self._byte_budget = byte_budget
+        self._byte_count = 0
+
+    @property
+    def byte_budget(self) -> int:
+        """
+        :return: The number of bytes the pixmaps may take up.
+        :rtype: int
+        """
+        return self._byte_budget
+
+    @byte_budget.setter
+    def byte_budget(self, value: int) -> None:
+        self._byte_budget = value
+        self._evict()
+
+    @property
+    def byte_count(self) -> int:
+        """
+        :return: The number of bytes the pixmaps take up.
+        :rtype: int
+        """
+        return self._byte_count
+
+    def get(self, key: PreviewPixmapKey) -> Optional[QPixmap]:
+        """
+        :param key: The preview image's path and signature, and its width.
+        :type key: PreviewPixmapKey
+        :return: The pixmap, or None if it is not kept.
+        :rtype: Optional[QPixmap]
+        """
+        pixmap = self._pixmaps.get(key)
+        if pixmap is not None:
+            self._pixmaps.move_to_end(key)
+        return pixmap
+
+    def put(self, key: PreviewPixmapKey, pixmap: QPixmap) -> None:
+        """
+        Keep a pixmap, dropping the least recently used ones if they no longer
+        fit. A pixmap larger than the whole budget is not kept.
+
+        :param key: The preview image's path and signature, and its width.
+        :type key: PreviewPixmapKey
+        :param pixmap: The pixmap.
+        :type pixmap: QPixmap
+        """
+        old_pixmap = self._pixmaps.pop(key, None)
+        if old_pixmap is not None:
+            self._byte_count -= pixmap_byte_count(old_pixmap)
+        byte_count = pixmap_byte_count(pixmap)
+        if byte_count > self._byte_budget:
+            return
+        self._pixmaps[key] = pixmap
+        self._byte_count += byte_count
+        self._evict()
+
+    def clear(self) -> None:
+        """
+        Drop all pixmaps.
+        """
+        self._pixmaps.clear()
+        self._byte_count = 0
+
+    def __len__(self) -> int:
+        """
+        :return: The number of pixmaps kept.
+        :rtype: int
+        """
+        return len(self._pixmaps)
+
+    def _evict(self) -> None:
+        while self._byte_count > self._byte_budget:
+            _, pixmap = self._pixmaps.popitem(last=False)
+            self._byte_count -= pixmap_byte_count(pixmap)
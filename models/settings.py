@@ -35,6 +35,12 @@ class Settings(QObject):
 
         self._debug_logging: bool = False
 
+        # 0 means one scan worker per CPU core, 1 means scan without a process pool
+        self._scan_worker_count: int = 0
+
+        # MiB of decoded preview images kept in memory, 0 keeps none
+        self._preview_memory_budget: int = 64
+
         self._game_data_location: Optional[Path] = None
 
         self._apply_default_settings()
@@ -49,6 +55,10 @@ class Settings(QObject):
 
         self._debug_logging = False
 
+        self._scan_worker_count = 0
+
+        self._preview_memory_budget = 64
+
     def apply_default_settings(self) -> None:
         self._apply_default_settings()
         self.changed.emit()
@@ -113,6 +123,26 @@ class Settings(QObject):
             self._debug_logging = value
             self.changed.emit()
 
+    @property
+    def scan_worker_count(self) -> int:
+        return self._scan_worker_count
+
+    @scan_worker_count.setter
+    def scan_worker_count(self, value: int) -> None:
+        if self._scan_worker_count != value:
+            self._scan_worker_count = value
+            self.changed.emit()
+
+    @property
+    def preview_memory_budget(self) -> int:
+        return self._preview_memory_budget
+
+    @preview_memory_budget.setter
+    def preview_memory_budget(self, value: int) -> None:
+        if self._preview_memory_budget != value:
+            self._preview_memory_budget = value
+            self.changed.emit()
+
     @property
     def game_data_location(self) -> Optional[Path]:
         if self.game_location is None:
@@ -148,6 +178,8 @@ class Settings(QObject):
             else "",
             "sorting_algorithm": self._sorting_algorithm.name,
             "debug_logging": self._debug_logging,
+            "scan_worker_count": self._scan_worker_count,
+            "preview_memory_budget": self._preview_memory_budget,
         }
 
     def from_dict(self, data: Dict[str, str]) -> None:
@@ -181,3 +213,7 @@ class Settings(QObject):
         self._sorting_algorithm = Settings.SortingAlgorithm[sorting_algorithm_str]
 
         self._debug_logging = bool(data.get("debug_logging", False))
+
+        self._scan_worker_count = int(data.get("scan_worker_count", 0))
+
+        self._preview_memory_budget = int(data.get("preview_memory_budget", 64))
@@ -0,0 +1,139 @@
+import mmap
+import struct
+from pathlib import Path
+from typing import Dict, Optional
+
+from PySide6.QtGui import QImage
+from loguru import logger
+
+# The width and height of a thumbnail. A thumbnail in the format below takes
+# exactly one 4 KiB page.
+THUMBNAIL_SIZE = 32
+THUMBNAIL_FORMAT = QImage.Format.Format_ARGB32_Premultiplied
+SLOT_SIZE = THUMBNAIL_SIZE * THUMBNAIL_SIZE * 4
+
+# Bump whenever the layout of the atlas file changes.
+THUMBNAIL_ATLAS_VERSION = 1
+
+_MAGIC = b"RSTHUMBS"
+_HEADER = struct.Struct("<8sII")
+
+
+def atlas_header() -> bytes:
+    """
+    :return: The header of an atlas file, padded to the size of a slot so that
+        every thumbnail starts on a page of its own.
+    :rtype: bytes
+    """
+    header = _HEADER.pack(_MAGIC, THUMBNAIL_ATLAS_VERSION, THUMBNAIL_SIZE)
+    return header.ljust(SLOT_SIZE, b"\0")
+
+
+def is_atlas_header(data: bytes) -> bool:
+    """
+    :param data: The start of a file.
+    :type data: bytes
+    :return: True if the file is an atlas of this version and thumbnail size.
+    :rtype: bool
+    """
+    return data[: _HEADER.size] == atlas_header()[: _HEADER.size]
+
+
+def slot_offset(slot: int) -> int:
+    """
+    :param slot: The slot of a thumbnail.
+    :type slot: int
+    :return: The offset of the thumbnail in the atlas file.
+    :rtype: int
+    """
+    return (slot + 1) * SLOT_SIZE
+
+
+class ThumbnailAtlas:
+    """
+    The preview thumbnails of mods, read from a single memory-mapped file.
+
+    The file holds a header and then one fixed-size slot per thumbnail, so a
+    thumbnail is read straight from the mapped pages without opening or decoding
+    its preview image. ThumbnailAtlasRunner writes the file in the background and
+    tells which slot holds the thumbnail of each mod; set_slots then maps the
+    file again.
+
+    The file only ever grows, and a slot is only rewritten once no mod shown from
+    it, so the file can be written to while it is mapped here.
+
+    :param atlas_file: The atlas file.
+    :type atlas_file: Path
+    """
+
+    def __init__(self, atlas_file: Path) -> None:
+        self._atlas_file = atlas_file
+        self._slots_by_handle: Dict[int, int] = {}
+        self._mapped_file: Optional[mmap.mmap] = None
+        self._slot_count = 0
+
+    @property
+    def atlas_file(self) -> Path:
+        """
+        :return: The atlas file.
+        :rtype: Path
+        """
+        return self._atlas_file
+
+    def set_slots(self, slots_by_handle: Dict[int, int]) -> None:
+        """
+        Map the atlas file again, after it was written.
+
+        :param slots_by_handle: The slot of the thumbnail of each mod, by handle.
+        :type slots_by_handle: Dict[int, int]
+        """
+        self.close()
+        try:
+            with open(str(self._atlas_file), "rb") as file:
+                mapped_file = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not map thumbnail atlas {self._atlas_file}: {e}")
+            return
+        if not is_atlas_header(mapped_file[:SLOT_SIZE]):
+            logger.warning(f"Ignoring invalid thumbnail atlas {self._atlas_file}")
+            mapped_file.close()
+            return
+        self._mapped_file = mapped_file
+        self._slot_count = len(mapped_file) // SLOT_SIZE - 1
+        self._slots_by_handle = dict(slots_by_handle)
+
+    def close(self) -> None:
+        """
+        Unmap the atlas file. No thumbnails are returned until set_slots is
+        called again.
+        """
+        self._slots_by_handle = {}
+        self._slot_count = 0
+        if self._mapped_file is not None:
+            self._mapped_file.close()
+            self._mapped_file = None
+
+    def get(self, handle: int) -> Optional[QImage]:
+        """
+        :param handle: The handle of the mod.
+        :type handle: int
+        :return: The thumbnail of the mod's preview image, or None if it has
+            none.
+        :rtype: Optional[QImage]
+        """
+        slot = self._slots_by_handle.get(handle, -1)
+        if not 0 <= slot < self._slot_count or self._mapped_file is None:
+            return None
+        offset = slot_offset(slot)
+        pixels = self._mapped_file[offset : offset + SLOT_SIZE]
+        # The image only refers to the pixels; the copy owns them.
+        return QImage(
+            pixels, THUMBNAIL_SIZE, THUMBNAIL_SIZE, THUMBNAIL_SIZE * 4, THUMBNAIL_FORMAT
+        ).copy()
+
+    def __len__(self) -> int:
+        """
+        :return: The number of mods with a thumbnail.
+        :rtype: int
+        """
+        return len(self._slots_by_handle)
@@ -0,0 +1,101 @@
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from PySide6.QtCore import QObject, QThreadPool, Signal, Slot
+
+from models.thumbnail_atlas import ThumbnailAtlas
+from runners.thumbnail_atlas_runner import ThumbnailAtlasRunner
+
+
+class ThumbnailAtlasUpdater(QObject):
+    """
+    Keep a thumbnail atlas up to date with the preview images of the mods.
+
+    Updates run in the background, one at a time, as they share the atlas file
+    and its index. Asking for an update while one runs cancels it, and the new
+    update starts once it has stopped; of several asked for meanwhile, only the
+    last one runs.
+
+    :param thumbnail_atlas: The atlas to update.
+    :type thumbnail_atlas: ThumbnailAtlas
+    :param index_file: The file that records which preview is in which slot.
+    :type index_file: Path
+    """
+
+    # Emitted once the atlas shows the thumbnails of an update.
+    updated = Signal()
+
+    def __init__(
+        self,
+        thumbnail_atlas: ThumbnailAtlas,
+        index_file: Path,
+        parent: Optional[QObject] = None,
+    ) -> None:
+        super().__init__(parent)
+        self._thumbnail_atlas = thumbnail_atlas
+        self._index_file = index_file
+        # Signals from any other runner come from a cancelled update and are
+        # ignored.
+        self._runner: Optional[ThumbnailAtlasRunner] = None
+        self._pending_previews: Optional[List[Tuple[int, Path]]] = None
+
+    @property
+    def is_updating(self) -> bool:
+        """
+        :return: True if an update is running or waiting to run.
+        :rtype: bool
+        """
+        return self._runner is not None or self._pending_previews is not None
+
+    def update(self, previews: List[Tuple[int, Path]]) -> None:
+        """
+        Pack the thumbnails of new and changed preview images into the atlas,
+        replacing any update asked for before.
+
+        :param previews: The handle and the preview image of each mod.
+        :type previews: List[Tuple[int, Path]]
+        """
+        self._pending_previews = previews
+        if self._runner is not None:
+            self._runner.cancel()
+            return
+        self._start_pending_update()
+
+    def _start_pending_update(self) -> None:
+        if self._pending_previews is None:
+            return
+        runner = ThumbnailAtlasRunner(
+            self._pending_previews, self._thumbnail_atlas.atlas_file, self._index_file
+        )
+        self._pending_previews = None
+        # Keep the runner alive after it ran, so that its signals can still be
+        # compared against.
+        runner.setAutoDelete(False)
+        runner.signals.data_ready.connect(self._on_data_ready)
+        runner.signals.finished.connect(self._on_runner_done)
+        runner.signals.cancelled.connect(self._on_runner_done)
+        self._runner = runner
+        QThreadPool.globalInstance().start(runner)
+
+    def _is_current_runner(self) -> bool:
+        return self._runner is not None and self.sender() == self._runner.signals
+
+    @Slot(object)
+    def _on_data_ready(self, slots_by_handle: object) -> None:
+        if not isinstance(slots_by_handle, dict):
+            raise TypeError(
+                f"Expected a dict of slots, but got {type(slots_by_handle)}"
+            )
+        # A runner cancelled after it wrote its index still delivers an atlas
+        # that matches it.
+        if not self._is_current_runner():
+            return
+        self._thumbnail_atlas.set_slots(slots_by_handle)
+        self.updated.emit()
+
+    @Slot()
+    def _on_runner_done(self) -> None:
+        if not self._is_current_runner():
+            return
+        self._runner = None
+        self._start_pending_update()
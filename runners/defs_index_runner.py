@@ -0,0 +1,200 @@
+import threading
+import time
+from pathlib import Path
+from typing import Collection, List, Optional, Sequence, Tuple
+
+from PySide6.QtCore import QRunnable
+from loguru import logger
+from lxml import etree
+
+from models.defs_index import DefDefinition, DefsIndex
+from runners.runner_signals import RunnerSignals
+from utilities.mod_load_folders import LoadFolder, content_folders, walk_xml_files
+from utilities.file_signature import FileSignature
+from utilities.persistent_cache import PersistentCache
+from utilities.process_pool import parallel_map
+
+# Defs files are parsed much faster than a worker process starts, so only fan
+# out when every worker gets at least this many files.
+MIN_DEFS_FILES_PER_WORKER = 200
+
+# Bump whenever the data returned by extract_defs changes shape or meaning.
+DEFS_INDEX_CACHE_VERSION = 1
+
+_thread_local = threading.local()
+
+
+def extract_defs(defs_file: Path) -> List[Tuple[str, str]]:
+    """
+    Read the defs defined in a Defs XML file.
+
+    This runs in indexing worker processes, so it must stay free of Qt objects and
+    return only plain, picklable data.
+
+    :param defs_file: The Defs XML file.
+    :type defs_file: Path
+    :return: The (defType, defName) pairs of the file's defs, in file order.
+        Abstract defs, which have no defName, are skipped.
+    :rtype: List[Tuple[str, str]]
+    """
+    parser: Optional[etree.XMLParser] = getattr(_thread_local, "parser", None)
+    if parser is None:
+        parser = etree.XMLParser(
+            recover=True,
+            remove_comments=True,
+            remove_pis=True,
+            resolve_entities=False,
+            no_network=True,
+        )
+        _thread_local.parser = parser
+
+    try:
+        root = etree.parse(str(defs_file), parser).getroot()
+    except (OSError, etree.XMLSyntaxError):
+        return []
+    if root is None:
+        return []
+
+    defs: List[Tuple[str, str]] = []
+    for element in root:
+        if not isinstance(element.tag, str):
+            continue
+        def_name = element.findtext("defName")
+        if def_name:
+            defs.append((element.tag, def_name.strip()))
+    return defs
+
+
+class DefsIndexRunner(QRunnable):
+    """
+    Index the defs defined by mods.
+
+    The runner walks the Defs folders of each mod, reads every XML file in them,
+    and emits a DefsIndex through ``signals.data_ready``. Files with the same
+    modification time and size as in the cache are not read again, so later runs
+    only cost the folder walk. It can be stopped with cancel().
+
+    :param mods: The folder and the load folders of each mod.
+    :type mods: List[Tuple[Path, Sequence[LoadFolder]]]
+    :param worker_count: The number of worker processes to parse Defs files with.
+        0 uses one per CPU core, 1 parses serially on the runner's thread.
+    :type worker_count: int
+    :param active_package_ids: The lower-case package IDs of the active mods,
+        which decide the conditional load folders. None includes them all.
+    :type active_package_ids: Optional[Collection[str]]
+    :param cache_file: The index cache file.
+    :type cache_file: Optional[Path]
+    """
+
+    def __init__(
+        self,
+        mods: List[Tuple[Path, Sequence[LoadFolder]]],
+        worker_count: int = 1,
+        cache_file: Optional[Path] = None,
+        active_package_ids: Optional[Collection[str]] = None,
+    ) -> None:
+        super().__init__()
+        self.signals = RunnerSignals()
+        self.mods = mods
+        self.worker_count = worker_count
+        self.cache_file = cache_file
+        self.active_package_ids = active_package_ids
+        self._cancel_event = threading.Event()
+
+    def run(self) -> None:
+        started_at = time.perf_counter()
+
+        index_cache: Optional[PersistentCache] = None
+        if self.cache_file is not None:
+            index_cache = PersistentCache(self.cache_file, DEFS_INDEX_CACHE_VERSION)
+            index_cache.load()
+
+        # The files of each mod, and whether their defs are cached.
+        defs_files: List[Tuple[Path, Path, FileSignature]] = []
+        for mod_path, load_folders in self.mods:
+            if self.is_cancelled:
+                self._on_cancelled()
+                return
+            for folder in content_folders(
+                load_folders, "Defs", self.active_package_ids
+            ):
+                for defs_file, signature in walk_xml_files(folder):
+                    defs_files.append((mod_path, defs_file, signature))
+
+        cached_defs: List[Optional[List[Tuple[str, str]]]] = []
+        defs_files_to_parse: List[Path] = []
+        for _, defs_file, signature in defs_files:
+            cached_value = (
+                index_cache.get(str(defs_file), signature)
+                if index_cache is not None
+                else None
+            )
+            if cached_value is not None:
+                cached_defs.append([(pair[0], pair[1]) for pair in cached_value])
+            else:
+                cached_defs.append(None)
+                defs_files_to_parse.append(defs_file)
+
+        parsed_defs = parallel_map(
+            extract_defs,
+            defs_files_to_parse,
+            self.worker_count,
+            MIN_DEFS_FILES_PER_WORKER,
+        )
+
+        index = DefsIndex()
+        for (mod_path, defs_file, signature), defs in zip(defs_files, cached_defs):
+            if self.is_cancelled:
+                parsed_defs.close()
+                if index_cache is not None:
+                    self._save_index_cache(index_cache)
+                self._on_cancelled()
+                return
+
+            if defs is None:
+                defs = next(parsed_defs)
+                if index_cache is not None:
+                    index_cache.put(str(defs_file), signature, defs)
+
+            for def_type, def_name in defs:
+                index.add(DefDefinition(def_type, def_name, defs_file, mod_path))
+
+        if index_cache is not None:
+            index_cache.retain(str(defs_file) for _, defs_file, _ in defs_files)
+            self._save_index_cache(index_cache)
+
+        elapsed_ms = (time.perf_counter() - started_at) * 1000
+        logger.info(
+            f"Indexed {len(index)} defs in {len(defs_files)} files of "
+            f"{len(self.mods)} mods in {elapsed_ms:.0f} ms "
+            f"({len(defs_files_to_parse)} files parsed)"
+        )
+
+        self.signals.data_ready.emit(index)
+        self.signals.finished.emit()
+
+    def cancel(self) -> None:
+        """
+        Ask the runner to stop. It will emit ``signals.cancelled`` instead of
+        ``signals.data_ready`` and ``signals.finished``. This is safe to call
+        from any thread, at any time.
+        """
+        self._cancel_event.set()
+
+    @property
+    def is_cancelled(self) -> bool:
+        """
+        :return: True if cancel() has been called.
+        :rtype: bool
+        """
+        return self._cancel_event.is_set()
+
+    def _on_cancelled(self) -> None:
+        logger.info("Defs indexing cancelled")
+        self.signals.cancelled.emit()
+
+    def _save_index_cache(self, index_cache: PersistentCache) -> None:
+        try:
+            index_cache.save()
+        except OSError:
+            logger.warning(f"Could not write defs index cache to {self.cache_file}")
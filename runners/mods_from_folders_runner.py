@@ -1,79 +1,321 @@
+import threading
+from functools import partial
+import time
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Dict, Generator, List, Optional, Tuple
 
 from PySide6.QtCore import QRunnable
 from loguru import logger
-from lxml import etree
 
-from models.mod import Mod
 from runners.runner_signals import RunnerSignals
+from utilities.mod_folder_parser import parse_mod_folder
+from utilities.mod_folder_walker import ModFolderEntry, ModFolderWalker
+from utilities.mod_load_folders import LoadFolder
+from utilities.persistent_cache import PersistentCache
+from utilities.process_pool import parallel_map
+
+# Only fan out when every worker gets at least this many mod folders. Starting
+# a worker process takes about 150 ms, and parsing a mod folder about 0.06 ms,
+# so a worker only pays off past about 2,300 mod folders; see
+# benchmarks/bench_scan_workers.py.
+MIN_MOD_FOLDERS_PER_WORKER = 2500
+
+# Bump whenever the data returned by parse_mod_folder changes shape or meaning.
+SCAN_CACHE_VERSION = 5
+
+
+def _scan_cache_signature(
+    mod_folder: ModFolderEntry, game_version: str
+) -> Tuple[Any, ...]:
+    """
+    :return: Everything a mod's cached scan result depends on: About.xml, and
+        LoadFolders.xml, the mod's folders and the game version, which decide its
+        load folders.
+    """
+    return (
+        *mod_folder.about_xml_signature,
+        *(mod_folder.load_folders_xml_signature or (0, 0)),
+        game_version,
+        "/".join(sorted(mod_folder.sub_folder_names)),
+    )
+
+
+def _mod_data_to_cache_value(mod_data: Dict[str, Any]) -> Dict[str, Any]:
+    # The preview image, About.xml and folder paths come from the directory
+    # listing of every scan, so they are not cached. The Workshop ID is cached
+    # with About.xml, as Steam writes both when it installs or updates a mod.
+    cache_value = dict(mod_data)
+    del cache_value["preview_image_path"]
+    del cache_value["path"]
+    del cache_value["about_xml_path"]
+    # Load folders are stored relative to the mod folder.
+    cache_value["load_folders"] = [
+        [
+            str(load_folder.path.relative_to(mod_data["path"])),
+            list(load_folder.if_mod_active),
+            list(load_folder.if_mod_active_all),
+            list(load_folder.if_mod_not_active),
+        ]
+        for load_folder in mod_data["load_folders"]
+    ]
+    return cache_value
+
+
+def _mod_data_from_cache_value(
+    cache_value: Dict[str, Any], mod_folder: ModFolderEntry
+) -> Dict[str, Any]:
+    mod_data = dict(cache_value)
+    mod_data["preview_image_path"] = mod_folder.preview_image_path
+    mod_data["path"] = mod_folder.path
+    mod_data["about_xml_path"] = mod_folder.about_xml_path
+    mod_data["load_folders"] = [
+        LoadFolder(
+            mod_folder.path / relative_path,
+            tuple(if_mod_active),
+            tuple(if_mod_active_all),
+            tuple(if_mod_not_active),
+        )
+        for relative_path, if_mod_active, if_mod_active_all, if_mod_not_active in (
+            cache_value["load_folders"]
+        )
+    ]
+    return mod_data
 
 
 class ModsFromFoldersRunner(QRunnable):
-    def __init__(self, from_folders: List[Optional[Path]]) -> None:
+    """
+    Scan mod folders for About.xml files.
+
+    The runner emits a list of plain dicts through ``signals.data_ready``; the
+    receiver is responsible for turning them into Mod objects on the GUI thread.
+    While it runs, it reports the number of mod folders visited out of the total
+    through ``signals.progress``, and it can be stopped with cancel().
+
+    :param from_folders: The folders whose sub-folders are mods.
+    :type from_folders: List[Optional[Path]]
+    :param worker_count: The number of worker processes to parse About.xml files
+        with. 0 uses one per CPU core, 1 parses serially on the runner's thread.
+    :type worker_count: int
+    :param cache_file: The scan cache file. Mods whose About.xml and
+        LoadFolders.xml have the same modification times and sizes as in the
+        cache, and whose folders and game version are the same, are not parsed
+        again.
+    :type cache_file: Optional[Path]
+    :param chunk_size: If greater than 0, also stream the results through
+        ``signals.data_chunk_ready`` in lists of at most this many dicts.
+    :type chunk_size: int
+    :param chunk_interval_ms: When streaming, emit a chunk at least this often
+        even if it is not full.
+    :type chunk_interval_ms: int
+    :param game_version: The game version to work out load folders for.
+    :type game_version: str
+    :param mod_folders: If given, scan only these mod folders instead of all
+        the sub-folders of from_folders.
+    :type mod_folders: Optional[List[Path]]
+    """
+
+    # How often to report progress through ``signals.progress``.
+    PROGRESS_INTERVAL_MS = 50
+
+    def __init__(
+        self,
+        from_folders: List[Optional[Path]],
+        worker_count: int = 1,
+        cache_file: Optional[Path] = None,
+        chunk_size: int = 0,
+        chunk_interval_ms: int = 100,
+        game_version: str = "",
+        mod_folders: Optional[List[Path]] = None,
+    ) -> None:
         super().__init__()
         self.signals = RunnerSignals()
         self.from_folders = from_folders
+        self.worker_count = worker_count
+        self.cache_file = cache_file
+        self.chunk_size = chunk_size
+        self.chunk_interval_ms = chunk_interval_ms
+        self.game_version = game_version
+        self.mod_folders = mod_folders
+        self._cancel_event = threading.Event()
 
     def run(self) -> None:
-        data: List[Mod] = []
-
-        for folder in self.from_folders:
-            if folder is None or not folder.exists() or not folder.is_dir():
-                continue
-
-            for sub_folder in folder.iterdir():
-                if not sub_folder.is_dir():
-                    continue
-
-                about_xml_path = sub_folder / "About" / "About.xml"
-                if not about_xml_path.exists():
-                    continue
-
-                name: str = ""
-                package_id: str = ""
-                supported_versions: List[str] = []
-                description: str = ""
-                preview_image_path: Path = Path("")
-
-                try:
-                    tree = etree.parse(str(about_xml_path))
-                    root = tree.getroot()
-
-                    node = root.find("./name")
-                    if node is not None:
-                        name = str(node.text)
-
-                    node = root.find("./packageId")
-                    if node is not None:
-                        package_id = str(node.text)
-
-                    xpath = root.xpath("./supportedVersions/li/text()")
-                    if isinstance(xpath, list):
-                        supported_versions = [
-                            item for item in xpath if isinstance(item, str)
-                        ]
-
-                    node = root.find("./description")
-                    if node is not None:
-                        description = str(node.text)
-
-                except etree.XMLSyntaxError:
-                    logger.warning(f"Could not parse About.xml at {about_xml_path}")
-
-                preview_image_path = sub_folder / "About" / "Preview.png"
-                if not preview_image_path.exists():
-                    preview_image_path = Path("")
-
-                if name is not None:
-                    mod = Mod(
-                        name=name,
-                        package_id=package_id,
-                        supported_versions=supported_versions,
-                        description=description,
-                        preview_image_path=preview_image_path,
+        scan_cache: Optional[PersistentCache] = None
+        if self.cache_file is not None:
+            scan_cache = PersistentCache(self.cache_file, SCAN_CACHE_VERSION)
+            scan_cache.load()
+
+        walker = ModFolderWalker()
+        mod_folders: List[ModFolderEntry] = []
+        walk = (
+            walker.walk(self.from_folders)
+            if self.mod_folders is None
+            else walker.walk_mod_folders(self.mod_folders)
+        )
+        for mod_folder in walk:
+            if self.is_cancelled:
+                logger.info("Mod scan cancelled")
+                self.signals.cancelled.emit()
+                return
+            mod_folders.append(mod_folder)
+
+        cached_results: List[Optional[Dict[str, Any]]] = []
+        mod_folders_to_parse: List[ModFolderEntry] = []
+        for mod_folder in mod_folders:
+            cached_value = (
+                scan_cache.get(
+                    str(mod_folder.path),
+                    _scan_cache_signature(mod_folder, self.game_version),
+                )
+                if scan_cache is not None
+                else None
+            )
+            if cached_value is not None:
+                cached_results.append(
+                    _mod_data_from_cache_value(cached_value, mod_folder)
+                )
+            else:
+                cached_results.append(None)
+                mod_folders_to_parse.append(mod_folder)
+
+        parsed_results = self._iter_parsed_mod_folders(mod_folders_to_parse)
+
+        data: List[Dict[str, Any]] = []
+        chunk: List[Dict[str, Any]] = []
+        last_chunk_time = time.perf_counter()
+        last_progress_time = 0.0
+
+        total_count = len(mod_folders)
+        self.signals.progress.emit(0, total_count)
+
+        for visited_count, (mod_folder, cached_result) in enumerate(
+            zip(mod_folders, cached_results), start=1
+        ):
+            if self.is_cancelled:
+                # Stops and cancels the process pool, if any.
+                parsed_results.close()
+                if scan_cache is not None:
+                    self._save_scan_cache(scan_cache)
+                logger.info("Mod scan cancelled")
+                self.signals.cancelled.emit()
+                return
+
+            if cached_result is not None:
+                mod_data = cached_result
+            else:
+                mod_data, parse_failed = next(parsed_results)
+                if parse_failed:
+                    logger.warning(
+                        f"Malformed About.xml at {mod_folder.about_xml_path}"
+                    )
+                elif scan_cache is not None:
+                    scan_cache.put(
+                        str(mod_folder.path),
+                        _scan_cache_signature(mod_folder, self.game_version),
+                        _mod_data_to_cache_value(mod_data),
                     )
-                    data.append(mod)
+
+            data.append(mod_data)
+
+            if self.chunk_size > 0:
+                chunk.append(mod_data)
+                now = time.perf_counter()
+                if (
+                    len(chunk) >= self.chunk_size
+                    or (now - last_chunk_time) * 1000 >= self.chunk_interval_ms
+                ):
+                    self.signals.data_chunk_ready.emit(chunk)
+                    chunk = []
+                    last_chunk_time = now
+
+            now = time.perf_counter()
+            if (
+                now - last_progress_time
+            ) * 1000 >= self.PROGRESS_INTERVAL_MS or visited_count == total_count:
+                self.signals.progress.emit(visited_count, total_count)
+                last_progress_time = now
+
+        if chunk:
+            self.signals.data_chunk_ready.emit(chunk)
+
+        if scan_cache is not None:
+            # Only prune the folders that were scanned; a partial rescan must not
+            # drop the entries of the others.
+            if self.mod_folders is None:
+                scanned_folders = {
+                    str(folder) for folder in self.from_folders if folder is not None
+                }
+                kept_keys = [
+                    key
+                    for key in scan_cache.keys()
+                    if str(Path(key).parent) not in scanned_folders
+                ]
+            else:
+                scanned_mod_folders = {str(path) for path in self.mod_folders}
+                kept_keys = [
+                    key for key in scan_cache.keys() if key not in scanned_mod_folders
+                ]
+            scan_cache.retain(
+                kept_keys + [str(mod_folder.path) for mod_folder in mod_folders]
+            )
+            self._save_scan_cache(scan_cache)
+            logger.info(
+                f"Scan cache: {scan_cache.hits} hits, {scan_cache.misses} misses"
+            )
+
+        # Each parsed mod opens About.xml, and PublishedFileId.txt if the walk found
+        # one, on top of the walk.
+        parse_syscall_count = sum(
+            2 if mod_folder.published_file_id_path != Path("") else 1
+            for mod_folder in mod_folders_to_parse
+        )
+        logger.debug(
+            f"Mod scan made {walker.syscall_count + parse_syscall_count} "
+            f"filesystem calls for {len(mod_folders)} mod folders"
+        )
 
         self.signals.data_ready.emit(data)
         self.signals.finished.emit()
+
+    def cancel(self) -> None:
+        """
+        Ask the runner to stop. It will emit ``signals.cancelled`` instead of
+        ``signals.data_ready`` and ``signals.finished``. This is safe to call
+        from any thread, at any time.
+        """
+        self._cancel_event.set()
+
+    @property
+    def is_cancelled(self) -> bool:
+        """
+        :return: True if cancel() has been called.
+        :rtype: bool
+        """
+        return self._cancel_event.is_set()
+
+    def _save_scan_cache(self, scan_cache: PersistentCache) -> None:
+        try:
+            scan_cache.save()
+        except OSError:
+            logger.warning(f"Could not write scan cache to {self.cache_file}")
+
+    def _iter_parsed_mod_folders(
+        self, mod_folders: List[ModFolderEntry]
+    ) -> Generator[Tuple[Dict[str, Any], bool], None, None]:
+        """
+        Parse mod folders, in a process pool if the worker count allows it.
+
+        Results are yielded as soon as they are available, in the order of
+        mod_folders.
+
+        :param mod_folders: The mod folders to parse.
+        :type mod_folders: List[ModFolderEntry]
+        :return: A generator of the results of parse_mod_folder. Closing it early
+            stops the process pool.
+        :rtype: Generator[Tuple[Dict[str, Any], bool], None, None]
+        """
+        return parallel_map(
+            partial(parse_mod_folder, game_version=self.game_version),
+            mod_folders,
+            self.worker_count,
+            MIN_MOD_FOLDERS_PER_WORKER,
+        )
@@ -0,0 +1,188 @@
+import threading
+import time
+from pathlib import Path
+from typing import Any, Collection, Dict, List, Optional, Sequence, Tuple
+
+from PySide6.QtCore import QRunnable
+from loguru import logger
+
+from models.patch_cost_report import ModPatchCost, PatchCostReport
+from runners.runner_signals import RunnerSignals
+from utilities.mod_load_folders import LoadFolder, content_folders, walk_xml_files
+from utilities.patch_cost_analyzer import analyze_patch_file
+from utilities.file_signature import FileSignature
+from utilities.persistent_cache import PersistentCache
+from utilities.process_pool import parallel_map
+
+# Patch files are analyzed much faster than a worker process starts, so only
+# fan out when every worker gets at least this many files.
+MIN_PATCH_FILES_PER_WORKER = 200
+
+# Bump whenever the data returned by analyze_patch_file changes shape or meaning,
+# including when the cost model changes.
+PATCH_COST_CACHE_VERSION = 1
+
+# At most this many expensive XPaths are kept per mod.
+MAX_EXPENSIVE_XPATHS_PER_MOD = 5
+
+
+class PatchCostRunner(QRunnable):
+    """
+    Estimate the cost of the XML patches of mods.
+
+    The runner walks the Patches folders of each mod, analyzes every XML file in
+    them with analyze_patch_file, and emits a PatchCostReport through
+    ``signals.data_ready``. Files with the same modification time and size as in
+    the cache are not analyzed again. It can be stopped with cancel().
+
+    :param mods: The folder and the load folders of each mod.
+    :type mods: List[Tuple[Path, Sequence[LoadFolder]]]
+    :param worker_count: The number of worker processes to analyze files with.
+        0 uses one per CPU core, 1 works serially on the runner's thread.
+    :type worker_count: int
+    :param active_package_ids: The lower-case package IDs of the active mods,
+        which decide the conditional load folders. None includes them all.
+    :type active_package_ids: Optional[Collection[str]]
+    :param cache_file: The analysis cache file.
+    :type cache_file: Optional[Path]
+    """
+
+    def __init__(
+        self,
+        mods: List[Tuple[Path, Sequence[LoadFolder]]],
+        worker_count: int = 1,
+        cache_file: Optional[Path] = None,
+        active_package_ids: Optional[Collection[str]] = None,
+    ) -> None:
+        super().__init__()
+        self.signals = RunnerSignals()
+        self.mods = mods
+        self.worker_count = worker_count
+        self.cache_file = cache_file
+        self.active_package_ids = active_package_ids
+        self._cancel_event = threading.Event()
+
+    def run(self) -> None:
+        started_at = time.perf_counter()
+
+        cost_cache: Optional[PersistentCache] = None
+        if self.cache_file is not None:
+            cost_cache = PersistentCache(self.cache_file, PATCH_COST_CACHE_VERSION)
+            cost_cache.load()
+
+        patch_files: List[Tuple[Path, Path, FileSignature]] = []
+        for mod_path, load_folders in self.mods:
+            if self.is_cancelled:
+                self._on_cancelled()
+                return
+            for folder in content_folders(
+                load_folders, "Patches", self.active_package_ids
+            ):
+                for patch_file, signature in walk_xml_files(folder):
+                    patch_files.append((mod_path, patch_file, signature))
+
+        cached_results: List[Optional[Dict[str, Any]]] = []
+        patch_files_to_analyze: List[Path] = []
+        for _, patch_file, signature in patch_files:
+            cached_value = (
+                cost_cache.get(str(patch_file), signature)
+                if cost_cache is not None
+                else None
+            )
+            cached_results.append(cached_value)
+            if cached_value is None:
+                patch_files_to_analyze.append(patch_file)
+
+        analyzed_results = parallel_map(
+            analyze_patch_file,
+            patch_files_to_analyze,
+            self.worker_count,
+            MIN_PATCH_FILES_PER_WORKER,
+        )
+
+        results_by_mod_path: Dict[Path, List[Dict[str, Any]]] = {
+            mod_path: [] for mod_path, _ in self.mods
+        }
+        for (mod_path, patch_file, signature), result in zip(
+            patch_files, cached_results
+        ):
+            if self.is_cancelled:
+                analyzed_results.close()
+                if cost_cache is not None:
+                    self._save_cost_cache(cost_cache)
+                self._on_cancelled()
+                return
+
+            if result is None:
+                result = next(analyzed_results)
+                if cost_cache is not None:
+                    cost_cache.put(str(patch_file), signature, result)
+            results_by_mod_path[mod_path].append(result)
+
+        if cost_cache is not None:
+            cost_cache.retain(str(patch_file) for _, patch_file, _ in patch_files)
+            self._save_cost_cache(cost_cache)
+
+        report = PatchCostReport(
+            [
+                self._mod_patch_cost(mod_path, results)
+                for mod_path, results in results_by_mod_path.items()
+            ]
+        )
+
+        elapsed_ms = (time.perf_counter() - started_at) * 1000
+        logger.info(
+            f"Analyzed the patches of {len(self.mods)} mods in {elapsed_ms:.0f} ms "
+            f"({len(patch_files_to_analyze)} of {len(patch_files)} files analyzed)"
+        )
+
+        self.signals.data_ready.emit(report)
+        self.signals.finished.emit()
+
+    def cancel(self) -> None:
+        """
+        Ask the runner to stop. It will emit ``signals.cancelled`` instead of
+        ``signals.data_ready`` and ``signals.finished``. This is safe to call
+        from any thread, at any time.
+        """
+        self._cancel_event.set()
+
+    @property
+    def is_cancelled(self) -> bool:
+        """
+        :return: True if cancel() has been called.
+        :rtype: bool
+        """
+        return self._cancel_event.is_set()
+
+    @staticmethod
+    def _mod_patch_cost(mod_path: Path, results: List[Dict[str, Any]]) -> ModPatchCost:
+        expensive_xpaths = sorted(
+            (
+                (xpath, cost)
+                for result in results
+                for xpath, cost in result["expensive_xpaths"]
+            ),
+            key=lambda pair: pair[1],
+            reverse=True,
+        )
+        return ModPatchCost(
+            mod_path=mod_path,
+            file_count=len(results),
+            operation_count=sum(result["operation_count"] for result in results),
+            cost=sum(result["cost"] for result in results),
+            longest_sequence=max(
+                (result["longest_sequence"] for result in results), default=0
+            ),
+            expensive_xpaths=expensive_xpaths[:MAX_EXPENSIVE_XPATHS_PER_MOD],
+        )
+
+    def _on_cancelled(self) -> None:
+        logger.info("Patch cost analysis cancelled")
+        self.signals.cancelled.emit()
+
+    def _save_cost_cache(self, cost_cache: PersistentCache) -> None:
+        try:
+            cost_cache.save()
+        except OSError:
+            logger.warning(f"Could not write patch cost cache to {self.cache_file}")
@@ -0,0 +1,97 @@
+import threading
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+from PySide6.QtCore import QRunnable
+from loguru import logger
+
+from models.mod import Mod
+from models.preview_image_cache import PreviewImageCache
+from models.preview_pixmap_cache import PreviewPixmapKey
+from runners.preview_image_runner import read_preview_image
+from runners.runner_signals import RunnerSignals
+
+
+class PrefetchRunner(QRunnable):
+    """
+    Read ahead what the selected mod panel shows for the mods the user is
+    likely to select next, so that it shows them without waiting.
+
+    Mods are handled in order, nearest first. Each mod's description is read
+    into the DescriptionStore, and its preview image, if asked for, is decoded
+    and emitted as a ``(key, QImage)`` tuple through ``signals.data_chunk_ready``
+    for the GUI thread to keep as a pixmap. The runner emits
+    ``signals.finished`` when done, or ``signals.cancelled`` if cancel() was
+    called first.
+
+    :param mods: The mods, nearest first.
+    :type mods: List[Mod]
+    :param previews: The key and the preview image of each preview to decode.
+        The key's width is the width it is decoded at.
+    :type previews: List[Tuple[PreviewPixmapKey, Path]]
+    :param preview_image_cache: The cache the scaled images are read from and
+        saved to.
+    :type preview_image_cache: PreviewImageCache
+    """
+
+    def __init__(
+        self,
+        mods: List[Mod],
+        previews: List[Tuple[PreviewPixmapKey, Path]],
+        preview_image_cache: PreviewImageCache,
+    ) -> None:
+        super().__init__()
+        self.signals = RunnerSignals()
+        self.mods = mods
+        self.previews = previews
+        self.preview_image_cache = preview_image_cache
+        self._cancel_event = threading.Event()
+
+    def run(self) -> None:
+        started_at = time.perf_counter()
+
+        previews_by_path = {
+            preview_image_path: key for key, preview_image_path in self.previews
+        }
+        preview_count = 0
+        for mod in self.mods:
+            if self.is_cancelled:
+                self.signals.cancelled.emit()
+                return
+
+            # Reading the description keeps it in the DescriptionStore.
+            _ = mod.description
+
+            key = previews_by_path.get(mod.preview_image_path)
+            if key is None:
+                continue
+            image = read_preview_image(
+                self.preview_image_cache, mod.preview_image_path, key[2]
+            )
+            if not image.isNull():
+                self.signals.data_chunk_ready.emit((key, image))
+                preview_count += 1
+
+        elapsed_ms = (time.perf_counter() - started_at) * 1000
+        logger.debug(
+            f"Prefetched {len(self.mods)} descriptions and {preview_count} "
+            f"previews in {elapsed_ms:.0f} ms"
+        )
+        self.signals.finished.emit()
+
+    def cancel(self) -> None:
+        """
+        Ask the runner to stop before the next mod. It will emit
+        ``signals.cancelled`` instead of ``signals.finished``. This is safe to
+        call from any thread, at any time.
+        """
+        self._cancel_event.set()
+
+    @property
+    def is_cancelled(self) -> bool:
+        """
+        :return: True if cancel() has been called.
+        :rtype: bool
+        """
+        return self._cancel_event.is_set()
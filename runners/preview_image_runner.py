@@ -0,0 +1,94 @@
+import threading
+from pathlib import Path
+
+from PySide6.QtCore import QRunnable, Qt
+from PySide6.QtGui import QImage
+
+from models.preview_image_cache import PreviewImageCache
+from runners.runner_signals import RunnerSignals
+
+
+def read_preview_image(
+    preview_image_cache: PreviewImageCache, preview_image_path: Path, width: int
+) -> QImage:
+    """
+    Read a preview image through the cache, scaled to exactly a width.
+
+    :param preview_image_cache: The cache the scaled image is read from and
+        saved to.
+    :type preview_image_cache: PreviewImageCache
+    :param preview_image_path: The preview image.
+    :type preview_image_path: Path
+    :param width: The width in pixels the image is shown at.
+    :type width: int
+    :return: The image, or a null image if it cannot be read.
+    :rtype: QImage
+    """
+    image = preview_image_cache.get(preview_image_path, width)
+    if not image.isNull() and image.width() != width:
+        image = image.scaledToWidth(width, Qt.TransformationMode.SmoothTransformation)
+    return image
+
+
+class PreviewImageRunner(QRunnable):
+    """
+    Decode a mod's preview image, scaled to the width it is shown at.
+
+    The image is read through a PreviewImageCache and emitted as a QImage
+    through ``signals.data_ready``; a null QImage if it cannot be read. It is
+    turned into a pixmap on the GUI thread. A runner cancelled before it
+    finishes decoding emits ``signals.cancelled`` instead.
+
+    :param preview_image_path: The preview image.
+    :type preview_image_path: Path
+    :param width: The width in pixels the image is shown at.
+    :type width: int
+    :param preview_image_cache: The cache the scaled image is read from and
+        saved to.
+    :type preview_image_cache: PreviewImageCache
+    """
+
+    def __init__(
+        self,
+        preview_image_path: Path,
+        width: int,
+        preview_image_cache: PreviewImageCache,
+    ) -> None:
+        super().__init__()
+        self.signals = RunnerSignals()
+        self.preview_image_path = preview_image_path
+        self.width = width
+        self.preview_image_cache = preview_image_cache
+        self._cancel_event = threading.Event()
+
+    def run(self) -> None:
+        # The selection may have moved on while the runner waited for a thread.
+        if self.is_cancelled:
+            self.signals.cancelled.emit()
+            return
+
+        image = read_preview_image(
+            self.preview_image_cache, self.preview_image_path, self.width
+        )
+        if self.is_cancelled:
+            self.signals.cancelled.emit()
+            return
+
+        self.signals.data_ready.emit(image)
+        self.signals.finished.emit()
+
+    def cancel(self) -> None:
+        """
+        Ask the runner to stop. It will emit ``signals.cancelled`` instead of
+        ``signals.data_ready`` and ``signals.finished``. This is safe to call
+        from any thread, at any time.
+        """
+        self._cancel_event.set()
+
+    @property
+    def is_cancelled(self) -> bool:
+        """
+        :return: True if cancel() has been called.
+        :rtype: bool
+        """
+        return self._cancel_event.is_set()
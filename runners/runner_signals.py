@@ -3,4 +3,7 @@ from PySide6.QtCore import QObject, Signal
 
 class RunnerSignals(QObject):
     data_ready = Signal(object)
+    data_chunk_ready = Signal(object)
+    progress = Signal(int, int)
     finished = Signal()
+    cancelled = Signal()
@@ -0,0 +1,209 @@
+import os
+import threading
+import time
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional, Set, Tuple
+
+from PySide6.QtCore import QRunnable, QSize, Qt
+from PySide6.QtGui import QImage, QImageReader, QPainter
+from loguru import logger
+
+from models.thumbnail_atlas import (
+    SLOT_SIZE,
+    THUMBNAIL_ATLAS_VERSION,
+    THUMBNAIL_FORMAT,
+    THUMBNAIL_SIZE,
+    atlas_header,
+    is_atlas_header,
+    slot_offset,
+)
+from runners.runner_signals import RunnerSignals
+from utilities.file_signature import file_signature
+from utilities.persistent_cache import PersistentCache
+
+# The slot recorded for previews that cannot be read, so that they are not
+# read again until they change.
+NO_THUMBNAIL = -1
+
+
+def render_thumbnail(preview_image_path: Path) -> Optional[QImage]:
+    """
+    Scale a preview image down to a thumbnail, centered on a transparent square.
+
+    The image is scaled while it is decoded, which for JPEG previews skips most
+    of the decoding work.
+
+    :param preview_image_path: The preview image.
+    :type preview_image_path: Path
+    :return: The thumbnail, THUMBNAIL_SIZE pixels square in THUMBNAIL_FORMAT, or
+        None if the image cannot be read.
+    :rtype: Optional[QImage]
+    """
+    reader = QImageReader(str(preview_image_path))
+    size = reader.size()
+    if size.isValid():
+        reader.setScaledSize(
+            size.scaled(
+                THUMBNAIL_SIZE, THUMBNAIL_SIZE, Qt.AspectRatioMode.KeepAspectRatio
+            )
+        )
+    image = reader.read()
+    if image.isNull():
+        return None
+    if image.width() > THUMBNAIL_SIZE or image.height() > THUMBNAIL_SIZE:
+        image = image.scaled(
+            QSize(THUMBNAIL_SIZE, THUMBNAIL_SIZE),
+            Qt.AspectRatioMode.KeepAspectRatio,
+            Qt.TransformationMode.SmoothTransformation,
+        )
+
+    thumbnail = QImage(THUMBNAIL_SIZE, THUMBNAIL_SIZE, THUMBNAIL_FORMAT)
+    thumbnail.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(thumbnail)
+    painter.drawImage(
+        (THUMBNAIL_SIZE - image.width()) // 2,
+        (THUMBNAIL_SIZE - image.height()) // 2,
+        image,
+    )
+    painter.end()
+    return thumbnail
+
+
+class ThumbnailAtlasRunner(QRunnable):
+    """
+    Pack thumbnails of the preview images of mods into the thumbnail atlas.
+
+    Thumbnails whose preview image has the same modification time and size as
+    when it was packed are kept; only new and changed previews are decoded. The
+    runner emits the slot of each mod's thumbnail, by handle, through
+    ``signals.data_ready``, and then ``signals.finished``. It can be stopped
+    with cancel(); it then emits ``signals.cancelled`` and leaves the index
+    file as it was.
+
+    Slots that held a thumbnail when the runner started are not reused until the
+    next run, as a ThumbnailAtlas may still be showing them. Runners sharing an
+    atlas file must not run at the same time; ThumbnailAtlasUpdater runs them
+    one after another.
+
+    :param previews: The handle and the preview image of each mod.
+    :type previews: List[Tuple[int, Path]]
+    :param atlas_file: The atlas file.
+    :type atlas_file: Path
+    :param index_file: The file that records which preview is in which slot.
+    :type index_file: Path
+    """
+
+    def __init__(
+        self, previews: List[Tuple[int, Path]], atlas_file: Path, index_file: Path
+    ) -> None:
+        super().__init__()
+        self.signals = RunnerSignals()
+        self.previews = previews
+        self.atlas_file = atlas_file
+        self.index_file = index_file
+        self._cancel_event = threading.Event()
+
+    def run(self) -> None:
+        started_at = time.perf_counter()
+
+        index = PersistentCache(self.index_file, THUMBNAIL_ATLAS_VERSION)
+        try:
+            atlas = open(
+                str(self.atlas_file), "r+b" if self.atlas_file.exists() else "w+b"
+            )
+        except OSError as e:
+            logger.warning(f"Could not open thumbnail atlas {self.atlas_file}: {e}")
+            self.signals.finished.emit()
+            return
+
+        with atlas:
+            if is_atlas_header(atlas.read(SLOT_SIZE)):
+                index.load()
+            else:
+                # A new or unreadable atlas: start over, in place.
+                atlas.seek(0)
+                atlas.write(atlas_header())
+            slot_count = max(os.fstat(atlas.fileno()).st_size // SLOT_SIZE - 1, 0)
+            used_slots: Set[int] = {
+                slot for slot in index.values() if isinstance(slot, int)
+            }
+            free_slots = [slot for slot in range(slot_count) if slot not in used_slots]
+            free_slots.reverse()
+
+            slots_by_handle: Dict[int, int] = {}
+            decoded_count = 0
+            for handle, preview_image_path in self.previews:
+                if self.is_cancelled:
+                    # The index is not saved: the next runner works from the
+                    # index the last finished run left.
+                    self._on_cancelled()
+                    return
+
+                signature = file_signature(preview_image_path)
+                if signature is None:
+                    continue
+                key = str(preview_image_path)
+                slot = index.get(key, signature)
+                if not isinstance(slot, int):
+                    slot = free_slots.pop() if free_slots else slot_count
+                    if slot == slot_count:
+                        slot_count += 1
+                    if self._write_thumbnail(atlas, slot, preview_image_path):
+                        decoded_count += 1
+                    else:
+                        free_slots.append(slot)
+                        slot = NO_THUMBNAIL
+                    index.put(key, signature, slot)
+                if slot != NO_THUMBNAIL:
+                    slots_by_handle[handle] = slot
+
+        index.retain(str(preview_image_path) for _, preview_image_path in self.previews)
+        self._save_index(index)
+
+        elapsed_ms = (time.perf_counter() - started_at) * 1000
+        logger.info(
+            f"Packed the thumbnails of {len(slots_by_handle)} of "
+            f"{len(self.previews)} mods in {elapsed_ms:.0f} ms "
+            f"({decoded_count} previews decoded)"
+        )
+
+        self.signals.data_ready.emit(slots_by_handle)
+        self.signals.finished.emit()
+
+    def cancel(self) -> None:
+        """
+        Ask the runner to stop. It will emit ``signals.cancelled`` instead of
+        ``signals.data_ready`` and ``signals.finished``. This is safe to call
+        from any thread, at any time.
+        """
+        self._cancel_event.set()
+
+    @property
+    def is_cancelled(self) -> bool:
+        """
+        :return: True if cancel() has been called.
+        :rtype: bool
+        """
+        return self._cancel_event.is_set()
+
+    @staticmethod
+    def _write_thumbnail(atlas: BinaryIO, slot: int, preview_image_path: Path) -> bool:
+        thumbnail = render_thumbnail(preview_image_path)
+        if thumbnail is None:
+            logger.debug(f"Could not read preview image {preview_image_path}")
+            return False
+        atlas.seek(slot_offset(slot))
+        atlas.write(bytes(thumbnail.constBits()))
+        return True
+
+    def _on_cancelled(self) -> None:
+        logger.info("Thumbnail atlas update cancelled")
+        self.signals.cancelled.emit()
+
+    def _save_index(self, index: PersistentCache) -> None:
+        try:
+            index.save()
+        except OSError:
+            logger.warning(
+                f"Could not write thumbnail atlas index to {self.index_file}"
+            )
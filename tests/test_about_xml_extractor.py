@@ -0,0 +1,110 @@
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from utilities.about_xml_extractor import AboutXmlExtractor, empty_about_data
+
+FULL_ABOUT_XML = """<?xml version="1.0" encoding="utf-8"?>
+<ModMetaData>
+  <!-- A comment -->
+  <name>Full Mod</name>
+  <packageId>Test.FullMod</packageId>
+  <author>Alice, Bob</author>
+  <authors><li>Carol</li></authors>
+  <url>https://example.com</url>
+  <modVersion>2.1</modVersion>
+  <description>Line one.
+Line two.</description>
+  <supportedVersions><li>1.4</li><li>1.5</li></supportedVersions>
+  <modDependencies>
+    <li><packageId>brrainz.harmony</packageId><displayName>Harmony</displayName></li>
+  </modDependencies>
+  <modDependenciesByVersion>
+    <v1.4><li><packageId>old.dependency</packageId></li></v1.4>
+  </modDependenciesByVersion>
+  <loadBefore><li>before.mod</li></loadBefore>
+  <loadBeforeByVersion><v1.5><li>before.mod.15</li></v1.5></loadBeforeByVersion>
+  <loadAfter><li>after.mod</li></loadAfter>
+  <loadAfterByVersion><v1.4><li>after.mod.14</li></v1.4></loadAfterByVersion>
+  <incompatibleWith><li>bad.mod</li></incompatibleWith>
+  <incompatibleWithByVersion><v1.5><li>bad.mod.15</li></v1.5></incompatibleWithByVersion>
+  <forceLoadBefore><li>force.before</li></forceLoadBefore>
+  <forceLoadAfter><li>force.after</li></forceLoadAfter>
+</ModMetaData>
+"""
+
+
+class TestAboutXmlExtractor(TestCase):
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.about_folder = Path(self._temp_dir.name)
+        self.about_xml_path = self.about_folder / "About.xml"
+        self.extractor = AboutXmlExtractor()
+
+    def tearDown(self) -> None:
+        self._temp_dir.cleanup()
+
+    def test_extract_full_schema(self) -> None:
+        self.about_xml_path.write_text(FULL_ABOUT_XML)
+        (self.about_folder / "PublishedFileId.txt").write_text("123456\n")
+
+        data = self.extractor.extract(self.about_xml_path)
+
+        self.assertFalse(data["parse_failed"])
+        self.assertEqual(data["name"], "Full Mod")
+        self.assertEqual(data["package_id"], "Test.FullMod")
+        self.assertEqual(data["authors"], ["Alice", "Bob", "Carol"])
+        self.assertEqual(data["url"], "https://example.com")
+        self.assertEqual(data["mod_version"], "2.1")
+        self.assertEqual(data["description"], "Line one.\nLine two.")
+        self.assertEqual(data["supported_versions"], ["1.4", "1.5"])
+        self.assertEqual(data["dependencies"], ["brrainz.harmony"])
+        self.assertEqual(data["dependencies_by_version"], {"1.4": ["old.dependency"]})
+        self.assertEqual(data["load_before"], ["before.mod"])
+        self.assertEqual(data["load_before_by_version"], {"1.5": ["before.mod.15"]})
+        self.assertEqual(data["load_after"], ["after.mod"])
+        self.assertEqual(data["load_after_by_version"], {"1.4": ["after.mod.14"]})
+        self.assertEqual(data["incompatible_with"], ["bad.mod"])
+        self.assertEqual(data["incompatible_with_by_version"], {"1.5": ["bad.mod.15"]})
+        self.assertEqual(data["force_load_before"], ["force.before"])
+        self.assertEqual(data["force_load_after"], ["force.after"])
+        self.assertEqual(data["published_file_id"], "123456")
+
+    def test_extract_reuses_parser(self) -> None:
+        self.about_xml_path.write_text(FULL_ABOUT_XML)
+        self.extractor.extract(self.about_xml_path)
+
+        self.about_xml_path.write_text(
+            "<ModMetaData><packageId>second</packageId></ModMetaData>"
+        )
+        data = self.extractor.extract(self.about_xml_path)
+
+        expected = empty_about_data()
+        expected["package_id"] = "second"
+        expected["parse_failed"] = False
+        self.assertEqual(data, expected)
+
+    def test_extract_malformed(self) -> None:
+        self.about_xml_path.write_text(
+            "<ModMetaData><name>Broken & Mod</name><packageId>broken</packageId>"
+        )
+        data = self.extractor.extract(self.about_xml_path)
+        self.assertTrue(data["parse_failed"])
+        self.assertEqual(data["package_id"], "broken")
+
+        # The parser recovers for the next file.
+        self.about_xml_path.write_text(
+            "<ModMetaData><packageId>fine</packageId></ModMetaData>"
+        )
+        data = self.extractor.extract(self.about_xml_path)
+        self.assertFalse(data["parse_failed"])
+        self.assertEqual(data["package_id"], "fine")
+
+    def test_extract_empty_or_missing(self) -> None:
+        self.about_xml_path.write_text("")
+        data = self.extractor.extract(self.about_xml_path)
+        self.assertTrue(data["parse_failed"])
+        self.assertEqual(data["package_id"], "")
+
+        data = self.extractor.extract(self.about_folder / "Missing.xml")
+        self.assertTrue(data["parse_failed"])
@@ -0,0 +1,118 @@
+import tempfile
+from pathlib import Path
+from typing import Any, List
+from unittest import TestCase
+
+from models.defs_index import DefsIndex
+from runners.defs_index_runner import DefsIndexRunner, extract_defs
+from utilities.mod_load_folders import LoadFolder, resolve_load_folders
+
+THING_DEFS_XML = """<?xml version="1.0" encoding="utf-8"?>
+<Defs>
+  <ThingDef Name="BaseThing" Abstract="True"><label>base</label></ThingDef>
+  <!-- A comment -->
+  <ThingDef ParentName="BaseThing"><defName>Steel</defName></ThingDef>
+  <RecipeDef><defName>MakeSteel</defName></RecipeDef>
+</Defs>
+"""
+
+
+class TestDefsIndexRunner(TestCase):
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.mods_folder = Path(self._temp_dir.name)
+
+    def tearDown(self) -> None:
+        self._temp_dir.cleanup()
+
+    def _write(self, path: Path, text: str) -> Path:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+        return path
+
+    def _run(self, runner: DefsIndexRunner) -> DefsIndex:
+        emitted: List[Any] = []
+        runner.signals.data_ready.connect(emitted.append)
+        runner.run()
+        self.assertEqual(len(emitted), 1)
+        return emitted[0]
+
+    def test_extract_defs(self) -> None:
+        defs_file = self._write(self.mods_folder / "Things.xml", THING_DEFS_XML)
+        self.assertEqual(
+            extract_defs(defs_file), [("ThingDef", "Steel"), ("RecipeDef", "MakeSteel")]
+        )
+
+    def test_extract_defs_malformed(self) -> None:
+        defs_file = self._write(
+            self.mods_folder / "Broken.xml",
+            "<Defs><ThingDef><defName>Wood</defName></ThingDef><ThingDef>",
+        )
+        self.assertEqual(extract_defs(defs_file), [("ThingDef", "Wood")])
+        self.assertEqual(extract_defs(self.mods_folder / "Missing.xml"), [])
+
+    def test_run(self) -> None:
+        mod_a = self.mods_folder / "a"
+        mod_b = self.mods_folder / "b"
+        self._write(mod_a / "Defs" / "Things" / "Things.xml", THING_DEFS_XML)
+        self._write(
+            mod_b / "1.5" / "Defs" / "Override.xml",
+            "<Defs><ThingDef><defName>Steel</defName></ThingDef></Defs>",
+        )
+        self._write(
+            mod_b / "1.4" / "Defs" / "Old.xml",
+            "<Defs><ThingDef><defName>OldThing</defName></ThingDef></Defs>",
+        )
+
+        index = self._run(
+            DefsIndexRunner(
+                [
+                    (mod_a, [LoadFolder(mod_a)]),
+                    (mod_b, resolve_load_folders(mod_b, "1.5", ["1.4", "1.5"])),
+                ]
+            )
+        )
+
+        self.assertEqual(len(index), 3)
+        self.assertEqual(
+            [definition.mod_path for definition in index.get_definitions("Steel")],
+            [mod_a, mod_b],
+        )
+        self.assertEqual(index.get_definitions("MakeSteel")[0].def_type, "RecipeDef")
+        self.assertEqual(index.get_definitions("OldThing"), [])
+
+    def test_run_with_cache(self) -> None:
+        mod_a = self.mods_folder / "a"
+        defs_file = self._write(mod_a / "Defs" / "Things.xml", THING_DEFS_XML)
+        cache_file = self.mods_folder / "defs_index_cache.json"
+
+        first_index = self._run(
+            DefsIndexRunner([(mod_a, [LoadFolder(mod_a)])], cache_file=cache_file)
+        )
+        self.assertTrue(cache_file.exists())
+
+        # A changed file is read again.
+        defs_file.write_text(
+            "<Defs><ThingDef><defName>Gold</defName></ThingDef></Defs>"
+        )
+        second_index = self._run(
+            DefsIndexRunner([(mod_a, [LoadFolder(mod_a)])], cache_file=cache_file)
+        )
+
+        self.assertEqual(len(first_index.get_definitions("Steel")), 1)
+        self.assertEqual(second_index.get_definitions("Steel"), [])
+        self.assertEqual(len(second_index.get_definitions("Gold")), 1)
+
+    def test_cancel(self) -> None:
+        mod_a = self.mods_folder / "a"
+        self._write(mod_a / "Defs" / "Things.xml", THING_DEFS_XML)
+
+        emitted: List[Any] = []
+        cancelled: List[bool] = []
+        runner = DefsIndexRunner([(mod_a, [LoadFolder(mod_a)])])
+        runner.signals.data_ready.connect(emitted.append)
+        runner.signals.cancelled.connect(lambda: cancelled.append(True))
+        runner.cancel()
+        runner.run()
+        self.assertEqual(emitted, [])
+        self.assertEqual(cancelled, [True])
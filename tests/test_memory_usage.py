@@ -0,0 +1,19 @@
+from unittest import TestCase
+
+from models.mod import Mod
+from utilities.memory_usage import deep_size_of
+
+
+class TestMemoryUsage(TestCase):
+    def test_deep_size_of(self) -> None:
+        shared_text = "x" * 1000
+        self.assertGreater(deep_size_of([[shared_text]]), 1000)
+        # Objects referred to more than once are counted once.
+        self.assertEqual(
+            deep_size_of([[shared_text, shared_text]]) - deep_size_of([[shared_text]]),
+            8,
+        )
+
+    def test_slotted_objects(self) -> None:
+        mod = Mod(name="n" * 1000)
+        self.assertGreater(deep_size_of([mod]), 1000)
@@ -0,0 +1,118 @@
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from models.description_store import DescriptionStore
+from models.mod import Mod
+from utilities.mod_load_folders import LoadFolder
+
+
+class TestMod(TestCase):
+    def test_fields(self) -> None:
+        mod_path = Path("/mods/example")
+        load_folders = [
+            LoadFolder(mod_path),
+            LoadFolder(mod_path / "1.5"),
+            LoadFolder(
+                mod_path / "Biotech", if_mod_active=("ludeon.rimworld.biotech",)
+            ),
+        ]
+        mod = Mod(
+            name="Example",
+            package_id="someone.example",
+            supported_versions=["1.4", "1.5"],
+            path=mod_path,
+            preview_image_path=mod_path / "About" / "Preview.png",
+            load_after_by_version={"v1.5": ["brrainz.harmony"]},
+            load_folders=load_folders,
+        )
+
+        self.assertEqual(mod.supported_versions, ("1.4", "1.5"))
+        self.assertEqual(mod.preview_image_path, mod_path / "About" / "Preview.png")
+        self.assertEqual(mod.load_after_by_version, {"v1.5": ("brrainz.harmony",)})
+        self.assertEqual(mod.load_before_by_version, {})
+        self.assertEqual(mod.load_folders, tuple(load_folders))
+        self.assertEqual(Mod().preview_image_path, Path(""))
+
+    def test_setters(self) -> None:
+        mod = Mod(path=Path("/mods/example"))
+        mod.authors = ("Someone",)
+        mod.load_folders = (LoadFolder(Path("/mods/example/Common")),)
+
+        self.assertEqual(mod.authors, ("Someone",))
+        self.assertEqual(mod.load_folders, (LoadFolder(Path("/mods/example/Common")),))
+
+    def test_slots(self) -> None:
+        mod = Mod()
+        with self.assertRaises(AttributeError):
+            mod.unknown_field = 1  # type: ignore[attr-defined]
+
+    def test_expansion_names(self) -> None:
+        self.assertEqual(Mod(package_id="Ludeon.RimWorld").name, "Core")
+        self.assertEqual(Mod(package_id="ludeon.rimworld.biotech").name, "Biotech")
+
+    def test_handle_and_uuid(self) -> None:
+        mod = Mod()
+        self.assertEqual(mod.handle, -1)
+        mod.handle = 3
+        self.assertEqual(mod.handle, 3)
+        self.assertEqual(mod.uuid, mod.uuid)
+        self.assertNotEqual(mod.uuid, Mod().uuid)
+
+    def test_interned_strings(self) -> None:
+        # Built at run time, so that the compiler does not share them already.
+        version = "".join(["1.", "5"])
+        first_mod = Mod(supported_versions=[version], authors=["".join(["A", "B"])])
+        second_mod = Mod(supported_versions=["1.5"], authors=["AB"])
+
+        self.assertIs(first_mod.supported_versions[0], second_mod.supported_versions[0])
+        self.assertIs(first_mod.authors[0], second_mod.authors[0])
+
+    def test_lazy_description(self) -> None:
+        DescriptionStore().clear()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            about_xml_path = Path(temp_dir) / "About.xml"
+            about_xml_path.write_text(
+                "<ModMetaData><description>Scanned</description></ModMetaData>"
+            )
+            mod = Mod(description="Scanned", about_xml_path=about_xml_path)
+            mod_without_about_xml = Mod(description="Kept")
+
+            # The description is read again from About.xml, then kept for a while.
+            self.assertIsNone(mod._description)
+            self.assertEqual(mod.description, "Scanned")
+            about_xml_path.unlink()
+            self.assertEqual(mod.description, "Scanned")
+            self.assertEqual(mod_without_about_xml.description, "Kept")
+
+            # An assigned description is kept.
+            mod.description = "Changed"
+            self.assertEqual(mod.description, "Changed")
+            mod.about_xml_path = Path(temp_dir) / "Other.xml"
+            self.assertEqual(mod.description, "Changed")
+
+    def test_description_changed_on_disk(self) -> None:
+        DescriptionStore().clear()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            about_xml_path = Path(temp_dir) / "About.xml"
+            about_xml_path.write_text(
+                "<ModMetaData><description>Edited</description></ModMetaData>"
+            )
+            mod = Mod(description="Scanned", about_xml_path=about_xml_path)
+
+            # Text that no longer matches the scan is not passed off as the mod's.
+            self.assertEqual(mod.description, "")
+            self.assertEqual(len(DescriptionStore()), 0)
+
+    def test_take_identity_of(self) -> None:
+        mod = Mod(name="Old", description="Text", about_xml_path=Path("/x.xml"))
+        mod.handle = 7
+        same_mod = Mod(name="Old", description="Text", about_xml_path=Path("/x.xml"))
+        new_mod = Mod(name="New", description="Text", about_xml_path=Path("/x.xml"))
+
+        self.assertTrue(mod.has_same_metadata(same_mod))
+        self.assertFalse(mod.has_same_metadata(new_mod))
+
+        new_mod.take_identity_of(mod)
+        self.assertEqual(new_mod.handle, 7)
+        self.assertEqual(new_mod.uuid, mod.uuid)
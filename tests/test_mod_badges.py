@@ -0,0 +1,61 @@
+from pathlib import Path
+from typing import Dict, List
+from unittest import TestCase
+
+from models.mod import Mod
+from models.mod_badges import ModBadgeProvider, ModBadges
+
+LOCAL_FOLDER = Path("/game/Mods")
+STEAM_FOLDER = Path("/steam/workshop/content/294100")
+
+
+class TestModBadgeProvider(TestCase):
+    def setUp(self) -> None:
+        self.mods: List[Mod] = []
+        self.mods_by_package_id: Dict[str, Mod] = {}
+        self.provider = ModBadgeProvider(
+            "1.5.4104 rev435",
+            {LOCAL_FOLDER: "Local", STEAM_FOLDER: "Steam"},
+            self.mods.__getitem__,
+            lambda package_id: self.mods_by_package_id.get(package_id.lower()),
+        )
+
+    def _add(self, folder: Path, package_id: str, **kwargs: object) -> Mod:
+        path = folder / package_id
+        mod = Mod(package_id=package_id, path=path, **kwargs)  # type: ignore[arg-type]
+        mod.handle = len(self.mods)
+        self.mods.append(mod)
+        self.mods_by_package_id[package_id.lower()] = mod
+        return mod
+
+    def test_badges(self) -> None:
+        supported = self._add(LOCAL_FOLDER, "a.supported", supported_versions=["1.5"])
+        outdated = self._add(
+            STEAM_FOLDER,
+            "a.outdated",
+            supported_versions=["1.3", "1.4"],
+            dependencies=["A.Supported", "a.missing"],
+        )
+        unknown_folder = self._add(Path("/elsewhere"), "a.unknown")
+
+        self.assertEqual(self.provider.get(supported.handle), ModBadges("Local"))
+        self.assertEqual(
+            self.provider.get(outdated.handle),
+            ModBadges("Steam", "1.4", ("a.missing",)),
+        )
+        self.assertEqual(self.provider.get(unknown_folder.handle), ModBadges())
+
+    def test_clear(self) -> None:
+        mod = self._add(LOCAL_FOLDER, "a.mod", dependencies=["a.dependency"])
+        self.assertEqual(
+            self.provider.get(mod.handle).missing_dependencies, ("a.dependency",)
+        )
+
+        # The badges are kept until the cache is cleared.
+        self._add(STEAM_FOLDER, "a.dependency")
+        self.assertTrue(self.provider.get(mod.handle).missing_dependencies)
+        self.provider.clear()
+        self.assertFalse(self.provider.get(mod.handle).missing_dependencies)
+
+        self.provider.set_folder_labels({LOCAL_FOLDER: "Mine"})
+        self.assertEqual(self.provider.get(mod.handle).folder_label, "Mine")
@@ -0,0 +1,238 @@
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+from unittest import TestCase
+from unittest.mock import patch
+
+from PySide6.QtCore import QCoreApplication, QThreadPool
+from PySide6.QtGui import QGuiApplication
+
+from models.mod import Mod
+from models.mod_database import ModDatabase, diff_scan
+from runners.mods_from_folders_runner import ModsFromFoldersRunner
+from utilities.app_info import AppInfo
+from utilities.event_bus import EventBus
+from utilities.mod_folder_watcher import ModFolderWatcher
+
+LOCAL_FOLDER = Path("/game/Mods")
+STEAM_FOLDER = Path("/steam/workshop/content/294100")
+
+
+def scanned(path: Path, package_id: str, name: str = "") -> Dict[str, Any]:
+    return {"path": path, "package_id": package_id, "name": name}
+
+
+class TestDiffScan(TestCase):
+    def setUp(self) -> None:
+        self.kept_mod = Mod(package_id="a", path=LOCAL_FOLDER / "a")
+        self.renamed_mod = Mod(package_id="b", path=LOCAL_FOLDER / "b")
+        self.deleted_mod = Mod(package_id="c", path=LOCAL_FOLDER / "c")
+        self.steam_mod = Mod(package_id="d", path=STEAM_FOLDER / "d")
+        self.mods_by_path = {
+            mod.path: mod
+            for mod in (
+                self.kept_mod,
+                self.renamed_mod,
+                self.deleted_mod,
+                self.steam_mod,
+            )
+        }
+
+    def test_diff_scan(self) -> None:
+        kept_item = scanned(LOCAL_FOLDER / "a", "a", "Changed name")
+        renamed_item = scanned(LOCAL_FOLDER / "b renamed", "B")
+        new_item = scanned(LOCAL_FOLDER / "e", "e")
+
+        scan_diff = diff_scan(
+            self.mods_by_path,
+            [kept_item, renamed_item, new_item],
+            [LOCAL_FOLDER],
+            [LOCAL_FOLDER, STEAM_FOLDER],
+        )
+
+        self.assertEqual(scan_diff.added, [new_item])
+        self.assertEqual(
+            scan_diff.matched,
+            [(self.kept_mod, kept_item), (self.renamed_mod, renamed_item)],
+        )
+        # The Steam folder was not scanned, so its mods stay.
+        self.assertEqual(scan_diff.removed, [self.deleted_mod])
+
+    def test_dropped_folder(self) -> None:
+        moved_item = scanned(LOCAL_FOLDER / "d", "d")
+
+        scan_diff = diff_scan(
+            self.mods_by_path,
+            [scanned(LOCAL_FOLDER / "a", "a"), moved_item],
+            [LOCAL_FOLDER],
+            [LOCAL_FOLDER],
+        )
+
+        self.assertEqual(scan_diff.added, [])
+        self.assertIn((self.steam_mod, moved_item), scan_diff.matched)
+        self.assertEqual(scan_diff.removed, [self.renamed_mod, self.deleted_mod])
+
+
+def write_mod(mod_folder: Path, package_id: str, name: str) -> None:
+    # About.xml is replaced rather than written over, as Steam does.
+    about_folder = mod_folder / "About"
+    about_folder.mkdir(parents=True, exist_ok=True)
+    temp_path = about_folder / "About.xml.tmp"
+    temp_path.write_text(
+        f"<ModMetaData><name>{name}</name><packageId>{package_id}</packageId>"
+        "</ModMetaData>"
+    )
+    os.replace(temp_path, about_folder / "About.xml")
+
+
+class TestModDatabase(TestCase):
+    app = None
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        # Scan results and folder changes are delivered through the event loop.
+        if QGuiApplication.instance() is None:
+            cls.app = QGuiApplication([])
+
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.folder = Path(self._temp_dir.name)
+        self.mods_folder = self.folder / "Mods"
+        self.mods_folder.mkdir()
+        user_data_folder = self.folder / "data"
+        user_data_folder.mkdir()
+
+        AppInfo(__file__)
+        # Keep the scan cache out of the real user data folder.
+        user_data_patch = patch.object(AppInfo(), "_user_data_folder", user_data_folder)
+        user_data_patch.start()
+        self.addCleanup(user_data_patch.stop)
+        debounce_patch = patch.object(ModFolderWatcher, "DEBOUNCE_INTERVAL_MS", 50)
+        debounce_patch.start()
+        self.addCleanup(debounce_patch.stop)
+
+        self.events: List[Tuple[str, List[Mod]]] = []
+        self._connections: List[Tuple[Any, Callable[[Any], None]]] = []
+        for name, signal in (
+            ("added", EventBus().database_mods_added),
+            ("updated", EventBus().database_mods_updated),
+            ("removed", EventBus().database_mods_removed),
+        ):
+            slot = self._record_event(name)
+            signal.connect(slot)
+            self._connections.append((signal, slot))
+
+    def tearDown(self) -> None:
+        for signal, slot in self._connections:
+            signal.disconnect(slot)
+        if ModDatabase._instance is not None:
+            ModDatabase().cancel_scan()
+        QThreadPool.globalInstance().waitForDone()
+        QCoreApplication.processEvents()
+        ModDatabase._instance = None
+        self._temp_dir.cleanup()
+
+    def _record_event(self, name: str) -> Callable[[Any], None]:
+        def record(mods: List[Mod]) -> None:
+            self.events.append((name, mods))
+
+        return record
+
+    def _wait_for(self, condition: Callable[[], bool]) -> None:
+        deadline = time.monotonic() + 10
+        while not condition() and time.monotonic() < deadline:
+            QCoreApplication.processEvents()
+            time.sleep(0.005)
+        self.assertTrue(condition())
+
+    def _wait_for_event(self, name: str) -> List[Mod]:
+        self._wait_for(lambda: any(event[0] == name for event in self.events))
+        mods = next(mods for event_name, mods in self.events if event_name == name)
+        self.events.clear()
+        return mods
+
+    def test_watched_changes(self) -> None:
+        write_mod(self.mods_folder / "a", "test.a", "A")
+        database = ModDatabase([self.mods_folder])
+
+        def watched_paths() -> List[str]:
+            return sorted(database._folder_watcher._watcher.directories())
+
+        # The mods are only watched once they are loaded.
+        self.assertEqual(watched_paths(), [str(self.mods_folder)])
+        self.assertEqual([mod.name for mod in self._wait_for_event("added")], ["A"])
+        self._wait_for(lambda: database._scanning_folders is None)
+        self.assertEqual(
+            watched_paths(), [str(self.mods_folder), str(self.mods_folder / "a/About")]
+        )
+
+        # A new mod folder.
+        write_mod(self.mods_folder / "b", "test.b", "B")
+        self.assertEqual([mod.name for mod in self._wait_for_event("added")], ["B"])
+        self.assertIn(str(self.mods_folder / "b/About"), watched_paths())
+
+        # A mod whose About.xml is replaced keeps its handle.
+        handle = database.get_mod_by_package_id("test.a").handle  # type: ignore[union-attr]
+        write_mod(self.mods_folder / "a", "test.a", "A, edited")
+        updated_mods = self._wait_for_event("updated")
+        self.assertEqual([mod.name for mod in updated_mods], ["A, edited"])
+        self.assertEqual(updated_mods[0].handle, handle)
+
+        # A deleted mod folder.
+        shutil.rmtree(self.mods_folder / "b")
+        self.assertEqual([mod.name for mod in self._wait_for_event("removed")], ["B"])
+        self.assertEqual(sorted(mod.name for mod in database), ["A, edited"])
+
+    def test_load_in_chunks(self) -> None:
+        for index in range(7):
+            write_mod(
+                self.mods_folder / f"mod{index}", f"test.mod{index}", f"Mod {index}"
+            )
+
+        one_shot: List[Any] = []
+        runner = ModsFromFoldersRunner([self.mods_folder])
+        runner.signals.data_ready.connect(one_shot.append)
+        runner.run()
+
+        with patch.object(ModDatabase, "LOAD_CHUNK_SIZE", 3), patch.object(
+            ModDatabase, "LOAD_CHUNK_INTERVAL_MS", 60_000
+        ):
+            database = ModDatabase([self.mods_folder])
+            self._wait_for(lambda: database._scanning_folders is None)
+
+        # Each chunk is announced as it arrives, and together they make up the
+        # same mods as loading them in one go.
+        self.assertEqual(
+            [len(mods) for name, mods in self.events if name == "added"], [3, 3, 1]
+        )
+        self.assertEqual(
+            sorted((mod.path, mod.package_id, mod.name) for mod in database),
+            sorted(
+                (mod_data["path"], mod_data["package_id"], mod_data["name"])
+                for mod_data in one_shot[0]
+            ),
+        )
+
+    def test_reload_during_initial_load(self) -> None:
+        write_mod(self.mods_folder / "a", "test.a", "A")
+        other_mods_folder = self.folder / "Other mods"
+        write_mod(other_mods_folder / "b", "test.b", "B")
+        database = ModDatabase([self.mods_folder])
+
+        ready_count = 0
+
+        def on_database_ready() -> None:
+            nonlocal ready_count
+            ready_count += 1
+
+        EventBus().database_ready.connect(on_database_ready)
+        self.addCleanup(EventBus().database_ready.disconnect, on_database_ready)
+
+        # The initial load is cancelled before it delivered anything; the
+        # rescan that replaces it finishes the load instead.
+        database.reload([other_mods_folder])
+        self._wait_for(lambda: ready_count == 1)
+        self.assertEqual([mod.name for mod in database], ["B"])
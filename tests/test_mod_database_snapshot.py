@@ -0,0 +1,41 @@
+from pathlib import Path
+from typing import Dict, List, Optional
+from unittest import TestCase
+
+from models.mod import Mod
+from models.mod_database_snapshot import ModDatabaseSnapshot
+
+
+class TestModDatabaseSnapshot(TestCase):
+    def test_snapshot(self) -> None:
+        mods = [
+            Mod(name="a", package_id="Someone.A", path=Path("/mods/a")),
+            Mod(name="b", package_id="someone.b", path=Path("/mods/b")),
+        ]
+        for handle, mod in enumerate(mods):
+            mod.handle = handle
+        mods_by_handle: List[Optional[Mod]] = list(mods)
+        mods_by_path: Dict[Path, Mod] = {mod.path: mod for mod in mods}
+
+        snapshot = ModDatabaseSnapshot(
+            3,
+            mods_by_handle,
+            mods_by_path,
+            {mod.package_id.lower(): mod for mod in mods},
+        )
+        # Later changes to the database do not reach the snapshot.
+        mods_by_handle[0] = None
+        del mods_by_path[Path("/mods/b")]
+
+        self.assertEqual(snapshot.generation, 3)
+        self.assertEqual(len(snapshot), 2)
+        self.assertEqual([mod.name for mod in snapshot], ["a", "b"])
+        # Two iterations at once do not disturb each other.
+        self.assertEqual(
+            [(first.name, second.name) for first in snapshot for second in snapshot],
+            [("a", "a"), ("a", "b"), ("b", "a"), ("b", "b")],
+        )
+        self.assertIs(snapshot.get_mod_by_handle(0), mods[0])
+        self.assertIsNone(snapshot.get_mod_by_handle(2))
+        self.assertIs(snapshot.get_mod_by_path(Path("/mods/b")), mods[1])
+        self.assertIs(snapshot.get_mod_by_package_id("someone.a"), mods[0])
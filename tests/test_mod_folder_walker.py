@@ -0,0 +1,88 @@
+import tempfile
+from pathlib import Path
+from typing import List
+from unittest import TestCase
+
+from utilities.mod_folder_walker import ModFolderWalker
+
+
+class TestModFolderWalker(TestCase):
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.mods_folder = Path(self._temp_dir.name)
+
+    def tearDown(self) -> None:
+        self._temp_dir.cleanup()
+
+    def _make_mod(self, folder_name: str, file_names: List[str]) -> Path:
+        about_folder = self.mods_folder / folder_name / "About"
+        about_folder.mkdir(parents=True)
+        for file_name in file_names:
+            (about_folder / file_name).write_text("<ModMetaData/>")
+        return about_folder.parent
+
+    def test_walk(self) -> None:
+        with_preview = self._make_mod(
+            "with_preview", ["About.xml", "Preview.png", "PublishedFileId.txt"]
+        )
+        without_preview = self._make_mod("without_preview", ["About.xml"])
+        self._make_mod("without_about_xml", ["Preview.png"])
+        (self.mods_folder / "not_a_folder.txt").write_text("")
+
+        walker = ModFolderWalker()
+        entries = {
+            entry.path: entry
+            for entry in walker.walk([self.mods_folder, None, Path("missing")])
+        }
+
+        self.assertEqual(set(entries), {with_preview, without_preview})
+        self.assertEqual(
+            entries[with_preview].preview_image_path,
+            with_preview / "About" / "Preview.png",
+        )
+        self.assertEqual(entries[without_preview].preview_image_path, Path(""))
+        self.assertEqual(
+            entries[with_preview].published_file_id_path,
+            with_preview / "About" / "PublishedFileId.txt",
+        )
+        self.assertEqual(entries[without_preview].published_file_id_path, Path(""))
+        self.assertEqual(
+            entries[without_preview].about_xml_signature[1],
+            len("<ModMetaData/>"),
+        )
+
+    def test_walk_is_case_insensitive(self) -> None:
+        mod_folder = self._make_mod("mod", ["about.xml", "preview.PNG"])
+        entries = list(ModFolderWalker().walk([self.mods_folder]))
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0].about_xml_path, mod_folder / "About" / "about.xml")
+        self.assertEqual(
+            entries[0].preview_image_path, mod_folder / "About" / "preview.PNG"
+        )
+
+    def test_syscall_count(self) -> None:
+        for index in range(3):
+            self._make_mod(f"mod{index}", ["About.xml", "Preview.png"])
+        walker = ModFolderWalker()
+        list(walker.walk([self.mods_folder]))
+        # One listing of the mods folder, then one listing of each mod folder and
+        # of its About folder, and one stat of each About.xml.
+        self.assertLessEqual(walker.syscall_count, 1 + 3 * 3)
+
+    def test_walk_load_folders(self) -> None:
+        mod_folder = self._make_mod("mod", ["About.xml"])
+        (mod_folder / "1.5").mkdir()
+        (mod_folder / "LoadFolders.xml").write_text("<loadFolders/>")
+        plain_mod_folder = self._make_mod("plain", ["About.xml"])
+
+        entries = {
+            entry.path: entry for entry in ModFolderWalker().walk([self.mods_folder])
+        }
+
+        self.assertEqual(sorted(entries[mod_folder].sub_folder_names), ["1.5", "About"])
+        self.assertEqual(
+            entries[mod_folder].load_folders_xml_path, mod_folder / "LoadFolders.xml"
+        )
+        self.assertIsNotNone(entries[mod_folder].load_folders_xml_signature)
+        self.assertEqual(entries[plain_mod_folder].load_folders_xml_path, Path(""))
+        self.assertIsNone(entries[plain_mod_folder].load_folders_xml_signature)
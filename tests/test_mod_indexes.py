@@ -0,0 +1,93 @@
+from pathlib import Path
+from typing import List
+from unittest import TestCase
+
+from models.mod import Mod
+from models.mod_indexes import ModIndexes
+
+LOCAL_FOLDER = Path("/game/Mods")
+STEAM_FOLDER = Path("/steam/workshop/content/294100")
+
+
+class TestModIndexes(TestCase):
+    def setUp(self) -> None:
+        self.indexes = ModIndexes([LOCAL_FOLDER, STEAM_FOLDER])
+        self.handle_count = 0
+
+    def _add(self, folder: Path, name: str, **kwargs: object) -> Mod:
+        mod = Mod(name=name, path=folder / name, **kwargs)  # type: ignore[arg-type]
+        mod.handle = self.handle_count
+        self.handle_count += 1
+        self.indexes.add(mod)
+        return mod
+
+    @staticmethod
+    def _names(mods: List[Mod]) -> List[str]:
+        return [mod.name for mod in mods]
+
+    def test_shadowed_copies(self) -> None:
+        steam_copy = self._add(STEAM_FOLDER, "steam", package_id="Someone.Mod")
+        local_copy = self._add(LOCAL_FOLDER, "local", package_id="someone.mod")
+
+        # The local folder comes first, whatever the scan order.
+        self.assertIs(self.indexes.get_by_package_id("SOMEONE.MOD"), local_copy)
+        self.assertEqual(
+            self.indexes.get_candidates("someone.mod"), [local_copy, steam_copy]
+        )
+        self.assertIs(self.indexes.get_shadowing_mod(steam_copy), local_copy)
+        self.assertIsNone(self.indexes.get_shadowing_mod(local_copy))
+        self.assertEqual(self.indexes.get_shadowed_mods(), [steam_copy])
+
+        self.indexes.set_folders([STEAM_FOLDER, LOCAL_FOLDER])
+        self.assertIs(self.indexes.get_by_package_id("someone.mod"), steam_copy)
+
+        self.indexes.remove(steam_copy)
+        self.assertIs(self.indexes.get_by_package_id("someone.mod"), local_copy)
+        self.assertEqual(self.indexes.get_shadowed_mods(), [])
+
+    def test_without_package_id(self) -> None:
+        x = self._add(LOCAL_FOLDER, "x")
+        y = self._add(LOCAL_FOLDER, "y")
+
+        # Two mods without a package ID are not copies of one mod.
+        self.assertEqual(self.indexes.get_shadowed_mods(), [])
+        self.assertIsNone(self.indexes.get_shadowing_mod(x))
+        self.assertIsNone(self.indexes.get_shadowing_mod(y))
+        self.assertIsNone(self.indexes.get_by_package_id(""))
+        self.assertEqual(self.indexes.get_candidates(""), [])
+        self.assertEqual(self.indexes.get_mods_by_package_id(), {})
+        self.assertEqual(
+            self._names(self.indexes.find(folder=LOCAL_FOLDER)), ["x", "y"]
+        )
+
+        self.indexes.remove(x)
+        self.assertEqual(self._names(self.indexes.find()), ["y"])
+
+    def test_find(self) -> None:
+        self._add(STEAM_FOLDER, "a", supported_versions=["1.4", "1.5"], authors=["X"])
+        self._add(STEAM_FOLDER, "b", supported_versions=["1.4"], authors=["Y"])
+        self._add(LOCAL_FOLDER, "c", supported_versions=["1.5"], authors=["x"])
+        self._add(STEAM_FOLDER, "d", published_file_id="123")
+
+        self.assertEqual(
+            self._names(
+                self.indexes.find(folder=STEAM_FOLDER, supported_version="1.5")
+            ),
+            ["a"],
+        )
+        self.assertEqual(self._names(self.indexes.find(author="X")), ["a", "c"])
+        self.assertEqual(self._names(self.indexes.find(published_file_id="123")), ["d"])
+        self.assertEqual(self.indexes.find(author="nobody"), [])
+        self.assertEqual(len(self.indexes.find()), 4)
+
+    def test_remove(self) -> None:
+        mod = self._add(STEAM_FOLDER, "a", supported_versions=["1.5"], authors=["X"])
+        self.indexes.remove(mod)
+        # Removing it again does nothing.
+        self.indexes.remove(mod)
+
+        self.assertEqual(len(self.indexes), 0)
+        self.assertIsNone(self.indexes.get_by_package_id(""))
+        self.assertEqual(self.indexes.find(supported_version="1.5"), [])
+        self.assertEqual(self.indexes._handles_by_author, {})
+        self.assertEqual(self.indexes._handles_by_folder, {})
@@ -0,0 +1,130 @@
+from typing import Dict, List, Optional
+from unittest import TestCase
+
+from models.mod import Mod
+from models.mod_list import ModList, partition_mods
+
+
+class TestModList(TestCase):
+    def setUp(self) -> None:
+        self.mods: Dict[int, Mod] = {}
+
+    def _make_mods(self, names: List[str]) -> List[Mod]:
+        mods = [Mod(name=name, package_id=f"someone.{name}") for name in names]
+        for handle, mod in enumerate(mods, start=len(self.mods)):
+            mod.handle = handle
+            self.mods[handle] = mod
+        return mods
+
+    def _get_mod(self, handle: int) -> Optional[Mod]:
+        return self.mods.get(handle)
+
+    @staticmethod
+    def _names(mod_list: ModList) -> List[str]:
+        return [mod.name for mod in mod_list if mod is not None]
+
+    def test_partition_mods(self) -> None:
+        mods = self._make_mods(["a", "b", "c", "d"])
+        duplicate = Mod(name="c copy", package_id="Someone.C")
+
+        active_package_ids = {"someone.d"}
+        active_mods, inactive_mods = partition_mods(
+            mods + [duplicate],
+            {"someone.c": 0, "someone.a": 1, "someone.d": 2},
+            active_package_ids,
+        )
+
+        self.assertEqual([mod.name for mod in active_mods], ["c", "a"])
+        # b is not in the load order, d is already active, and only one copy of
+        # c can be.
+        self.assertEqual([mod.name for mod in inactive_mods], ["b", "d", "c copy"])
+        self.assertEqual(active_package_ids, {"someone.a", "someone.c", "someone.d"})
+
+    def test_insert_many_sorted(self) -> None:
+        mod_list = ModList(self._get_mod)
+        # Many items for the size of the list are merged in one reset.
+        mod_list.insert_many_sorted(self._make_mods(["d", "B", "f"]))
+        self.assertEqual(self._names(mod_list), ["B", "d", "f"])
+
+        mod_list.insert_many_sorted(self._make_mods(["a", "e", "c", "g"]))
+        self.assertEqual(self._names(mod_list), ["a", "B", "c", "d", "e", "f", "g"])
+
+        # A few items are inserted one by one.
+        mod_list.insert_many_sorted(self._make_mods(["ca"]))
+        self.assertEqual(
+            self._names(mod_list), ["a", "B", "c", "ca", "d", "e", "f", "g"]
+        )
+
+    def test_nested_iteration(self) -> None:
+        mod_list = ModList(self._get_mod)
+        mod_list.insert_many_sorted(self._make_mods(["a", "b"]))
+
+        pairs = [(first, second) for first in mod_list for second in mod_list]
+
+        self.assertEqual(len(pairs), 4)
+        self.assertEqual(pairs[1], (self.mods[0], self.mods[1]))
+
+    def test_append_and_remove_many(self) -> None:
+        mod_list = ModList(self._get_mod)
+        mods = self._make_mods(["a", "b", "c", "d", "e"])
+        inserted_row_counts: List[int] = []
+        mod_list.model.rowsInserted.connect(
+            lambda parent, first, last: inserted_row_counts.append(last - first + 1)
+        )
+
+        mod_list.append_many(mods)
+        self.assertEqual(inserted_row_counts, [5])
+
+        signals: List[str] = []
+        mod_list.model.rowsRemoved.connect(
+            lambda parent, first, last: signals.append(f"removed {first}-{last}")
+        )
+        mod_list.model.modelReset.connect(lambda: signals.append("reset"))
+        mod_list.remove_many([mods[0], mods[1], mods[3], Mod()])
+        self.assertEqual(self._names(mod_list), ["c", "e"])
+        self.assertEqual(signals, ["removed 3-3", "removed 0-1"])
+        self.assertNotIn(mods[0], mod_list)
+
+        # Mods scattered over too many runs are removed with one reset.
+        signals.clear()
+        mod_list.append_many(mods[:2])
+        mod_list.model.MAX_REMOVED_RUNS = 1
+        mod_list.remove_many([mods[2], mods[0]])
+        self.assertEqual(self._names(mod_list), ["e", "b"])
+        self.assertEqual(signals, ["reset"])
+
+    def test_move_many_to(self) -> None:
+        mod_list = ModList(self._get_mod)
+        other = ModList(self._get_mod)
+        mods = self._make_mods(["a", "b", "c", "d", "e"])
+        mod_list.append_many(mods[:4])
+        other.append(mods[4])
+
+        mod_list.move_many_to([mods[3], mods[0], mods[1]], other, 0)
+        self.assertEqual(self._names(mod_list), ["c"])
+        self.assertEqual(self._names(other), ["a", "b", "d", "e"])
+
+        other.move_many_to([mods[4], mods[0]], mod_list)
+        self.assertEqual(self._names(mod_list), ["c", "a", "e"])
+
+    def test_batch(self) -> None:
+        mod_list = ModList(self._get_mod)
+        mods = self._make_mods(["a", "b", "c"])
+        mod_list.append_many(mods)
+        signals: List[str] = []
+        mod_list.model.rowsInserted.connect(lambda: signals.append("inserted"))
+        mod_list.model.rowsRemoved.connect(lambda: signals.append("removed"))
+        mod_list.model.rowsMoved.connect(lambda: signals.append("moved"))
+        mod_list.model.modelReset.connect(lambda: signals.append("reset"))
+
+        with mod_list.batch():
+            mod_list.remove(0)
+            mod_list.append(mods[0])
+            self.assertTrue(mod_list.move(0, 1, 3))
+            self.assertFalse(mod_list.move(0, 1, 1))
+            self.assertFalse(mod_list.proxy_model.dynamicSortFilter())
+
+        self.assertEqual(signals, ["reset"])
+        self.assertEqual(self._names(mod_list), ["c", "a", "b"])
+        self.assertEqual(mod_list.proxy_model.rowCount(), 3)
+        self.assertTrue(mod_list.proxy_model.dynamicSortFilter())
@@ -0,0 +1,143 @@
+import json
+from typing import Dict, List
+from unittest import TestCase
+
+from PySide6.QtCore import QMimeData, QModelIndex, QPersistentModelIndex, Qt
+
+from models.mod import Mod
+from models.mod_list_model import ModListModel, ModListProxyModel
+
+
+class TestModListModel(TestCase):
+    def setUp(self) -> None:
+        self.mods: Dict[int, Mod] = {}
+        self.model = self._make_model(["a", "b", "c", "d", "e"])
+
+    def _make_model(self, names: List[str]) -> ModListModel:
+        model = ModListModel(self.mods.get)
+        mods = [Mod(name=name) for name in names]
+        for handle, mod in enumerate(mods, start=len(self.mods)):
+            mod.handle = handle
+        self.mods.update((mod.handle, mod) for mod in mods)
+        model.insert_handles(0, [mod.handle for mod in mods])
+        return model
+
+    @staticmethod
+    def _names(model: ModListModel) -> List[str]:
+        return [model.index(row).data() for row in range(model.rowCount())]
+
+    def test_data(self) -> None:
+        index = self.model.index(1)
+        self.assertEqual(index.data(Qt.ItemDataRole.DisplayRole), "b")
+        handle = index.data(Qt.ItemDataRole.UserRole)
+        self.assertEqual(self.mods[handle].name, "b")
+        self.assertEqual(self.model.row_of(handle), 1)
+        self.assertTrue(self.model.contains(handle))
+
+        self.mods[handle].name = "renamed"
+        self.assertEqual(index.data(), "renamed")
+
+    def test_move_rows(self) -> None:
+        persistent_index = QPersistentModelIndex(self.model.index(0))
+
+        self.assertTrue(self.model.moveRows(QModelIndex(), 0, 2, QModelIndex(), 4))
+        self.assertEqual(self._names(self.model), ["c", "d", "a", "b", "e"])
+        self.assertEqual(persistent_index.row(), 2)
+
+        self.assertTrue(self.model.moveRows(QModelIndex(), 4, 1, QModelIndex(), 0))
+        self.assertEqual(self._names(self.model), ["e", "c", "d", "a", "b"])
+
+        # Moving rows onto themselves is refused.
+        self.assertFalse(self.model.moveRows(QModelIndex(), 1, 2, QModelIndex(), 2))
+
+    def test_move_handles(self) -> None:
+        handles = list(self.model.handles)
+
+        self.model.move_handles([handles[4], handles[0]], 2)
+
+        self.assertEqual(self._names(self.model), ["b", "e", "a", "c", "d"])
+
+        # Down the list, onto the end, and to where the mods already are.
+        self.model.move_handles([handles[1], handles[3]], 5)
+        self.assertEqual(self._names(self.model), ["e", "a", "c", "b", "d"])
+        self.model.move_handles([handles[4], handles[0]], 0)
+        self.assertEqual(self._names(self.model), ["e", "a", "c", "b", "d"])
+
+    def test_row_of(self) -> None:
+        def assert_rows() -> None:
+            for row, handle in enumerate(self.model.handles):
+                self.assertEqual(self.model.row_of(handle), row)
+
+        handles = list(self.model.handles)
+        assert_rows()
+        self.model.moveRows(QModelIndex(), 0, 2, QModelIndex(), 4)
+        assert_rows()
+        self.model.removeRows(1, 1)
+        assert_rows()
+        self.assertEqual(self.model.row_of(handles[3]), -1)
+        self.model.insert_handles(0, [handles[3]])
+        assert_rows()
+        self.model.set_handle(0, 100)
+        assert_rows()
+        self.assertEqual(self.model.row_of(handles[3]), -1)
+        self.model.sort_by(lambda mod: mod.name if mod else "", reverse=True)
+        assert_rows()
+        self.model.remove_handles([handles[0]])
+        assert_rows()
+
+    def test_proxy_move_rows(self) -> None:
+        proxy_model = ModListProxyModel()
+        proxy_model.setSourceModel(self.model)
+        proxy_model.setFilterRegularExpression("^(a|c|e)$")
+
+        self.assertTrue(proxy_model.moveRows(QModelIndex(), 2, 1, QModelIndex(), 1))
+        self.assertEqual(self._names(self.model), ["a", "b", "e", "c", "d"])
+
+        # "a" and "e" are next to each other here, but not in the source model.
+        self.assertFalse(proxy_model.moveRows(QModelIndex(), 0, 2, QModelIndex(), 3))
+
+        self.assertTrue(proxy_model.moveRows(QModelIndex(), 0, 1, QModelIndex(), 3))
+        self.assertEqual(self._names(self.model), ["b", "e", "c", "a", "d"])
+
+    def test_drag_between_models(self) -> None:
+        other_model = self._make_model(["x", "y"])
+        mime_data = self.model.mimeData([self.model.index(3), self.model.index(1)])
+
+        self.assertTrue(
+            other_model.dropMimeData(
+                mime_data, Qt.DropAction.MoveAction, 1, 0, QModelIndex()
+            )
+        )
+        self.assertEqual(self._names(other_model), ["x", "b", "d", "y"])
+
+        # Dropping mods into the list they are already in moves them there, and
+        # reports failure so that the view does not remove them.
+        self.assertFalse(
+            other_model.dropMimeData(
+                mime_data, Qt.DropAction.MoveAction, 0, 0, QModelIndex()
+            )
+        )
+        self.assertEqual(self._names(other_model), ["b", "d", "x", "y"])
+
+    def test_drop_from_another_process(self) -> None:
+        mime_data = QMimeData()
+        mime_data.setData(
+            ModListModel.MIME_TYPE, json.dumps({"pid": -1, "handles": [0]}).encode()
+        )
+
+        self.assertFalse(
+            self.model.dropMimeData(
+                mime_data, Qt.DropAction.MoveAction, 0, 0, QModelIndex()
+            )
+        )
+        self.assertEqual(self.model.rowCount(), 5)
+
+    def test_sort_by(self) -> None:
+        model = self._make_model(["c", "a", "b"])
+        persistent_index = QPersistentModelIndex(model.index(0))
+
+        model.sort_by(lambda mod: mod.name if mod is not None else "", reverse=False)
+
+        self.assertEqual(self._names(model), ["a", "b", "c"])
+        self.assertEqual(persistent_index.data(), "c")
+        self.assertEqual(persistent_index.row(), 2)
@@ -0,0 +1,119 @@
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from utilities.mod_load_folders import (
+    LoadFolder,
+    content_folders,
+    game_version_key,
+    resolve_load_folders,
+)
+
+LOAD_FOLDERS_XML = """<?xml version="1.0" encoding="utf-8"?>
+<loadFolders>
+  <v1.4>
+    <li>/</li>
+    <li>1.4</li>
+  </v1.4>
+  <v1.5>
+    <li>/</li>
+    <li>1.5</li>
+    <li IfModActive="Ludeon.RimWorld.Biotech, other.mod">Biotech</li>
+    <li IfModNotActive="conflicting.mod">Standalone</li>
+  </v1.5>
+</loadFolders>
+"""
+
+
+class TestModLoadFolders(TestCase):
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.mod_path = Path(self._temp_dir.name)
+
+    def tearDown(self) -> None:
+        self._temp_dir.cleanup()
+
+    def test_game_version_key(self) -> None:
+        self.assertEqual(game_version_key("1.5.4104 rev435"), (1, 5))
+        self.assertEqual(game_version_key("v1.4"), (1, 4))
+        self.assertEqual(game_version_key("1.10"), (1, 10))
+        self.assertIsNone(game_version_key("Common"))
+        self.assertIsNone(game_version_key(""))
+
+    def test_resolve_without_load_folders_xml(self) -> None:
+        sub_folder_names = ["About", "Common", "1.3", "1.4", "1.6", "Textures"]
+
+        self.assertEqual(
+            resolve_load_folders(self.mod_path, "1.5.4104 rev435", sub_folder_names),
+            [
+                LoadFolder(self.mod_path),
+                LoadFolder(self.mod_path / "Common"),
+                LoadFolder(self.mod_path / "1.4"),
+            ],
+        )
+        # An unknown game version picks the newest version folder.
+        self.assertEqual(
+            resolve_load_folders(self.mod_path, "", sub_folder_names)[-1],
+            LoadFolder(self.mod_path / "1.6"),
+        )
+        self.assertEqual(
+            resolve_load_folders(self.mod_path, "1.5", ["About"]),
+            [LoadFolder(self.mod_path)],
+        )
+
+    def test_resolve_with_load_folders_xml(self) -> None:
+        load_folders_xml_path = self.mod_path / "LoadFolders.xml"
+        load_folders_xml_path.write_text(LOAD_FOLDERS_XML)
+
+        load_folders = resolve_load_folders(
+            self.mod_path, "1.5.4104 rev435", ["1.5"], load_folders_xml_path
+        )
+        self.assertEqual(
+            load_folders,
+            [
+                LoadFolder(self.mod_path),
+                LoadFolder(self.mod_path / "1.5"),
+                LoadFolder(
+                    self.mod_path / "Biotech",
+                    if_mod_active=("ludeon.rimworld.biotech", "other.mod"),
+                ),
+                LoadFolder(
+                    self.mod_path / "Standalone", if_mod_not_active=("conflicting.mod",)
+                ),
+            ],
+        )
+
+        # A newer game version uses the newest listed version.
+        self.assertEqual(
+            resolve_load_folders(self.mod_path, "1.6", [], load_folders_xml_path),
+            load_folders,
+        )
+        # A game version older than any listed falls back to the default layout.
+        self.assertEqual(
+            resolve_load_folders(self.mod_path, "1.3", ["1.3"], load_folders_xml_path),
+            [LoadFolder(self.mod_path), LoadFolder(self.mod_path / "1.3")],
+        )
+
+    def test_content_folders(self) -> None:
+        for folder in ["Defs", "1.5/Defs", "Biotech/Defs", "Standalone/Defs"]:
+            (self.mod_path / folder).mkdir(parents=True)
+        load_folders_xml_path = self.mod_path / "LoadFolders.xml"
+        load_folders_xml_path.write_text(LOAD_FOLDERS_XML)
+        load_folders = resolve_load_folders(
+            self.mod_path, "1.5", ["1.5"], load_folders_xml_path
+        )
+
+        self.assertEqual(
+            content_folders(load_folders, "Defs"),
+            [
+                self.mod_path / "Defs",
+                self.mod_path / "1.5" / "Defs",
+                self.mod_path / "Biotech" / "Defs",
+                self.mod_path / "Standalone" / "Defs",
+            ],
+        )
+        self.assertEqual(
+            content_folders(load_folders, "Defs", {"conflicting.mod"}),
+            [self.mod_path / "Defs", self.mod_path / "1.5" / "Defs"],
+        )
+        self.assertEqual(content_folders(load_folders, "Patches"), [])
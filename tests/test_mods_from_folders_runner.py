@@ -0,0 +1,197 @@
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, List
+from unittest import TestCase
+from unittest.mock import patch
+
+from runners import mods_from_folders_runner
+from runners.mods_from_folders_runner import ModsFromFoldersRunner
+from utilities.mod_folder_parser import parse_mod_folder
+from utilities.mod_folder_walker import ModFolderEntry, ModFolderWalker
+from utilities.mod_load_folders import LoadFolder
+
+
+class TestModsFromFoldersRunner(TestCase):
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.mods_folder = Path(self._temp_dir.name)
+
+    def tearDown(self) -> None:
+        self._temp_dir.cleanup()
+
+    def _walk_mod(self, mod_folder: Path) -> ModFolderEntry:
+        return next(
+            mod_folder_entry
+            for mod_folder_entry in ModFolderWalker().walk([self.mods_folder])
+            if mod_folder_entry.path == mod_folder
+        )
+
+    def _make_mod(self, folder_name: str, about_xml: str) -> Path:
+        about_folder = self.mods_folder / folder_name / "About"
+        about_folder.mkdir(parents=True)
+        (about_folder / "About.xml").write_text(about_xml)
+        return about_folder.parent
+
+    def test_parse_mod_folder(self) -> None:
+        mod_folder = self._make_mod(
+            "test",
+            "<ModMetaData><name>Test</name><packageId>test.mod</packageId>"
+            "<supportedVersions><li>1.4</li><li>1.5</li></supportedVersions>"
+            "<description>A test mod.</description></ModMetaData>",
+        )
+        mod_data, parse_failed = parse_mod_folder(self._walk_mod(mod_folder))
+        self.assertFalse(parse_failed)
+        self.assertEqual(mod_data["name"], "Test")
+        self.assertEqual(mod_data["package_id"], "test.mod")
+        self.assertEqual(mod_data["supported_versions"], ["1.4", "1.5"])
+        self.assertEqual(mod_data["description"], "A test mod.")
+        self.assertEqual(mod_data["preview_image_path"], Path(""))
+        self.assertEqual(mod_data["about_xml_path"], mod_folder / "About" / "About.xml")
+        self.assertEqual(mod_data["load_folders"], [LoadFolder(mod_folder)])
+
+    def test_parse_mod_folder_syntax_error(self) -> None:
+        mod_folder = self._make_mod("broken", "<ModMetaData><name>")
+        mod_data, parse_failed = parse_mod_folder(self._walk_mod(mod_folder))
+        self.assertTrue(parse_failed)
+        self.assertEqual(mod_data["name"], "")
+
+    def test_run(self) -> None:
+        self._make_mod("a", "<ModMetaData><packageId>a</packageId></ModMetaData>")
+        self._make_mod("b", "<ModMetaData><packageId>b</packageId></ModMetaData>")
+        (self.mods_folder / "not_a_mod").mkdir()
+
+        emitted: List[Any] = []
+        runner = ModsFromFoldersRunner([self.mods_folder, None])
+        runner.signals.data_ready.connect(emitted.append)
+        runner.run()
+
+        self.assertEqual(len(emitted), 1)
+        self.assertEqual(
+            sorted(mod_data["package_id"] for mod_data in emitted[0]), ["a", "b"]
+        )
+
+    def test_run_in_process_pool(self) -> None:
+        for index in range(6):
+            self._make_mod(
+                f"mod{index}",
+                f"<ModMetaData><name>Mod {index}</name>"
+                f"<packageId>mod{index}</packageId></ModMetaData>",
+            )
+        self._make_mod("broken", "<ModMetaData><name>")
+
+        def run(worker_count: int) -> List[Any]:
+            emitted: List[Any] = []
+            runner = ModsFromFoldersRunner([self.mods_folder], worker_count)
+            runner.signals.data_ready.connect(emitted.append)
+            runner.run()
+            return emitted[0]
+
+        serial = run(1)
+        # Fan out however few mod folders there are.
+        with patch.object(mods_from_folders_runner, "MIN_MOD_FOLDERS_PER_WORKER", 1):
+            parallel = run(2)
+        self.assertEqual(len(serial), 7)
+        self.assertEqual(parallel, serial)
+
+    def test_run_with_cache(self) -> None:
+        mod_folder = self._make_mod(
+            "a", "<ModMetaData><packageId>a</packageId></ModMetaData>"
+        )
+        cache_file = self.mods_folder / "scan_cache.json"
+
+        first_run: List[Any] = []
+        runner = ModsFromFoldersRunner([self.mods_folder], cache_file=cache_file)
+        runner.signals.data_ready.connect(first_run.append)
+        runner.run()
+        self.assertTrue(cache_file.exists())
+
+        # Same size and modification time, so the cached values must be used.
+        about_xml_path = mod_folder / "About" / "About.xml"
+        stat_result = about_xml_path.stat()
+        about_xml_path.write_text("<ModMetaData><packageId>b</packageId></ModMetaData>")
+        os.utime(about_xml_path, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns))
+
+        second_run: List[Any] = []
+        runner = ModsFromFoldersRunner([self.mods_folder], cache_file=cache_file)
+        runner.signals.data_ready.connect(second_run.append)
+        runner.run()
+        self.assertEqual(second_run, first_run)
+
+    def test_run_with_cache_load_folders(self) -> None:
+        mod_folder = self._make_mod(
+            "a", "<ModMetaData><packageId>a</packageId></ModMetaData>"
+        )
+        cache_file = self.mods_folder / "scan_cache.json"
+
+        def run(game_version: str) -> List[Any]:
+            emitted: List[Any] = []
+            runner = ModsFromFoldersRunner(
+                [self.mods_folder], cache_file=cache_file, game_version=game_version
+            )
+            runner.signals.data_ready.connect(emitted.append)
+            runner.run()
+            return emitted[0][0]["load_folders"]
+
+        self.assertEqual(run("1.5"), [LoadFolder(mod_folder)])
+        # A new version folder, and a different game version, are picked up even
+        # though About.xml did not change.
+        (mod_folder / "1.4").mkdir()
+        self.assertEqual(
+            run("1.5"), [LoadFolder(mod_folder), LoadFolder(mod_folder / "1.4")]
+        )
+        self.assertEqual(run("1.3"), [LoadFolder(mod_folder)])
+        self.assertEqual(
+            run("1.5"), [LoadFolder(mod_folder), LoadFolder(mod_folder / "1.4")]
+        )
+
+    def test_run_in_chunks(self) -> None:
+        for index in range(7):
+            self._make_mod(
+                f"mod{index}",
+                f"<ModMetaData><packageId>mod{index}</packageId></ModMetaData>",
+            )
+
+        chunks: List[Any] = []
+        emitted: List[Any] = []
+        # Chunks are only ever full, as the interval never runs out.
+        runner = ModsFromFoldersRunner(
+            [self.mods_folder], chunk_size=3, chunk_interval_ms=60_000
+        )
+        runner.signals.data_chunk_ready.connect(chunks.append)
+        runner.signals.data_ready.connect(emitted.append)
+        runner.run()
+
+        self.assertEqual([len(chunk) for chunk in chunks], [3, 3, 1])
+        self.assertEqual(
+            [mod_data for chunk in chunks for mod_data in chunk], emitted[0]
+        )
+
+    def test_progress(self) -> None:
+        self._make_mod("a", "<ModMetaData><packageId>a</packageId></ModMetaData>")
+        self._make_mod("b", "<ModMetaData><packageId>b</packageId></ModMetaData>")
+
+        progress: List[Any] = []
+        runner = ModsFromFoldersRunner([self.mods_folder])
+        runner.signals.progress.connect(
+            lambda visited_count, total_count: progress.append(
+                (visited_count, total_count)
+            )
+        )
+        runner.run()
+        self.assertEqual(progress[0], (0, 2))
+        self.assertEqual(progress[-1], (2, 2))
+
+    def test_cancel(self) -> None:
+        self._make_mod("a", "<ModMetaData><packageId>a</packageId></ModMetaData>")
+
+        emitted: List[Any] = []
+        cancelled: List[bool] = []
+        runner = ModsFromFoldersRunner([self.mods_folder])
+        runner.signals.data_ready.connect(emitted.append)
+        runner.signals.cancelled.connect(lambda: cancelled.append(True))
+        runner.cancel()
+        runner.run()
+        self.assertTrue(runner.is_cancelled)
+        self.assertEqual(emitted, [])
+        self.assertEqual(cancelled, [True])
@@ -0,0 +1,123 @@
+import tempfile
+from pathlib import Path
+from typing import Any, List
+from unittest import TestCase
+
+from models.patch_cost_report import PatchCostReport
+from runners.patch_cost_runner import PatchCostRunner
+from utilities.mod_load_folders import LoadFolder
+from utilities.patch_cost_analyzer import (
+    EXPENSIVE_XPATH_COST,
+    analyze_patch_file,
+    xpath_cost,
+)
+
+PATCH_XML = """<?xml version="1.0" encoding="utf-8"?>
+<Patch>
+  <Operation Class="PatchOperationReplace">
+    <xpath>Defs/ThingDef[defName="Steel"]/label</xpath>
+    <value><label>iron</label></value>
+  </Operation>
+  <Operation Class="PatchOperationSequence">
+    <operations>
+      <li Class="PatchOperationAdd">
+        <xpath>//li[@Class="CompProperties_Power"]</xpath>
+        <value><li Class="CompProperties_Glower"/></value>
+      </li>
+      <li Class="PatchOperationRemove">
+        <xpath>Defs/ThingDef/comps</xpath>
+      </li>
+    </operations>
+  </Operation>
+</Patch>
+"""
+
+
+class TestPatchCostAnalyzer(TestCase):
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.mods_folder = Path(self._temp_dir.name)
+
+    def tearDown(self) -> None:
+        self._temp_dir.cleanup()
+
+    def _write(self, path: Path, text: str) -> Path:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+        return path
+
+    def test_xpath_cost(self) -> None:
+        anchored = xpath_cost('Defs/ThingDef[defName="Steel"]/statBases')
+        unanchored = xpath_cost("Defs/ThingDef/statBases")
+        descendant = xpath_cost('Defs/ThingDef[defName="Steel"]//li')
+        leading_descendant = xpath_cost('//ThingDef[defName="Steel"]')
+        string_function = xpath_cost('Defs/ThingDef[contains(defName, "Gun")]')
+
+        self.assertLess(anchored, unanchored)
+        self.assertLess(unanchored, descendant)
+        self.assertLess(descendant, leading_descendant)
+        self.assertLess(unanchored, string_function)
+        self.assertGreaterEqual(leading_descendant, EXPENSIVE_XPATH_COST)
+        # Slashes and brackets inside predicates do not split steps.
+        self.assertEqual(xpath_cost('Defs/ThingDef[defName="a/b[c]"]/label'), anchored)
+        # Abstract parents are anchored by their Name attribute.
+        self.assertEqual(
+            xpath_cost('Defs/ThingDef[@Name="BaseGun"]/statBases'), anchored
+        )
+
+    def test_analyze_patch_file(self) -> None:
+        patch_file = self._write(self.mods_folder / "Patch.xml", PATCH_XML)
+        result = analyze_patch_file(patch_file)
+
+        # The sequence and its two operations; the <li Class> in <value> is not
+        # an operation.
+        self.assertEqual(result["operation_count"], 4)
+        self.assertEqual(result["longest_sequence"], 2)
+        self.assertEqual(
+            [xpath for xpath, _ in result["expensive_xpaths"]],
+            ['//li[@Class="CompProperties_Power"]'],
+        )
+        self.assertGreater(result["cost"], EXPENSIVE_XPATH_COST)
+
+    def test_analyze_malformed_patch_file(self) -> None:
+        patch_file = self._write(self.mods_folder / "Broken.xml", "<Patch><Operation")
+        self.assertEqual(analyze_patch_file(patch_file)["operation_count"], 0)
+
+    def test_run(self) -> None:
+        cheap_mod = self.mods_folder / "cheap"
+        expensive_mod = self.mods_folder / "expensive"
+        no_patches_mod = self.mods_folder / "none"
+        self._write(
+            cheap_mod / "Patches" / "Cheap.xml",
+            '<Patch><Operation Class="PatchOperationRemove">'
+            '<xpath>Defs/ThingDef[defName="Steel"]/label</xpath>'
+            "</Operation></Patch>",
+        )
+        self._write(expensive_mod / "1.5" / "Patches" / "Patch.xml", PATCH_XML)
+        no_patches_mod.mkdir()
+        cache_file = self.mods_folder / "patch_cost_cache.json"
+
+        reports: List[Any] = []
+        for _ in range(2):
+            runner = PatchCostRunner(
+                [
+                    (cheap_mod, [LoadFolder(cheap_mod)]),
+                    (expensive_mod, [LoadFolder(expensive_mod / "1.5")]),
+                    (no_patches_mod, [LoadFolder(no_patches_mod)]),
+                ],
+                cache_file=cache_file,
+            )
+            runner.signals.data_ready.connect(reports.append)
+            runner.run()
+
+        for report in reports:
+            self.assertIsInstance(report, PatchCostReport)
+            self.assertEqual(
+                [cost.mod_path for cost in report.ranked()],
+                [expensive_mod, cheap_mod, no_patches_mod],
+            )
+            self.assertEqual(report.rank_of(cheap_mod), 2)
+            no_patches = report.get(no_patches_mod)
+            assert no_patches is not None
+            self.assertEqual(no_patches.operation_count, 0)
+        self.assertEqual(reports[0].ranked(), reports[1].ranked())
@@ -0,0 +1,65 @@
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from utilities.file_signature import file_signature
+from utilities.persistent_cache import PersistentCache
+
+
+class TestPersistentCache(TestCase):
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.cache_file = Path(self._temp_dir.name) / "cache.json"
+
+    def tearDown(self) -> None:
+        self._temp_dir.cleanup()
+
+    def test_file_signature(self) -> None:
+        source_file = Path(self._temp_dir.name) / "source.txt"
+        self.assertIsNone(file_signature(source_file))
+        source_file.write_text("12345")
+        signature = file_signature(source_file)
+        self.assertIsNotNone(signature)
+        assert signature is not None
+        self.assertEqual(signature[1], 5)
+
+    def test_get_and_put(self) -> None:
+        cache = PersistentCache(self.cache_file, version=1)
+        self.assertIsNone(cache.get("key", (1, 2)))
+        cache.put("key", (1, 2), {"name": "value"})
+        self.assertEqual(cache.get("key", (1, 2)), {"name": "value"})
+        self.assertIsNone(cache.get("key", (1, 3)))
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 2)
+
+    def test_save_and_load(self) -> None:
+        cache = PersistentCache(self.cache_file, version=1)
+        cache.put("key", (1, 2), "value")
+        cache.save()
+
+        reloaded_cache = PersistentCache(self.cache_file, version=1)
+        reloaded_cache.load()
+        self.assertEqual(reloaded_cache.get("key", (1, 2)), "value")
+
+    def test_version_mismatch(self) -> None:
+        cache = PersistentCache(self.cache_file, version=1)
+        cache.put("key", (1, 2), "value")
+        cache.save()
+
+        reloaded_cache = PersistentCache(self.cache_file, version=2)
+        reloaded_cache.load()
+        self.assertIsNone(reloaded_cache.get("key", (1, 2)))
+
+    def test_corrupt_file(self) -> None:
+        self.cache_file.write_text("{not json")
+        cache = PersistentCache(self.cache_file, version=1)
+        cache.load()
+        self.assertIsNone(cache.get("key", (1, 2)))
+
+    def test_retain(self) -> None:
+        cache = PersistentCache(self.cache_file, version=1)
+        cache.put("kept", (1, 2), "value")
+        cache.put("dropped", (1, 2), "value")
+        cache.retain(["kept"])
+        self.assertEqual(cache.get("kept", (1, 2)), "value")
+        self.assertIsNone(cache.get("dropped", (1, 2)))
@@ -0,0 +1,67 @@
+import tempfile
+from pathlib import Path
+from typing import Any, List
+from unittest import TestCase
+
+from PySide6.QtCore import QSize
+from PySide6.QtGui import QColor, QImage
+
+from models.mod import Mod
+from models.preview_image_cache import PreviewImageCache
+from runners.prefetch_runner import PrefetchRunner
+from utilities.file_signature import file_signature
+
+
+class TestPrefetchRunner(TestCase):
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.folder = Path(self._temp_dir.name)
+        self.cache = PreviewImageCache(self.folder / "cache")
+
+    def tearDown(self) -> None:
+        self._temp_dir.cleanup()
+
+    def _mod(self, name: str) -> Mod:
+        preview_image_path = self.folder / name / "Preview.png"
+        preview_image_path.parent.mkdir()
+        image = QImage(640, 360, QImage.Format.Format_RGB32)
+        image.fill(QColor("red"))
+        self.assertTrue(image.save(str(preview_image_path)))
+        return Mod(name=name, preview_image_path=preview_image_path)
+
+    def _run(self, runner: PrefetchRunner) -> List[Any]:
+        emitted: List[Any] = []
+        runner.signals.data_chunk_ready.connect(emitted.append)
+        runner.signals.cancelled.connect(lambda: emitted.append("cancelled"))
+        runner.run()
+        return emitted
+
+    def test_run(self) -> None:
+        mods = [self._mod("a"), self._mod("b"), self._mod("c")]
+        previews = []
+        for mod in mods[:2]:
+            signature = file_signature(mod.preview_image_path)
+            assert signature is not None
+            previews.append(
+                ((str(mod.preview_image_path), signature, 300), mod.preview_image_path)
+            )
+
+        emitted = self._run(PrefetchRunner(mods, previews, self.cache))
+
+        # Only the previews asked for are decoded, nearest first.
+        self.assertEqual([key for key, _ in emitted], [key for key, _ in previews])
+        self.assertEqual(emitted[0][1].size(), QSize(300, 169))
+        self.assertEqual(self.cache.misses, 2)
+
+    def test_cancel(self) -> None:
+        mod = self._mod("a")
+        signature = file_signature(mod.preview_image_path)
+        assert signature is not None
+        runner = PrefetchRunner(
+            [mod],
+            [((str(mod.preview_image_path), signature, 300), mod.preview_image_path)],
+            self.cache,
+        )
+        runner.cancel()
+        self.assertEqual(self._run(runner), ["cancelled"])
+        self.assertEqual(self.cache.misses, 0)
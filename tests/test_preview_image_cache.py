@@ -0,0 +1,70 @@
+import os
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from PySide6.QtCore import QSize
+from PySide6.QtGui import QColor, QImage
+
+from models.preview_image_cache import PreviewImageCache
+
+
+class TestPreviewImageCache(TestCase):
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.folder = Path(self._temp_dir.name)
+        self.cache = PreviewImageCache(self.folder / "cache")
+
+    def tearDown(self) -> None:
+        self._temp_dir.cleanup()
+
+    def _write_preview(self, width: int, height: int, color: str) -> Path:
+        preview_image_path = self.folder / "Preview.png"
+        image = QImage(width, height, QImage.Format.Format_RGB32)
+        image.fill(QColor(color))
+        self.assertTrue(image.save(str(preview_image_path)))
+        return preview_image_path
+
+    def test_bucket_width(self) -> None:
+        self.assertEqual(PreviewImageCache.bucket_width(100), 160)
+        self.assertEqual(PreviewImageCache.bucket_width(320), 320)
+        self.assertEqual(PreviewImageCache.bucket_width(470), 480)
+        self.assertEqual(PreviewImageCache.bucket_width(10000), 1920)
+
+    def test_get(self) -> None:
+        preview_image_path = self._write_preview(640, 360, "red")
+
+        image = self.cache.get(preview_image_path, 300)
+        self.assertEqual(image.size(), QSize(320, 180))
+        self.assertEqual(image.pixelColor(0, 0), QColor("red"))
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 1))
+
+        # Any width in the same bucket is served from the cache.
+        self.assertEqual(self.cache.get(preview_image_path, 310).size(), image.size())
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+        # Images are never scaled up.
+        self.assertEqual(
+            self.cache.get(preview_image_path, 1000).size(), QSize(640, 360)
+        )
+
+        # A changed preview is decoded again.
+        self._write_preview(640, 360, "blue")
+        stat_result = preview_image_path.stat()
+        os.utime(
+            preview_image_path,
+            ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 10**9),
+        )
+        image = self.cache.get(preview_image_path, 300)
+        self.assertEqual(image.pixelColor(0, 0), QColor("blue"))
+        self.assertEqual(self.cache.misses, 3)
+
+        self.assertTrue(self.cache.get(self.folder / "missing.png", 300).isNull())
+
+    def test_oversized_images(self) -> None:
+        preview_image_path = self._write_preview(3840, 2160, "green")
+
+        image = self.cache.get(preview_image_path, 470)
+
+        self.assertEqual(image.size(), QSize(480, 270))
+        self.assertEqual(self.cache.oversized_images, [preview_image_path])
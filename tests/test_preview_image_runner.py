@@ -0,0 +1,51 @@
+import tempfile
+from pathlib import Path
+from typing import Any, List
+from unittest import TestCase
+
+from PySide6.QtCore import QSize
+from PySide6.QtGui import QColor, QImage
+
+from models.preview_image_cache import PreviewImageCache
+from runners.preview_image_runner import PreviewImageRunner
+
+
+class TestPreviewImageRunner(TestCase):
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.folder = Path(self._temp_dir.name)
+        self.cache = PreviewImageCache(self.folder / "cache")
+        self.preview_image_path = self.folder / "Preview.png"
+        image = QImage(640, 360, QImage.Format.Format_RGB32)
+        image.fill(QColor("red"))
+        self.assertTrue(image.save(str(self.preview_image_path)))
+
+    def tearDown(self) -> None:
+        self._temp_dir.cleanup()
+
+    def _run(self, runner: PreviewImageRunner) -> List[Any]:
+        emitted: List[Any] = []
+        runner.signals.data_ready.connect(emitted.append)
+        runner.signals.cancelled.connect(lambda: emitted.append("cancelled"))
+        runner.run()
+        return emitted
+
+    def test_run(self) -> None:
+        emitted = self._run(
+            PreviewImageRunner(self.preview_image_path, 300, self.cache)
+        )
+        self.assertEqual(len(emitted), 1)
+        self.assertEqual(emitted[0].size(), QSize(300, 169))
+        self.assertEqual(self.cache.misses, 1)
+
+        emitted = self._run(
+            PreviewImageRunner(self.folder / "missing.png", 300, self.cache)
+        )
+        self.assertTrue(emitted[0].isNull())
+
+    def test_cancel(self) -> None:
+        runner = PreviewImageRunner(self.preview_image_path, 300, self.cache)
+        runner.cancel()
+        self.assertEqual(self._run(runner), ["cancelled"])
+        # A request cancelled before it ran does not decode anything.
+        self.assertEqual(self.cache.misses, 0)
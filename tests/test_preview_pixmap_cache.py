@@ -0,0 +1,63 @@
+from unittest import TestCase
+
+from PySide6.QtGui import QGuiApplication, QPixmap
+
+from models.preview_pixmap_cache import (
+    PreviewPixmapCache,
+    PreviewPixmapKey,
+    pixmap_byte_count,
+)
+
+
+class TestPreviewPixmapCache(TestCase):
+    app = None
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        # Pixmaps need a GUI application.
+        if QGuiApplication.instance() is None:
+            cls.app = QGuiApplication([])
+
+    def setUp(self) -> None:
+        self.pixmap = QPixmap(100, 50)
+        self.byte_count = pixmap_byte_count(self.pixmap)
+        self.cache = PreviewPixmapCache(3 * self.byte_count)
+
+    @staticmethod
+    def _key(name: str) -> PreviewPixmapKey:
+        return (name, (0, 0), 100)
+
+    def test_put_and_get(self) -> None:
+        self.assertIsNone(self.cache.get(self._key("a")))
+        self.cache.put(self._key("a"), self.pixmap)
+        self.assertIs(self.cache.get(self._key("a")), self.pixmap)
+        self.assertIsNone(self.cache.get(("a", (1, 0), 100)))
+        self.assertIsNone(self.cache.get(("a", (0, 0), 200)))
+
+        # Putting a pixmap again does not count it twice.
+        self.cache.put(self._key("a"), self.pixmap)
+        self.assertEqual(self.cache.byte_count, self.byte_count)
+
+        self.cache.clear()
+        self.assertEqual((len(self.cache), self.cache.byte_count), (0, 0))
+
+    def test_byte_budget(self) -> None:
+        for name in "abc":
+            self.cache.put(self._key(name), self.pixmap)
+        self.cache.get(self._key("a"))
+        # The least recently used pixmap makes room.
+        self.cache.put(self._key("d"), self.pixmap)
+        self.assertIsNone(self.cache.get(self._key("b")))
+        self.assertEqual(len(self.cache), 3)
+        self.assertEqual(self.cache.byte_count, 3 * self.byte_count)
+
+        self.cache.byte_budget = self.byte_count
+        self.assertEqual(len(self.cache), 1)
+        self.assertIsNotNone(self.cache.get(self._key("d")))
+
+        # Pixmaps larger than the budget are not kept.
+        self.cache.put(self._key("e"), QPixmap(200, 50))
+        self.assertIsNone(self.cache.get(self._key("e")))
+
+        self.cache.byte_budget = 0
+        self.assertEqual((len(self.cache), self.cache.byte_count), (0, 0))
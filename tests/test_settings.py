@@ -19,6 +19,8 @@ class TestSettings(TestCase):
         self.settings.local_mods_folder_location = Path("non-default value")
         self.settings.sorting_algorithm = Settings.SortingAlgorithm.TOPOLOGICAL
         self.settings.debug_logging = True
+        self.settings.scan_worker_count = 4
+        self.settings.preview_memory_budget = 256
         self.settings.apply_default_settings()
         self.assertEqual(self.settings.game_location, None)
         self.assertEqual(self.settings.config_folder_location, None)
@@ -28,6 +30,8 @@ class TestSettings(TestCase):
             self.settings.sorting_algorithm, Settings.SortingAlgorithm.ALPHABETICAL
         )
         self.assertEqual(self.settings.debug_logging, False)
+        self.assertEqual(self.settings.scan_worker_count, 0)
+        self.assertEqual(self.settings.preview_memory_budget, 64)
 
     def test_game_folder(self) -> None:
         self.settings.game_location = Path("test path")
@@ -55,6 +59,14 @@ class TestSettings(TestCase):
         self.settings.debug_logging = True
         self.assertEqual(self.settings.debug_logging, True)
 
+    def test_scan_worker_count(self) -> None:
+        self.settings.scan_worker_count = 4
+        self.assertEqual(self.settings.scan_worker_count, 4)
+
+    def test_preview_memory_budget(self) -> None:
+        self.settings.preview_memory_budget = 256
+        self.assertEqual(self.settings.preview_memory_budget, 256)
+
     def test_save(self) -> None:
         m = mock_open()
         with patch("builtins.open", m):
@@ -69,6 +81,8 @@ class TestSettings(TestCase):
             "local_mods_folder_location": "/mock_local_mods_folder_location",
             "sorting_algorithm": "ALPHABETICAL",
             "debug_logging": False,
+            "scan_worker_count": 2,
+            "preview_memory_budget": 128,
         }
         m = mock_open(read_data=json.dumps(mock_data))
         with patch("builtins.open", m):
@@ -91,3 +105,5 @@ class TestSettings(TestCase):
             self.settings.sorting_algorithm, Settings.SortingAlgorithm.ALPHABETICAL
         )
         self.assertEqual(self.settings.debug_logging, False)
+        self.assertEqual(self.settings.scan_worker_count, 2)
+        self.assertEqual(self.settings.preview_memory_budget, 128)
@@ -0,0 +1,104 @@
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+from unittest import TestCase
+
+from PySide6.QtGui import QColor, QImage
+
+from models.thumbnail_atlas import THUMBNAIL_SIZE, ThumbnailAtlas
+from runners.thumbnail_atlas_runner import ThumbnailAtlasRunner, render_thumbnail
+
+
+class TestThumbnailAtlasRunner(TestCase):
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.folder = Path(self._temp_dir.name)
+        self.atlas_file = self.folder / "thumbnail_atlas.bin"
+        self.index_file = self.folder / "thumbnail_atlas_index.json"
+        self.atlas = ThumbnailAtlas(self.atlas_file)
+
+    def tearDown(self) -> None:
+        self.atlas.close()
+        self._temp_dir.cleanup()
+
+    def _write_preview(self, name: str, color: QColor) -> Path:
+        preview_image_path = self.folder / name / "Preview.png"
+        preview_image_path.parent.mkdir(exist_ok=True)
+        image = QImage(640, 360, QImage.Format.Format_RGB32)
+        image.fill(color)
+        self.assertTrue(image.save(str(preview_image_path)))
+        return preview_image_path
+
+    def _run(self, previews: List[Tuple[int, Path]]) -> Dict[int, int]:
+        emitted: List[Any] = []
+        runner = ThumbnailAtlasRunner(previews, self.atlas_file, self.index_file)
+        runner.signals.data_ready.connect(emitted.append)
+        runner.run()
+        self.assertEqual(len(emitted), 1)
+        self.atlas.set_slots(emitted[0])
+        return emitted[0]
+
+    def _center_color(self, handle: int) -> QColor:
+        thumbnail = self.atlas.get(handle)
+        assert thumbnail is not None
+        return thumbnail.pixelColor(THUMBNAIL_SIZE // 2, THUMBNAIL_SIZE // 2)
+
+    def test_render_thumbnail(self) -> None:
+        thumbnail = render_thumbnail(self._write_preview("a", QColor("red")))
+        assert thumbnail is not None
+        self.assertEqual(thumbnail.width(), THUMBNAIL_SIZE)
+        self.assertEqual(thumbnail.height(), THUMBNAIL_SIZE)
+        # Wide previews are letterboxed.
+        self.assertEqual(thumbnail.pixelColor(0, 0).alpha(), 0)
+        self.assertEqual(thumbnail.pixelColor(16, 16), QColor("red"))
+
+        self.assertIsNone(render_thumbnail(self.folder / "missing.png"))
+
+    def test_run(self) -> None:
+        red = self._write_preview("red", QColor("red"))
+        blue = self._write_preview("blue", QColor("blue"))
+        broken = self.folder / "broken.png"
+        broken.write_bytes(b"not an image")
+
+        slots = self._run([(0, red), (1, blue), (2, broken), (3, self.folder / "x")])
+        self.assertEqual(sorted(slots), [0, 1])
+        self.assertEqual(self._center_color(0), QColor("red"))
+        self.assertEqual(self._center_color(1), QColor("blue"))
+        self.assertIsNone(self.atlas.get(2))
+        self.assertEqual(len(self.atlas), 2)
+
+        # Unchanged previews keep their slots, whatever the mods' handles.
+        self.assertEqual(self._run([(5, blue), (4, red)]), {4: slots[0], 5: slots[1]})
+
+        # A changed preview goes to a new slot, as the old one may be in use.
+        self._write_preview("red", QColor("green"))
+        stat_result = red.stat()
+        os.utime(red, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 10**9))
+        new_slots = self._run([(4, red), (5, blue)])
+        self.assertNotIn(new_slots[4], slots.values())
+        self.assertEqual(self._center_color(4), QColor("green"))
+
+        # Its old slot is free again on the next run.
+        third = self._write_preview("third", QColor("yellow"))
+        self.assertEqual(self._run([(4, red), (5, blue), (6, third)])[6], slots[0])
+
+    def test_cancel(self) -> None:
+        red = self._write_preview("red", QColor("red"))
+        blue = self._write_preview("blue", QColor("blue"))
+        slots = self._run([(0, red)])
+        index = self.index_file.read_bytes()
+
+        emitted: List[Any] = []
+        runner = ThumbnailAtlasRunner(
+            [(0, red), (1, blue)], self.atlas_file, self.index_file
+        )
+        runner.signals.data_ready.connect(emitted.append)
+        runner.signals.cancelled.connect(lambda: emitted.append("cancelled"))
+        runner.cancel()
+        runner.run()
+
+        # The index is left as the last finished run wrote it.
+        self.assertEqual(emitted, ["cancelled"])
+        self.assertEqual(self.index_file.read_bytes(), index)
+        self.assertEqual(self._run([(0, red), (1, blue)])[0], slots[0])
@@ -0,0 +1,104 @@
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, List
+from unittest import TestCase
+from unittest.mock import patch
+
+from PySide6.QtCore import QCoreApplication, QThreadPool
+from PySide6.QtGui import QColor, QGuiApplication, QImage
+
+from models.thumbnail_atlas import THUMBNAIL_SIZE, ThumbnailAtlas
+from models.thumbnail_atlas_updater import ThumbnailAtlasUpdater
+from runners.thumbnail_atlas_runner import ThumbnailAtlasRunner
+
+
+class TestThumbnailAtlasUpdater(TestCase):
+    app = None
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        # Signals from the runners are delivered through the event loop.
+        if QGuiApplication.instance() is None:
+            cls.app = QGuiApplication([])
+
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.folder = Path(self._temp_dir.name)
+        self.atlas = ThumbnailAtlas(self.folder / "thumbnail_atlas.bin")
+        self.index_file = self.folder / "thumbnail_atlas_index.json"
+        self.updater = ThumbnailAtlasUpdater(self.atlas, self.index_file)
+
+    def tearDown(self) -> None:
+        QThreadPool.globalInstance().waitForDone()
+        self.atlas.close()
+        self._temp_dir.cleanup()
+
+    def _write_preview(self, name: str, color: QColor) -> Path:
+        preview_image_path = self.folder / name / "Preview.png"
+        preview_image_path.parent.mkdir()
+        image = QImage(640, 360, QImage.Format.Format_RGB32)
+        image.fill(color)
+        self.assertTrue(image.save(str(preview_image_path)))
+        return preview_image_path
+
+    def _wait(self) -> None:
+        deadline = time.monotonic() + 10
+        while self.updater.is_updating and time.monotonic() < deadline:
+            QCoreApplication.processEvents()
+            time.sleep(0.001)
+        self.assertFalse(self.updater.is_updating)
+
+    def _center_color(self, atlas: ThumbnailAtlas, handle: int) -> QColor:
+        thumbnail = atlas.get(handle)
+        assert thumbnail is not None
+        return thumbnail.pixelColor(THUMBNAIL_SIZE // 2, THUMBNAIL_SIZE // 2)
+
+    def test_update_while_updating(self) -> None:
+        colors = [QColor.fromRgb(0x10 * i, 0, 0xFF - 0x10 * i) for i in range(12)]
+        previews = [
+            self._write_preview(str(i), color) for i, color in enumerate(colors)
+        ]
+        running_count = 0
+        max_running_count = 0
+        lock = threading.Lock()
+        run = ThumbnailAtlasRunner.run
+
+        def count_running(runner: ThumbnailAtlasRunner) -> None:
+            nonlocal running_count, max_running_count
+            with lock:
+                running_count += 1
+                max_running_count = max(max_running_count, running_count)
+            try:
+                run(runner)
+            finally:
+                with lock:
+                    running_count -= 1
+
+        updated: List[Any] = []
+        self.updater.updated.connect(lambda: updated.append(True))
+        with patch.object(ThumbnailAtlasRunner, "run", count_running):
+            # The first update is cancelled while it runs, by updates that pack
+            # other previews into the same slots.
+            self.updater.update([(i, path) for i, path in enumerate(previews[:6])])
+            self.updater.update([(i, path) for i, path in enumerate(previews[6:])])
+            self.updater.update(
+                [(i, path) for i, path in enumerate(reversed(previews))]
+            )
+            self._wait()
+
+        self.assertEqual(max_running_count, 1)
+        self.assertTrue(updated)
+        for i, color in enumerate(reversed(colors)):
+            self.assertEqual(self._center_color(self.atlas, i), color)
+
+        # The index on disk matches the atlas in later sessions too.
+        atlas = ThumbnailAtlas(self.atlas.atlas_file)
+        updater = ThumbnailAtlasUpdater(atlas, self.index_file)
+        updater.update([(i, path) for i, path in enumerate(previews)])
+        self.updater = updater
+        self._wait()
+        for i, color in enumerate(colors):
+            self.assertEqual(self._center_color(atlas, i), color)
+        atlas.close()
@@ -0,0 +1,235 @@
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from lxml import etree
+
+# The lists of package IDs in About.xml, keyed by their lower-case element name,
+# with the name of the field they are extracted to.
+_PACKAGE_ID_LISTS = {
+    "loadbefore": "load_before",
+    "loadafter": "load_after",
+    "incompatiblewith": "incompatible_with",
+    "forceloadbefore": "force_load_before",
+    "forceloadafter": "force_load_after",
+}
+
+# The same lists, per game version.
+_PACKAGE_ID_LISTS_BY_VERSION = {
+    "loadbeforebyversion": "load_before_by_version",
+    "loadafterbyversion": "load_after_by_version",
+    "incompatiblewithbyversion": "incompatible_with_by_version",
+}
+
+
+def empty_about_data() -> Dict[str, Any]:
+    """
+    :return: The fields extracted from About.xml, with their empty values.
+    :rtype: Dict[str, Any]
+    """
+    return {
+        "name": "",
+        "package_id": "",
+        "authors": [],
+        "url": "",
+        "description": "",
+        "mod_version": "",
+        "supported_versions": [],
+        "dependencies": [],
+        "dependencies_by_version": {},
+        "load_before": [],
+        "load_before_by_version": {},
+        "load_after": [],
+        "load_after_by_version": {},
+        "incompatible_with": [],
+        "incompatible_with_by_version": {},
+        "force_load_before": [],
+        "force_load_after": [],
+        "published_file_id": "",
+    }
+
+
+# The single-valued fields of About.xml, keyed by their lower-case element name,
+# with the name of the field they are extracted to.
+_TEXT_FIELDS = {
+    "name": "name",
+    "packageid": "package_id",
+    "url": "url",
+    "description": "description",
+    "modversion": "mod_version",
+}
+
+
+def _text(element: etree._Element) -> str:
+    return (element.text or "").strip()
+
+
+def _li_texts(element: etree._Element) -> List[str]:
+    """
+    :return: The non-empty texts of the <li> children of an element.
+    """
+    texts = []
+    for li in element:
+        if li.tag == "li":
+            text = _text(li)
+            if text:
+                texts.append(text)
+    return texts
+
+
+def _li_package_ids(element: etree._Element) -> List[str]:
+    """
+    :return: The non-empty <packageId> texts of the <li> children of an element.
+    """
+    package_ids = []
+    for li in element:
+        if li.tag == "li":
+            for child in li:
+                if isinstance(child.tag, str) and child.tag.lower() == "packageid":
+                    package_id = _text(child)
+                    if package_id:
+                        package_ids.append(package_id)
+    return package_ids
+
+
+def _by_version(
+    element: etree._Element, extract: Callable[[etree._Element], List[str]]
+) -> Dict[str, List[str]]:
+    """
+    :return: The lists extracted from each per-version child of an element, such
+        as <v1.4>, keyed by game version.
+    """
+    lists: Dict[str, List[str]] = {}
+    for version_element in element:
+        if not isinstance(version_element.tag, str):
+            continue
+        tag = version_element.tag
+        version = tag[1:] if tag.startswith("v") else tag
+        values = extract(version_element)
+        if values:
+            lists.setdefault(version, []).extend(values)
+    return lists
+
+
+class AboutXmlExtractor:
+    """
+    Extract a mod's metadata from its About.xml in a single pass.
+
+    One recovering parser is reused for every file. It builds the small element
+    tree in C, which is walked once, each top-level element being dispatched on
+    its name, instead of being searched with find() and xpath() per field.
+    Malformed files yield whatever could be recovered from them. The extractor
+    also reads About/PublishedFileId.txt, the Steam Workshop ID.
+
+    An extractor is not thread-safe; use extract_about_xml() to get one per
+    thread.
+    """
+
+    def __init__(self) -> None:
+        self._parser = etree.XMLParser(
+            recover=True,
+            remove_comments=True,
+            remove_pis=True,
+            resolve_entities=False,
+            no_network=True,
+        )
+
+    def extract(
+        self, about_xml_path: Path, published_file_id_path: Optional[Path] = None
+    ) -> Dict[str, Any]:
+        """
+        Extract the metadata from an About.xml file.
+
+        :param about_xml_path: The path to About.xml.
+        :type about_xml_path: Path
+        :param published_file_id_path: The path to PublishedFileId.txt, or
+            Path("") if the mod has none. By default it is looked for next to
+            About.xml.
+        :type published_file_id_path: Optional[Path]
+        :return: The fields listed in empty_about_data(), plus "parse_failed",
+            which is True if the file was not well-formed.
+        :rtype: Dict[str, Any]
+        """
+        data = empty_about_data()
+        data["parse_failed"] = True
+
+        try:
+            # libxml2 reads the file itself, which is cheaper than reading it
+            # into a Python bytes object first.
+            root = etree.parse(str(about_xml_path), self._parser).getroot()
+        except OSError:
+            return data
+        except etree.XMLSyntaxError:
+            # Raised when nothing at all could be recovered, e.g. for empty files.
+            root = None
+
+        if root is not None:
+            data["parse_failed"] = len(self._parser.error_log) > 0
+            self._extract_fields(root, data)
+
+        if published_file_id_path is None:
+            published_file_id_path = about_xml_path.parent / "PublishedFileId.txt"
+        # Path("") has no name; checking it is cheaper than comparing paths.
+        if published_file_id_path.name:
+            data["published_file_id"] = _read_published_file_id(published_file_id_path)
+        return data
+
+    def _extract_fields(self, root: etree._Element, data: Dict[str, Any]) -> None:
+        for element in root:
+            if not isinstance(element.tag, str):
+                # Entity references, which are not resolved.
+                continue
+            tag = element.tag.lower()
+
+            if tag in _TEXT_FIELDS:
+                data[_TEXT_FIELDS[tag]] = _text(element)
+            elif tag == "author":
+                data["authors"].extend(
+                    author.strip()
+                    for author in _text(element).split(",")
+                    if author.strip()
+                )
+            elif tag == "authors":
+                data["authors"].extend(_li_texts(element))
+            elif tag == "supportedversions":
+                data["supported_versions"].extend(_li_texts(element))
+            elif tag == "moddependencies":
+                data["dependencies"].extend(_li_package_ids(element))
+            elif tag == "moddependenciesbyversion":
+                data["dependencies_by_version"] = _by_version(element, _li_package_ids)
+            elif tag in _PACKAGE_ID_LISTS:
+                data[_PACKAGE_ID_LISTS[tag]].extend(_li_texts(element))
+            elif tag in _PACKAGE_ID_LISTS_BY_VERSION:
+                data[_PACKAGE_ID_LISTS_BY_VERSION[tag]] = _by_version(
+                    element, _li_texts
+                )
+
+
+def _read_published_file_id(published_file_id_path: Path) -> str:
+    try:
+        return published_file_id_path.read_text().strip()
+    except (OSError, UnicodeDecodeError):
+        return ""
+
+
+_thread_local = threading.local()
+
+
+def extract_about_xml(
+    about_xml_path: Path, published_file_id_path: Optional[Path] = None
+) -> Dict[str, Any]:
+    """
+    Extract the metadata from an About.xml file with this thread's extractor.
+
+    :param about_xml_path: The path to About.xml.
+    :type about_xml_path: Path
+    :param published_file_id_path: See AboutXmlExtractor.extract().
+    :type published_file_id_path: Optional[Path]
+    :return: See AboutXmlExtractor.extract().
+    :rtype: Dict[str, Any]
+    """
+    extractor: Optional[AboutXmlExtractor] = getattr(_thread_local, "extractor", None)
+    if extractor is None:
+        extractor = AboutXmlExtractor()
+        _thread_local.extractor = extractor
+    return extractor.extract(about_xml_path, published_file_id_path)
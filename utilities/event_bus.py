@@ -3,6 +3,11 @@ from PySide6.QtCore import QObject, Signal, Qt
 
 class EventBus(QObject):
     database_ready = Signal()
+    database_mods_added = Signal(object)
+    database_mods_updated = Signal(object)
+    database_mods_removed = Signal(object)
+    database_scan_progress = Signal(int, int)
+    database_defs_indexed = Signal()
 
     menu_bar_about_triggered = Signal()
     menu_bar_check_for_update_triggered = Signal()
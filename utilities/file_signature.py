@@ -0,0 +1,24 @@
+from pathlib import Path
+from typing import Optional, Tuple
+
+# The modification time in nanoseconds and the size in bytes of a file. Kept
+# apart from PersistentCache, so that scan worker processes can use it without
+# importing the logging setup.
+FileSignature = Tuple[int, int]
+
+
+def file_signature(path: Path) -> Optional[FileSignature]:
+    """
+    Get the modification time and size of a file.
+
+    :param path: The file to stat.
+    :type path: Path
+    :return: The (mtime in nanoseconds, size in bytes) pair, or None if the file
+        does not exist.
+    :rtype: Optional[FileSignature]
+    """
+    try:
+        stat_result = path.stat()
+    except OSError:
+        return None
+    return stat_result.st_mtime_ns, stat_result.st_size
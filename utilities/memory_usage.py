@@ -0,0 +1,44 @@
+import sys
+from types import MappingProxyType
+from typing import Iterable, List, Set
+
+
+def deep_size_of(objects: Iterable[object]) -> int:
+    """
+    Measure the memory taken by objects and everything they refer to.
+
+    Objects shared between them, such as interned strings, are counted once.
+    Containers, slotted objects and objects with a __dict__ are followed;
+    classes and functions are not.
+
+    :param objects: The objects to measure.
+    :type objects: Iterable[object]
+    :return: The size in bytes.
+    :rtype: int
+    """
+    seen_ids: Set[int] = set()
+    pending: List[object] = list(objects)
+    size = 0
+    while pending:
+        obj = pending.pop()
+        if id(obj) in seen_ids or isinstance(obj, type) or callable(obj):
+            continue
+        seen_ids.add(id(obj))
+        size += sys.getsizeof(obj)
+
+        if isinstance(obj, (str, bytes, int, float, bool)) or obj is None:
+            continue
+        if isinstance(obj, (dict, MappingProxyType)):
+            pending.extend(obj.keys())
+            pending.extend(obj.values())
+            continue
+        if isinstance(obj, (tuple, list, set, frozenset)):
+            pending.extend(obj)
+            continue
+        for cls in type(obj).__mro__:
+            for slot in getattr(cls, "__slots__", ()):
+                if hasattr(obj, slot):
+                    pending.append(getattr(obj, slot))
+        if hasattr(obj, "__dict__"):
+            pending.append(obj.__dict__)
+    return size
@@ -0,0 +1,41 @@
+from typing import Any, Dict, Tuple
+
+from utilities.about_xml_extractor import extract_about_xml
+from utilities.mod_folder_walker import ModFolderEntry
+from utilities.mod_load_folders import resolve_load_folders
+
+# Mod folders are parsed in worker processes, which import this module when
+# they start. It is kept free of Qt and of the runners, so that starting a
+# worker costs as little as possible.
+
+
+def parse_mod_folder(
+    mod_folder: ModFolderEntry, game_version: str = ""
+) -> Tuple[Dict[str, Any], bool]:
+    """
+    Read the metadata of a single mod folder, and work out its load folders.
+
+    This runs in scan worker processes, so it must stay free of Qt objects and
+    return only plain, picklable data.
+
+    :param mod_folder: The mod folder, as found by ModFolderWalker.
+    :type mod_folder: ModFolderEntry
+    :param game_version: The game version to work out the load folders for.
+    :type game_version: str
+    :return: The keyword arguments for a Mod, and whether About.xml was malformed.
+    :rtype: Tuple[Dict[str, Any], bool]
+    """
+    mod_data = extract_about_xml(
+        mod_folder.about_xml_path, mod_folder.published_file_id_path
+    )
+    parse_failed = mod_data.pop("parse_failed")
+    mod_data["preview_image_path"] = mod_folder.preview_image_path
+    mod_data["path"] = mod_folder.path
+    mod_data["about_xml_path"] = mod_folder.about_xml_path
+    mod_data["load_folders"] = resolve_load_folders(
+        mod_folder.path,
+        game_version,
+        mod_folder.sub_folder_names,
+        mod_folder.load_folders_xml_path,
+    )
+    return mod_data, parse_failed
@@ -0,0 +1,142 @@
+import os
+from pathlib import Path
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+from utilities.file_signature import FileSignature
+
+
+class ModFolderEntry(NamedTuple):
+    """
+    A mod folder found by ModFolderWalker.
+    """
+
+    path: Path
+    about_xml_path: Path
+    about_xml_signature: FileSignature
+    preview_image_path: Path
+    published_file_id_path: Path
+    # The names of the folders in the mod folder, such as About, Common and 1.5.
+    sub_folder_names: Tuple[str, ...]
+    # Path("") and None if the mod has no LoadFolders.xml.
+    load_folders_xml_path: Path
+    load_folders_xml_signature: Optional[FileSignature]
+
+
+class ModFolderWalker:
+    """
+    Find the mod folders in a list of folders with as few filesystem calls as
+    possible.
+
+    Each folder is listed once with os.scandir, and directories are recognized by
+    their directory entry type, which needs no stat call on most filesystems. Each
+    mod's folder and About folder are listed once, and LoadFolders.xml, the
+    version folders, About.xml, Preview.png and PublishedFileId.txt are looked up
+    in those listings instead of being checked one by one. The only other calls
+    are one stat of About.xml and of LoadFolders.xml, whose modification times
+    and sizes key the scan cache; on Windows the listing already carries them.
+
+    The number of filesystem calls made is counted in ``syscall_count``, which
+    matters most on network shares where every call is a round trip.
+    """
+
+    def __init__(self) -> None:
+        self.syscall_count = 0
+
+    def walk(self, folders: List[Optional[Path]]) -> Iterator[ModFolderEntry]:
+        """
+        Walk the mod folders of the given folders, in listing order.
+
+        :param folders: The folders whose sub-folders are mods. None and missing
+            folders are skipped.
+        :type folders: List[Optional[Path]]
+        :return: An iterator over the mod folders that contain About/About.xml.
+        :rtype: Iterator[ModFolderEntry]
+        """
+        for folder in folders:
+            if folder is None:
+                continue
+
+            for sub_folder_entry in self._scandir(folder):
+                if not self._is_dir(sub_folder_entry):
+                    continue
+                mod_folder = self._mod_folder_entry(Path(sub_folder_entry.path))
+                if mod_folder is not None:
+                    yield mod_folder
+
+    def walk_mod_folders(self, mod_folders: List[Path]) -> Iterator[ModFolderEntry]:
+        """
+        Walk single mod folders, such as those of mods that changed.
+
+        :param mod_folders: The mod folders. Missing folders are skipped.
+        :type mod_folders: List[Path]
+        :return: An iterator over the mod folders that contain About/About.xml.
+        :rtype: Iterator[ModFolderEntry]
+        """
+        for mod_folder_path in mod_folders:
+            mod_folder = self._mod_folder_entry(mod_folder_path)
+            if mod_folder is not None:
+                yield mod_folder
+
+    def _mod_folder_entry(self, sub_folder: Path) -> Optional[ModFolderEntry]:
+        mod_entries = {entry.name.lower(): entry for entry in self._scandir(sub_folder)}
+        about_folder_entry = mod_entries.get("about")
+        if about_folder_entry is None:
+            return None
+
+        about_entries = {
+            entry.name.lower(): entry
+            for entry in self._scandir(Path(about_folder_entry.path))
+        }
+        about_xml_entry = about_entries.get("about.xml")
+        if about_xml_entry is None:
+            return None
+        about_xml_signature = self._signature(about_xml_entry)
+        if about_xml_signature is None:
+            return None
+
+        preview_image_entry = about_entries.get("preview.png")
+        published_file_id_entry = about_entries.get("publishedfileid.txt")
+        load_folders_xml_entry = mod_entries.get("loadfolders.xml")
+
+        return ModFolderEntry(
+            path=sub_folder,
+            about_xml_path=Path(about_xml_entry.path),
+            about_xml_signature=about_xml_signature,
+            preview_image_path=self._entry_path(preview_image_entry),
+            published_file_id_path=self._entry_path(published_file_id_entry),
+            sub_folder_names=tuple(
+                entry.name for entry in mod_entries.values() if self._is_dir(entry)
+            ),
+            load_folders_xml_path=self._entry_path(load_folders_xml_entry),
+            load_folders_xml_signature=self._signature(load_folders_xml_entry)
+            if load_folders_xml_entry is not None
+            else None,
+        )
+
+    def _signature(self, entry: os.DirEntry) -> Optional[FileSignature]:
+        try:
+            # os.DirEntry caches this; it is only a system call off Windows.
+            if os.name != "nt":
+                self.syscall_count += 1
+            stat_result = entry.stat()
+        except OSError:
+            return None
+        return stat_result.st_mtime_ns, stat_result.st_size
+
+    @staticmethod
+    def _entry_path(entry: Optional[os.DirEntry]) -> Path:
+        return Path(entry.path) if entry is not None else Path("")
+
+    def _scandir(self, folder: Path) -> List[os.DirEntry]:
+        self.syscall_count += 1
+        try:
+            with os.scandir(folder) as iterator:
+                return list(iterator)
+        except OSError:
+            return []
+
+    def _is_dir(self, entry: os.DirEntry) -> bool:
+        try:
+            return entry.is_dir()
+        except OSError:
+            return False
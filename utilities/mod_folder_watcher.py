@@ -0,0 +1,116 @@
+from pathlib import Path
+from typing import Iterable, List, Set
+
+from PySide6.QtCore import QFileSystemWatcher, QObject, QTimer, Signal, Slot
+
+
+class ModFolderWatcher(QObject):
+    """
+    Watch mod folders for mods being added, changed or removed.
+
+    The mod folders themselves are watched for mods being added, renamed or
+    deleted, and the About folders of the mods passed to watch_mods for mods
+    changing in place, as when Steam updates a workshop item. The About folder
+    changes when About.xml is replaced, which is how Steam and most editors save
+    it.
+
+    Watching the About folders costs a watch per mod, so the mod database only
+    asks for them once its first scan is done, with the About folders the scan
+    found.
+
+    Changes are collected for a short while before they are emitted, so a
+    download that touches a folder many times causes one rescan:
+    ``mod_folders_changed`` with the mod folders whose mods were added or
+    removed, and ``mods_changed`` with the folders of the mods that changed.
+
+    :param folders: The folders to watch.
+    :type folders: List[Path]
+    """
+
+    mod_folders_changed = Signal(object)
+    mods_changed = Signal(object)
+
+    DEBOUNCE_INTERVAL_MS = 500
+
+    def __init__(self, folders: List[Path]) -> None:
+        super().__init__()
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._on_path_changed)
+
+        self._folders: Set[Path] = set()
+        self._changed_folders: Set[Path] = set()
+        self._changed_mod_folders: Set[Path] = set()
+
+        self._debounce_timer = QTimer(self)
+        self._debounce_timer.setSingleShot(True)
+        self._debounce_timer.setInterval(self.DEBOUNCE_INTERVAL_MS)
+        self._debounce_timer.timeout.connect(self._on_debounce_timer_timeout)
+
+        self.set_folders(folders)
+
+    def set_folders(self, folders: List[Path]) -> None:
+        """
+        Replace the set of watched folders. The About folders of mods in the
+        folders that are dropped are no longer watched.
+
+        :param folders: The folders to watch. Folders that do not exist are skipped.
+        :type folders: List[Path]
+        """
+        new_folders = {folder for folder in folders if folder.is_dir()}
+        dropped_paths = [
+            path
+            for path in self._watcher.directories()
+            if Path(path) not in new_folders
+            and Path(path).parent.parent not in new_folders
+        ]
+        if dropped_paths:
+            self._watcher.removePaths(dropped_paths)
+        added_paths = [str(folder) for folder in new_folders - self._folders]
+        if added_paths:
+            self._watcher.addPaths(added_paths)
+        self._folders = new_folders
+
+    def watch_mods(self, about_folders: Iterable[Path]) -> None:
+        """
+        Watch the About folders of mods that are not watched yet.
+
+        :param about_folders: The About folders of the mods, as found by a scan.
+            Those of mods outside the watched folders are skipped.
+        :type about_folders: Iterable[Path]
+        """
+        watched_paths = set(self._watcher.directories())
+        paths = [
+            str(about_folder)
+            for about_folder in about_folders
+            if about_folder.parent.parent in self._folders
+            and str(about_folder) not in watched_paths
+        ]
+        if paths:
+            self._watcher.addPaths(paths)
+
+    @Slot(str)
+    def _on_path_changed(self, path: str) -> None:
+        changed_path = Path(path)
+        if changed_path in self._folders:
+            self._changed_folders.add(changed_path)
+        else:
+            self._changed_mod_folders.add(changed_path.parent)
+        self._debounce_timer.start()
+
+    @Slot()
+    def _on_debounce_timer_timeout(self) -> None:
+        changed_folders = sorted(self._changed_folders)
+        self._changed_folders.clear()
+        # Mods in a folder that is rescanned anyway need no rescan of their own.
+        changed_mod_folders = sorted(
+            mod_folder
+            for mod_folder in self._changed_mod_folders
+            if mod_folder.parent not in changed_folders
+        )
+        self._changed_mod_folders.clear()
+
+        if changed_folders:
+            self.mod_folders_changed.emit(changed_folders)
+        if changed_mod_folders:
+            self.mods_changed.emit(changed_mod_folders)
@@ -0,0 +1,238 @@
+import os
+import re
+from pathlib import Path
+from typing import Collection, List, NamedTuple, Optional, Sequence, Tuple
+
+from lxml import etree
+
+from utilities.file_signature import FileSignature
+
+_VERSION_PATTERN = re.compile(r"^v?(\d+)\.(\d+)$")
+
+
+class LoadFolder(NamedTuple):
+    """
+    A folder the game loads a mod's content from, and the conditions under which
+    it does.
+    """
+
+    path: Path
+    # Loaded only if any of these mods is active.
+    if_mod_active: Tuple[str, ...] = ()
+    # Loaded only if all of these mods are active.
+    if_mod_active_all: Tuple[str, ...] = ()
+    # Loaded only if none of these mods is active.
+    if_mod_not_active: Tuple[str, ...] = ()
+
+    def applies(self, active_package_ids: Optional[Collection[str]]) -> bool:
+        """
+        Decide whether the game loads this folder.
+
+        :param active_package_ids: The lower-case package IDs of the active mods,
+            or None to consider every conditional folder loaded.
+        :type active_package_ids: Optional[Collection[str]]
+        :return: True if the folder is loaded.
+        :rtype: bool
+        """
+        if active_package_ids is None:
+            return True
+        if self.if_mod_active and not any(
+            package_id in active_package_ids for package_id in self.if_mod_active
+        ):
+            return False
+        if not all(
+            package_id in active_package_ids for package_id in self.if_mod_active_all
+        ):
+            return False
+        return not any(
+            package_id in active_package_ids for package_id in self.if_mod_not_active
+        )
+
+
+def game_version_key(version: str) -> Optional[Tuple[int, int]]:
+    """
+    Get the major and minor version of a game version, a version folder name or a
+    LoadFolders.xml version element name.
+
+    :param version: A version such as "1.5.4104 rev435", "1.5" or "v1.5".
+    :type version: str
+    :return: The (major, minor) pair, or None if this is not a version.
+    :rtype: Optional[Tuple[int, int]]
+    """
+    match = _VERSION_PATTERN.match(".".join(version.split(" ")[0].split(".")[:2]))
+    if match is None:
+        return None
+    return int(match.group(1)), int(match.group(2))
+
+
+def _pick_version(names: List[str], game_version: str) -> Optional[str]:
+    """
+    Pick the version the game uses out of a mod's versioned names: the game
+    version itself, or else the newest older one. An unknown game version picks
+    the newest.
+    """
+    game_key = game_version_key(game_version)
+    best_name: Optional[str] = None
+    best_key: Optional[Tuple[int, int]] = None
+    for name in names:
+        key = game_version_key(name)
+        if key is None or (game_key is not None and key > game_key):
+            continue
+        if best_key is None or key > best_key:
+            best_name, best_key = name, key
+    return best_name
+
+
+def _package_ids(attribute: Optional[str]) -> Tuple[str, ...]:
+    if not attribute:
+        return ()
+    return tuple(
+        package_id.strip().lower()
+        for package_id in attribute.split(",")
+        if package_id.strip()
+    )
+
+
+def _read_load_folders_xml(
+    mod_path: Path, load_folders_xml_path: Path, game_version: str
+) -> Optional[List[LoadFolder]]:
+    """
+    :return: The load folders listed in LoadFolders.xml for the game version, or
+        None if it lists none for it.
+    """
+    parser = etree.XMLParser(
+        recover=True, remove_comments=True, resolve_entities=False, no_network=True
+    )
+    try:
+        root = etree.parse(str(load_folders_xml_path), parser).getroot()
+    except (OSError, etree.XMLSyntaxError):
+        return None
+    if root is None:
+        return None
+
+    version_elements = {
+        element.tag: element for element in root if isinstance(element.tag, str)
+    }
+    version_name = _pick_version(list(version_elements), game_version)
+    if version_name is None:
+        version_name = "default" if "default" in version_elements else None
+    if version_name is None:
+        return None
+
+    load_folders: List[LoadFolder] = []
+    for li in version_elements[version_name]:
+        if li.tag != "li":
+            continue
+        relative_path = (li.text or "").strip().strip("/\\")
+        load_folders.append(
+            LoadFolder(
+                path=mod_path / relative_path if relative_path else mod_path,
+                if_mod_active=_package_ids(li.get("IfModActive")),
+                if_mod_active_all=_package_ids(li.get("IfModActiveAll")),
+                if_mod_not_active=_package_ids(li.get("IfModNotActive")),
+            )
+        )
+    return load_folders
+
+
+def resolve_load_folders(
+    mod_path: Path,
+    game_version: str,
+    sub_folder_names: Collection[str],
+    load_folders_xml_path: Path = Path(""),
+) -> List[LoadFolder]:
+    """
+    Work out the folders the game loads a mod's content from.
+
+    If the mod has a LoadFolders.xml that lists folders for the game version, or
+    for the newest older version, or as a default, those are used. Otherwise the
+    game loads the mod folder itself, its Common folder, and its folder for the
+    game version or the newest older version, in that order.
+
+    :param mod_path: The mod's folder.
+    :type mod_path: Path
+    :param game_version: The game version, such as "1.5.4104 rev435". If empty,
+        the newest version the mod has a folder for is used.
+    :type game_version: str
+    :param sub_folder_names: The names of the folders in the mod folder.
+    :type sub_folder_names: Collection[str]
+    :param load_folders_xml_path: The path to the mod's LoadFolders.xml, or
+        Path("") if it has none.
+    :type load_folders_xml_path: Path
+    :return: The load folders, in load order. Folders in LoadFolders.xml that do
+        not exist are kept, as the game skips them itself.
+    :rtype: List[LoadFolder]
+    """
+    # Path("") has no name; checking it is cheaper than comparing paths.
+    if load_folders_xml_path.name:
+        load_folders = _read_load_folders_xml(
+            mod_path, load_folders_xml_path, game_version
+        )
+        if load_folders is not None:
+            return load_folders
+
+    load_folders = [LoadFolder(mod_path)]
+    if "Common" in sub_folder_names:
+        load_folders.append(LoadFolder(mod_path / "Common"))
+    version_folder_name = _pick_version(list(sub_folder_names), game_version)
+    if version_folder_name is not None:
+        load_folders.append(LoadFolder(mod_path / version_folder_name))
+    return load_folders
+
+
+def content_folders(
+    load_folders: Sequence[LoadFolder],
+    content_folder_name: str,
+    active_package_ids: Optional[Collection[str]] = None,
+) -> List[Path]:
+    """
+    Find the content folders of one kind, such as Defs or Patches, that the game
+    loads for a mod.
+
+    :param load_folders: The mod's load folders.
+    :type load_folders: Sequence[LoadFolder]
+    :param content_folder_name: The name of the content folders.
+    :type content_folder_name: str
+    :param active_package_ids: The lower-case package IDs of the active mods, or
+        None to include the folders of every conditional load folder.
+    :type active_package_ids: Optional[Collection[str]]
+    :return: The content folders that exist, in load order.
+    :rtype: List[Path]
+    """
+    return [
+        load_folder.path / content_folder_name
+        for load_folder in load_folders
+        if load_folder.applies(active_package_ids)
+        and (load_folder.path / content_folder_name).is_dir()
+    ]
+
+
+def walk_xml_files(folder: Path) -> List[Tuple[Path, FileSignature]]:
+    """
+    Find the XML files below a folder.
+
+    :param folder: The folder to walk.
+    :type folder: Path
+    :return: The XML files, with their modification time and size, in listing
+        order.
+    :rtype: List[Tuple[Path, FileSignature]]
+    """
+    xml_files: List[Tuple[Path, FileSignature]] = []
+    try:
+        with os.scandir(folder) as iterator:
+            entries = list(iterator)
+    except OSError:
+        return xml_files
+
+    for entry in entries:
+        try:
+            if entry.is_dir():
+                xml_files.extend(walk_xml_files(Path(entry.path)))
+            elif entry.name.lower().endswith(".xml"):
+                stat_result = entry.stat()
+                xml_files.append(
+                    (Path(entry.path), (stat_result.st_mtime_ns, stat_result.st_size))
+                )
+        except OSError:
+            continue
+    return xml_files
@@ -0,0 +1,227 @@
+import re
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from lxml import etree
+
+# The estimated cost of an XPath, in rough units of "one def looked up by name".
+# The game runs every patch operation against the whole combined Defs document,
+# so what matters is how many nodes an expression makes it visit.
+
+# Applying any operation at all.
+OPERATION_COST = 1
+# A leading // visits every node of every def.
+LEADING_DESCENDANT_COST = 100
+# Any other // visits every node below the matched nodes.
+DESCENDANT_COST = 25
+# A * step visits every child of the matched nodes.
+WILDCARD_COST = 10
+# A def step that is not anchored on defName or Name visits every def of its type.
+UNANCHORED_DEF_COST = 10
+# A string function in a predicate, such as contains(), runs for every candidate.
+PREDICATE_FUNCTION_COST = 15
+# Any other predicate below the def step only filters the nodes of a few defs.
+PREDICATE_COST = 2
+
+# XPaths of at least this cost are reported as expensive.
+EXPENSIVE_XPATH_COST = 50
+
+# At most this many expensive XPaths are kept per file.
+MAX_EXPENSIVE_XPATHS = 10
+
+_ANCHOR_PATTERN = re.compile(r"(?:\bdefName|@Name)\s*=")
+_PREDICATE_FUNCTION_PATTERN = re.compile(
+    r"\b(contains|starts-with|ends-with|substring|translate|normalize-space)\s*\("
+)
+
+
+def _split_steps(xpath: str) -> List[Tuple[str, str]]:
+    """
+    Split an XPath into its location steps.
+
+    :return: The (separator, step) pairs, where the separator is "", "/" or "//".
+    """
+    steps: List[Tuple[str, str]] = []
+    separator = ""
+    step: List[str] = []
+    bracket_depth = 0
+    quote = ""
+    index = 0
+    while index < len(xpath):
+        character = xpath[index]
+        if quote:
+            if character == quote:
+                quote = ""
+        elif character in "\"'":
+            quote = character
+        elif character == "[":
+            bracket_depth += 1
+        elif character == "]":
+            bracket_depth -= 1
+        elif character == "/" and bracket_depth == 0:
+            if step:
+                steps.append((separator, "".join(step)))
+                step = []
+            if xpath.startswith("//", index):
+                separator = "//"
+                index += 2
+            else:
+                separator = "/"
+                index += 1
+            continue
+        step.append(character)
+        index += 1
+    if step:
+        steps.append((separator, "".join(step)))
+    return steps
+
+
+def _predicates(step: str) -> List[str]:
+    """
+    :return: The top-level predicates of a location step, without brackets.
+    """
+    predicates: List[str] = []
+    bracket_depth = 0
+    start = 0
+    quote = ""
+    for index, character in enumerate(step):
+        if quote:
+            if character == quote:
+                quote = ""
+        elif character in "\"'":
+            quote = character
+        elif character == "[":
+            if bracket_depth == 0:
+                start = index + 1
+            bracket_depth += 1
+        elif character == "]":
+            bracket_depth -= 1
+            if bracket_depth == 0:
+                predicates.append(step[start:index])
+    return predicates
+
+
+def xpath_cost(xpath: str) -> int:
+    """
+    Estimate how expensive an XPath is to evaluate against the game's Defs.
+
+    :param xpath: The XPath of a patch operation.
+    :type xpath: str
+    :return: The estimated cost. See the constants of this module.
+    :rtype: int
+    """
+    steps = _split_steps(xpath.strip())
+    if not steps:
+        return 0
+
+    cost = 0
+    # The def step is the one after the Defs root, e.g. ThingDef in
+    # Defs/ThingDef[defName="Steel"]/statBases.
+    def_step_index = 1 if steps[0][1] == "Defs" else 0
+
+    for index, (separator, step) in enumerate(steps):
+        if separator == "//":
+            cost += LEADING_DESCENDANT_COST if index == 0 else DESCENDANT_COST
+        if step.split("[", 1)[0] == "*":
+            cost += WILDCARD_COST
+
+        predicates = _predicates(step)
+        for predicate in predicates:
+            function_count = len(_PREDICATE_FUNCTION_PATTERN.findall(predicate))
+            if function_count:
+                cost += PREDICATE_FUNCTION_COST * function_count
+            elif index > def_step_index:
+                cost += PREDICATE_COST
+
+        if index == def_step_index and not any(
+            _ANCHOR_PATTERN.search(predicate) for predicate in predicates
+        ):
+            cost += UNANCHORED_DEF_COST
+
+    return cost
+
+
+_thread_local = threading.local()
+
+
+def _operations(element: etree._Element) -> List[etree._Element]:
+    """
+    :return: The patch operations in or below an element, in document order. The
+        contents of <value> elements are XML to insert, not operations.
+    """
+    operations: List[etree._Element] = []
+    for child in element:
+        if not isinstance(child.tag, str) or child.tag == "value":
+            continue
+        if child.get("Class") is not None:
+            operations.append(child)
+        operations.extend(_operations(child))
+    return operations
+
+
+def analyze_patch_file(patch_file: Path) -> Dict[str, Any]:
+    """
+    Estimate the cost of the patch operations in a Patches XML file.
+
+    This runs in analysis worker processes, so it must stay free of Qt objects
+    and return only plain, picklable data.
+
+    :param patch_file: The Patches XML file.
+    :type patch_file: Path
+    :return: A dict with the number of operations ("operation_count"), their
+        total estimated cost ("cost"), the length of the longest
+        PatchOperationSequence ("longest_sequence"), and the most expensive
+        [xpath, cost] pairs ("expensive_xpaths").
+    :rtype: Dict[str, Any]
+    """
+    result: Dict[str, Any] = {
+        "operation_count": 0,
+        "cost": 0,
+        "longest_sequence": 0,
+        "expensive_xpaths": [],
+    }
+
+    parser: Optional[etree.XMLParser] = getattr(_thread_local, "parser", None)
+    if parser is None:
+        parser = etree.XMLParser(
+            recover=True,
+            remove_comments=True,
+            remove_pis=True,
+            resolve_entities=False,
+            no_network=True,
+        )
+        _thread_local.parser = parser
+
+    try:
+        root = etree.parse(str(patch_file), parser).getroot()
+    except (OSError, etree.XMLSyntaxError):
+        return result
+    if root is None:
+        return result
+
+    expensive_xpaths: List[Tuple[str, int]] = []
+    for operation in _operations(root):
+        result["operation_count"] += 1
+        result["cost"] += OPERATION_COST
+
+        if operation.get("Class", "").endswith("PatchOperationSequence"):
+            operations_element = operation.find("operations")
+            if operations_element is not None:
+                result["longest_sequence"] = max(
+                    result["longest_sequence"],
+                    sum(1 for li in operations_element if li.tag == "li"),
+                )
+
+        xpath = operation.findtext("xpath")
+        if xpath:
+            cost = xpath_cost(xpath)
+            result["cost"] += cost
+            if cost >= EXPENSIVE_XPATH_COST:
+                expensive_xpaths.append((xpath.strip(), cost))
+
+    expensive_xpaths.sort(key=lambda pair: pair[1], reverse=True)
+    result["expensive_xpaths"] = [
+        [xpath, cost] for xpath, cost in expensive_xpaths[:MAX_EXPENSIVE_XPATHS]
+    ]
+    return result
@@ -0,0 +1,158 @@
+import json
+import os
+import tempfile
+from json import JSONDecodeError
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from loguru import logger
+
+# What a cached value is valid for, such as the FileSignature of its source file.
+# It must be a flat tuple of values that survive a round trip through JSON.
+CacheSignature = Tuple[Any, ...]
+
+
+class PersistentCache:
+    """
+    A JSON file of cached values, each valid for as long as its signature, usually
+    the modification time and size of its source file, stays the same.
+
+    The whole file is discarded when its version does not match the version the
+    cache was created with, so callers should bump the version whenever the shape
+    of the cached values changes.
+
+    :param cache_file: The file the cache is stored in.
+    :type cache_file: Path
+    :param version: The version of the cached values.
+    :type version: int
+    """
+
+    def __init__(self, cache_file: Path, version: int) -> None:
+        self._cache_file = cache_file
+        self._version = version
+
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._is_dirty = False
+
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def hits(self) -> int:
+        """
+        :return: The number of lookups that returned a cached value.
+        :rtype: int
+        """
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """
+        :return: The number of lookups that found no valid cached value.
+        :rtype: int
+        """
+        return self._misses
+
+    def load(self) -> None:
+        """
+        Load the cache from disk, starting empty if the file is missing, corrupt
+        or from a different cache version.
+        """
+        self._entries = {}
+        self._is_dirty = False
+        try:
+            with open(str(self._cache_file), "r") as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return
+        except (OSError, JSONDecodeError):
+            logger.warning(f"Discarding unreadable cache file {self._cache_file}")
+            return
+
+        if not isinstance(data, dict) or data.get("version") != self._version:
+            logger.info(f"Discarding outdated cache file {self._cache_file}")
+            return
+
+        entries = data.get("entries")
+        if isinstance(entries, dict):
+            self._entries = entries
+
+    def save(self) -> None:
+        """
+        Write the cache to disk if it changed since it was loaded.
+        """
+        if not self._is_dirty:
+            return
+        # Write to a unique temporary file and swap it in, so that a reader or
+        # another writer never sees a half-written cache.
+        file_descriptor, temp_file_name = tempfile.mkstemp(
+            dir=str(self._cache_file.parent), suffix=".tmp"
+        )
+        try:
+            with os.fdopen(file_descriptor, "w") as file:
+                json.dump({"version": self._version, "entries": self._entries}, file)
+            os.replace(temp_file_name, str(self._cache_file))
+        except BaseException:
+            os.unlink(temp_file_name)
+            raise
+        self._is_dirty = False
+
+    def get(self, key: str, signature: CacheSignature) -> Optional[Any]:
+        """
+        Look up a cached value.
+
+        :param key: The key of the value.
+        :type key: str
+        :param signature: The current signature of the value.
+        :type signature: CacheSignature
+        :return: The cached value, or None if there is none for this signature.
+        :rtype: Optional[Any]
+        """
+        entry = self._entries.get(key)
+        if entry is not None and entry.get("signature") == list(signature):
+            self._hits += 1
+            return entry.get("value")
+        self._misses += 1
+        return None
+
+    def put(self, key: str, signature: CacheSignature, value: Any) -> None:
+        """
+        Store a value in the cache.
+
+        :param key: The key of the value.
+        :type key: str
+        :param signature: The signature of the value.
+        :type signature: CacheSignature
+        :param value: The value. It must be serializable to JSON.
+        :type value: Any
+        """
+        self._entries[key] = {"signature": list(signature), "value": value}
+        self._is_dirty = True
+
+    def keys(self) -> List[str]:
+        """
+        :return: The keys of all cached values.
+        :rtype: List[str]
+        """
+        return list(self._entries.keys())
+
+    def values(self) -> List[Any]:
+        """
+        :return: All cached values, whatever their signature.
+        :rtype: List[Any]
+        """
+        return [entry.get("value") for entry in self._entries.values()]
+
+    def retain(self, keys: Iterable[str]) -> None:
+        """
+        Drop every entry whose key is not in the given keys.
+
+        :param keys: The keys to keep.
+        :type keys: Iterable[str]
+        """
+        keys_to_keep = set(keys)
+        stale_keys = [key for key in self._entries if key not in keys_to_keep]
+        for key in stale_keys:
+            del self._entries[key]
+        if stale_keys:
+            self._is_dirty = True
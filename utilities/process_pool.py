@@ -0,0 +1,78 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Generator, List, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def effective_worker_count(
+    worker_count: int, item_count: int, min_items_per_worker: int
+) -> int:
+    """
+    Decide how many worker processes are worth starting for a batch of work.
+
+    :param worker_count: The configured worker count. 0 means one per CPU core.
+    :type worker_count: int
+    :param item_count: The number of items to process.
+    :type item_count: int
+    :param min_items_per_worker: The fewest items that make starting a worker
+        process pay off.
+    :type min_items_per_worker: int
+    :return: The number of workers to use. 1 or less means working serially.
+    :rtype: int
+    """
+    if worker_count <= 0:
+        worker_count = os.cpu_count() or 1
+    return min(worker_count, item_count // min_items_per_worker)
+
+
+def parallel_map(
+    function: Callable[[T], R],
+    items: List[T],
+    worker_count: int,
+    min_items_per_worker: int,
+) -> Generator[R, None, None]:
+    """
+    Apply a function to items, in a process pool if the worker count allows it.
+
+    Results are yielded as soon as they are available, in the order of items.
+    The function must be a module-level function taking and returning plain,
+    picklable data.
+
+    :param function: The function to apply.
+    :type function: Callable[[T], R]
+    :param items: The items to apply it to.
+    :type items: List[T]
+    :param worker_count: The number of worker processes. 0 uses one per CPU core,
+        1 works serially on the calling thread.
+    :type worker_count: int
+    :param min_items_per_worker: Only fan out when every worker gets at least this
+        many items, as starting a worker process is expensive.
+    :type min_items_per_worker: int
+    :return: A generator of the results. Closing it early stops the process pool.
+    :rtype: Generator[R, None, None]
+    """
+    worker_count = effective_worker_count(
+        worker_count, len(items), min_items_per_worker
+    )
+
+    if worker_count <= 1:
+        for item in items:
+            yield function(item)
+        return
+
+    # "spawn" keeps the workers from inheriting the Qt threads of this process,
+    # and matches the default on Windows and macOS.
+    executor = ProcessPoolExecutor(
+        max_workers=worker_count,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+    try:
+        # Small chunks keep results flowing back early enough for streaming.
+        chunk_size = max(1, min(16, len(items) // (worker_count * 4)))
+        yield from executor.map(function, items, chunksize=chunk_size)
+    finally:
+        # Drop the work not started yet when the caller stops early.
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -15,6 +15,7 @@ from PySide6.QtWidgets import (
     QHeaderView,
     QScrollArea,
     QTextEdit,
+    QProgressBar,
 )
 
 from utilities.app_info import AppInfo
@@ -51,6 +52,12 @@ class MainWindow(QMainWindow):
         version_string.setEnabled(False)
         button_layout.addWidget(version_string)
 
+        self.scan_progress_bar = QProgressBar()
+        self.scan_progress_bar.setMaximumWidth(200)
+        self.scan_progress_bar.setTextVisible(False)
+        self.scan_progress_bar.hide()
+        button_layout.addWidget(self.scan_progress_bar)
+
         button_layout.addStretch()
 
         self.refresh_button = QPushButton("Refresh")
@@ -91,7 +98,7 @@ class MainWindow(QMainWindow):
 
         self.selected_mod_preview_image = QLabel()
 
-        selected_mod_table = QTableWidget(3, 2)
+        selected_mod_table = QTableWidget(4, 2)
         selected_mod_table.horizontalHeader().setSectionResizeMode(
             0, QHeaderView.ResizeMode.ResizeToContents
         )
@@ -129,6 +136,14 @@ class MainWindow(QMainWindow):
         self.selected_mod_supported_versions_label = QTableWidgetItem()
         selected_mod_table.setItem(row, 1, self.selected_mod_supported_versions_label)
 
+        row = 3
+        selected_mod_table.setRowHeight(row, GUIInfo().default_font_line_height)
+        row_header_label = QTableWidgetItem("Patch Cost")
+        row_header_label.setFont(GUIInfo().emphasis_font)
+        selected_mod_table.setItem(row, 0, row_header_label)
+        self.selected_mod_patch_cost_label = QTableWidgetItem()
+        selected_mod_table.setItem(row, 1, self.selected_mod_patch_cost_label)
+
         total_height = sum(
             [
                 selected_mod_table.rowHeight(i)
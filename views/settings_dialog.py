@@ -14,6 +14,7 @@ from PySide6.QtWidgets import (
     QGroupBox,
     QToolButton,
     QBoxLayout,
+    QSpinBox,
 )
 
 from utilities.gui_info import GUIInfo
@@ -411,4 +412,31 @@ class SettingsDialog(QDialog):
         self.debug_logging_checkbox = QCheckBox("Enable debug logging", tab)
         tab_layout.addWidget(self.debug_logging_checkbox)
 
+        scan_worker_count_layout = QHBoxLayout()
+        tab_layout.addLayout(scan_worker_count_layout)
+
+        scan_worker_count_label = QLabel("Mod scan worker processes:")
+        scan_worker_count_layout.addWidget(scan_worker_count_label)
+
+        self.scan_worker_count_spinbox = QSpinBox(tab)
+        self.scan_worker_count_spinbox.setRange(0, 64)
+        self.scan_worker_count_spinbox.setSpecialValueText("Automatic")
+        scan_worker_count_layout.addWidget(self.scan_worker_count_spinbox)
+
+        scan_worker_count_layout.addStretch(1)
+
+        preview_memory_budget_layout = QHBoxLayout()
+        tab_layout.addLayout(preview_memory_budget_layout)
+
+        preview_memory_budget_label = QLabel("Preview image memory:")
+        preview_memory_budget_layout.addWidget(preview_memory_budget_label)
+
+        self.preview_memory_budget_spinbox = QSpinBox(tab)
+        self.preview_memory_budget_spinbox.setRange(0, 4096)
+        self.preview_memory_budget_spinbox.setSuffix(" MiB")
+        self.preview_memory_budget_spinbox.setSpecialValueText("None")
+        preview_memory_budget_layout.addWidget(self.preview_memory_budget_spinbox)
+
+        preview_memory_budget_layout.addStretch(1)
+
         self._tab_widget.addTab(tab, "Advanced")
@@ -6,6 +6,10 @@ from PySide6.QtCore import Qt
 
 
 class DragDropListView(QListView):
+    # The number of rows laid out between events while the view lays out all
+    # of its rows, so that it stays responsive.
+    LAYOUT_BATCH_SIZE = 1000
+
     def __init__(self, parent: Optional[QWidget] = None) -> None:
         super(DragDropListView, self).__init__(parent)
 
@@ -22,6 +26,13 @@ class DragDropListView(QListView):
         # Look and feel
         self.setAlternatingRowColors(True)
 
+        # The rows of the ModListItemDelegate that MainWindowController installs
+        # all have the same height, so the view lays out and scrolls any number
+        # of rows without measuring each, and only paints those it shows.
+        self.setUniformItemSizes(True)
+        self.setLayoutMode(QListView.LayoutMode.Batched)
+        self.setBatchSize(self.LAYOUT_BATCH_SIZE)
+
     def dragMoveEvent(self, event: QDragMoveEvent) -> None:
         super().dragMoveEvent(event)
 
@@ -0,0 +1,240 @@
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from PySide6.QtCore import QModelIndex, QPersistentModelIndex, QPointF, QRect, QSize, Qt
+from PySide6.QtGui import (
+    QColor,
+    QFont,
+    QFontMetrics,
+    QImage,
+    QPainter,
+    QPalette,
+    QStaticText,
+)
+from PySide6.QtWidgets import (
+    QApplication,
+    QStyle,
+    QStyledItemDelegate,
+    QStyleOptionViewItem,
+    QWidget,
+)
+
+from models.mod_badges import ModBadges
+
+ModIndex = Union[QModelIndex, QPersistentModelIndex]
+
+# The roles the delegate reads, as plain integers, which compare faster.
+_DISPLAY_ROLE = int(Qt.ItemDataRole.DisplayRole)
+_USER_ROLE = int(Qt.ItemDataRole.UserRole)
+
+# Looked up once rather than for every row painted.
+_PANEL_ITEM_VIEW_ITEM = QStyle.PrimitiveElement.PE_PanelItemViewItem
+_SELECTED = QStyle.StateFlag.State_Selected
+_TEXT_ROLE = QPalette.ColorRole.Text
+_HIGHLIGHTED_TEXT_ROLE = QPalette.ColorRole.HighlightedText
+_ELIDE_RIGHT = Qt.TextElideMode.ElideRight
+_PLAIN_TEXT = Qt.TextFormat.PlainText
+_ANTIALIASING = QPainter.RenderHint.Antialiasing
+_SMOOTH_PIXMAP_TRANSFORM = QPainter.RenderHint.SmoothPixmapTransform
+_NO_BRUSH = Qt.BrushStyle.NoBrush
+_NO_PEN = Qt.PenStyle.NoPen
+_WHITE = QColor(Qt.GlobalColor.white)
+
+
+class ModListItemDelegate(QStyledItemDelegate):
+    """
+    Paints the rows of a mod list: the thumbnail of the mod's preview image, the
+    mod's name, elided to fit, and its badges, drawn as labels rather than
+    widgets.
+
+    Every row is one line high, so a view with uniformItemSizes set lays out any
+    number of rows without asking for the size of each, and only paints the rows
+    it shows. The text of the rows painted most recently is kept laid out.
+
+    :param get_badges: Get the badges of a mod by its handle. Without it, no
+        badges are drawn.
+    :type get_badges: Optional[Callable[[int], ModBadges]]
+    :param get_thumbnail: Get the thumbnail of a mod by its handle, e.g. from a
+        ThumbnailAtlas. Without it, no room is left for thumbnails.
+    :type get_thumbnail: Optional[Callable[[int], Optional[QImage]]]
+    :param parent: The parent object.
+    :type parent: Optional[QWidget]
+    """
+
+    # The number of laid out names kept; a few screens' worth.
+    TEXT_CACHE_SIZE = 1024
+
+    # The space around the text of a row, and between badges.
+    PADDING = 4
+    BADGE_SPACING = 4
+
+    # The colors of the badges that point out a problem.
+    UNSUPPORTED_VERSION_COLOR = QColor(200, 130, 0)
+    MISSING_DEPENDENCY_COLOR = QColor(200, 40, 40)
+
+    def __init__(
+        self,
+        get_badges: Optional[Callable[[int], ModBadges]] = None,
+        get_thumbnail: Optional[Callable[[int], Optional[QImage]]] = None,
+        parent: Optional[QWidget] = None,
+    ) -> None:
+        super().__init__(parent)
+        self._get_badges = get_badges
+        self._get_thumbnail = get_thumbnail
+        # Elided names keyed by the name, the width it was elided to and the
+        # font, least recently used first.
+        self._texts: "OrderedDict[Tuple[str, int, str], QStaticText]" = OrderedDict()
+        # The font the badges were laid out for, and the badges' font, labels
+        # and widths.
+        self._font_key = ""
+        self._badge_font = QFont()
+        self._badge_height = 0
+        self._badge_labels: Dict[str, Tuple[QStaticText, int]] = {}
+
+    def clear_cache(self) -> None:
+        """
+        Forget the laid out names.
+        """
+        self._texts.clear()
+
+    def sizeHint(self, option: QStyleOptionViewItem, index: ModIndex) -> QSize:
+        # The same for every row: the text is not measured.
+        metrics: QFontMetrics = option.fontMetrics  # type: ignore[attr-defined]
+        return QSize(0, metrics.height() + 2 * self.PADDING)
+
+    def paint(
+        self, painter: QPainter, option: QStyleOptionViewItem, index: ModIndex
+    ) -> None:
+        # The stubs leave out the fields of style options.
+        widget: Optional[QWidget] = option.widget  # type: ignore[attr-defined]
+        row_rect: QRect = option.rect  # type: ignore[attr-defined]
+        state: QStyle.StateFlag = option.state  # type: ignore[attr-defined]
+        palette: QPalette = option.palette  # type: ignore[attr-defined]
+        font: QFont = option.font  # type: ignore[attr-defined]
+        metrics: QFontMetrics = option.fontMetrics  # type: ignore[attr-defined]
+
+        style = widget.style() if widget is not None else QApplication.style()
+        # The selection, hover and focus backgrounds; the view has painted the
+        # alternating row colors already.
+        style.drawPrimitive(_PANEL_ITEM_VIEW_ITEM, option, painter, widget)
+
+        font_key = font.key()
+        if font_key != self._font_key:
+            self._set_font(font, font_key)
+        rect = row_rect.adjusted(self.PADDING, 0, -self.PADDING, 0)
+        text_color = palette.color(
+            _HIGHLIGHTED_TEXT_ROLE if state & _SELECTED else _TEXT_ROLE
+        )
+
+        painter.save()
+        handle = (
+            index.data(_USER_ROLE)
+            if self._get_badges is not None or self._get_thumbnail is not None
+            else None
+        )
+        if self._get_thumbnail is not None:
+            # Rows without a thumbnail keep the room for one, so that the names
+            # line up.
+            size = rect.height() - self.PADDING
+            if handle is not None:
+                thumbnail = self._get_thumbnail(handle)
+                if thumbnail is not None:
+                    painter.setRenderHint(_SMOOTH_PIXMAP_TRANSFORM)
+                    target = QRect(rect.left(), rect.top(), size, size)
+                    target.moveTop(rect.top() + (rect.height() - size) // 2)
+                    painter.drawImage(target, thumbnail)
+            rect.setLeft(rect.left() + size + self.PADDING)
+        if self._get_badges is not None and handle is not None:
+            badges_width = self._paint_badges(
+                painter, rect, self._get_badges(handle), text_color
+            )
+            rect.setRight(rect.right() - badges_width)
+
+        name = index.data(_DISPLAY_ROLE)
+        if name:
+            static_text = self._static_text(name, rect.width(), font, metrics)
+            painter.setFont(font)
+            painter.setPen(text_color)
+            top = rect.top() + (rect.height() - metrics.height()) / 2
+            painter.drawStaticText(QPointF(rect.left(), top), static_text)
+        painter.restore()
+
+    def _set_font(self, font: QFont, font_key: str) -> None:
+        # Badges are drawn a point smaller than the names.
+        self._font_key = font_key
+        self._badge_font = QFont(font)
+        self._badge_font.setPointSize(max(font.pointSize() - 1, 1))
+        self._badge_height = QFontMetrics(self._badge_font).height() + 2
+        self._badge_labels.clear()
+
+    def _static_text(
+        self, name: str, width: int, font: QFont, metrics: QFontMetrics
+    ) -> QStaticText:
+        key = (name, width, self._font_key)
+        static_text = self._texts.get(key)
+        if static_text is not None:
+            self._texts.move_to_end(key)
+            return static_text
+
+        static_text = QStaticText(metrics.elidedText(name, _ELIDE_RIGHT, width))
+        static_text.setTextFormat(_PLAIN_TEXT)
+        static_text.prepare(font=font)
+        self._texts[key] = static_text
+        while len(self._texts) > self.TEXT_CACHE_SIZE:
+            self._texts.popitem(last=False)
+        return static_text
+
+    def _badge_label(self, text: str) -> Tuple[QStaticText, int]:
+        label = self._badge_labels.get(text)
+        if label is None:
+            static_text = QStaticText(text)
+            static_text.setTextFormat(_PLAIN_TEXT)
+            static_text.prepare(font=self._badge_font)
+            width = int(static_text.size().width()) + 2 * self.PADDING
+            label = self._badge_labels[text] = (static_text, width)
+        return label
+
+    def _paint_badges(
+        self,
+        painter: QPainter,
+        rect: QRect,
+        badges: ModBadges,
+        text_color: QColor,
+    ) -> int:
+        """
+        Paint a mod's badges at the right of a row.
+
+        :return: The width taken by the badges, with the space before them.
+        :rtype: int
+        """
+        # From right to left, so that the folder labels line up.
+        labels: List[Tuple[str, Optional[QColor]]] = []
+        if badges.folder_label:
+            labels.append((badges.folder_label, None))
+        if badges.unsupported_version:
+            labels.append((badges.unsupported_version, self.UNSUPPORTED_VERSION_COLOR))
+        if badges.missing_dependencies:
+            labels.append(("Missing dependency", self.MISSING_DEPENDENCY_COLOR))
+        if not labels:
+            return 0
+
+        painter.setFont(self._badge_font)
+        painter.setRenderHint(_ANTIALIASING)
+        height = self._badge_height
+        top = rect.top() + (rect.height() - height) // 2
+        right = rect.right() + 1
+        for text, color in labels:
+            static_text, width = self._badge_label(text)
+            badge_rect = QRect(right - width, top, width, height)
+            if color is None:
+                painter.setPen(text_color)
+                painter.setBrush(_NO_BRUSH)
+                painter.drawRoundedRect(badge_rect.adjusted(0, 0, -1, -1), 3, 3)
+            else:
+                painter.setPen(_NO_PEN)
+                painter.setBrush(color)
+                painter.drawRoundedRect(badge_rect, 3, 3)
+                painter.setPen(_WHITE)
+            painter.drawStaticText(right - width + self.PADDING, top + 1, static_text)
+            right -= width + self.BADGE_SPACING
+        return rect.right() + 1 - right